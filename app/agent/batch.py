@@ -0,0 +1,177 @@
+import argparse
+import json
+import time
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from app.agent.delta import DeltaRun
+from app.agent.memory import (
+    MemoryBudget,
+    MemoryProfiler,
+    SpilledChunk,
+    build_memory_tools,
+    stage,
+)
+from app.agent.orchestrator import OrchestratorAgent
+from app.config import get_config
+from app.data.goal_library import get_goal_library
+from app.data.loader import load_accounts, load_goals, load_users
+from app.data.results_store import DEFAULT_PATH, ResultsStore
+from app.tools.interfaces import DemoResult
+
+EMPTY_ACCOUNT = {"cash": 0, "debts": [], "investments": []}
+
+BatchItem = tuple[dict, dict, str]
+
+
+def iter_book(
+    users: list[dict], accounts: list[dict], goals: list[dict]
+) -> Iterator[BatchItem]:
+    """Yield ``(user, accounts, goals_text)`` using each client's first goal."""
+    accounts_by_user = {a["user_id"]: a for a in accounts}
+    goals_by_user: dict[str, list[dict]] = {}
+    for goal in goals:
+        goals_by_user.setdefault(goal["user_id"], []).append(goal)
+    for user in users:
+        library = get_goal_library(user["id"], goals_by_user.get(user["id"], []))
+        yield user, accounts_by_user.get(user["id"], EMPTY_ACCOUNT), library[0]
+
+
+def run_batch(
+    items: Iterable[BatchItem],
+    mode: str,
+    config: dict | None = None,
+    chunk_size: int = 500,
+    priority: str = "batch",
+    profiler: MemoryProfiler | None = None,
+    budget: MemoryBudget | None = None,
+) -> Iterator[list[tuple[dict, dict, str, DemoResult]] | SpilledChunk]:
+    """Run the orchestrator over ``items`` and yield results in chunks.
+
+    With a ``budget`` a chunk is handed off early, and later chunks are
+    smaller, whenever the chunk's projected memory use would cross the
+    limit; at the minimum chunk size results go to a ``SpilledChunk`` on
+    disk instead. A spilled chunk is deleted once the consumer asks for the
+    next one.
+    """
+    agent = OrchestratorAgent(config=config, profiler=profiler)
+    chunk: list | SpilledChunk = []
+    detail = None
+    for user, accounts, goals_text in items:
+        if budget is not None and not len(chunk):
+            budget.start_chunk()
+        if profiler is not None and detail is None:
+            detail = {"chunk": len(profiler.chunks), "chunk_size": chunk_size}
+            profiler.begin("chunk", snapshot=True, detail=detail)
+        result = agent.run(mode, user, accounts, goals_text, priority=priority)
+        chunk.append((user, accounts, goals_text, result))
+        full = len(chunk) >= chunk_size
+        # Shrinking is only considered once a chunk has min_chunk items, so
+        # one shrink does not cascade into a run of one-item chunks; at the
+        # minimum size every item is checked so spilling starts early.
+        shrinkable = chunk_size > (budget.min_chunk if budget else 0)
+        if (
+            budget is not None
+            and isinstance(chunk, list)
+            and (len(chunk) >= budget.min_chunk or not shrinkable)
+            and budget.over(len(chunk), chunk_size)
+        ):
+            if shrinkable:
+                chunk_size = budget.shrink(chunk_size)
+                full = True
+            elif budget.spill_dir is not None:
+                spilled = SpilledChunk(budget.spill_dir)
+                for item in chunk:
+                    spilled.append(item)
+                chunk = spilled
+                budget.spilled_chunks += 1
+        if full:
+            yield from _hand_off(chunk, profiler, detail, budget)
+            chunk, detail = [], None
+    if len(chunk):
+        yield from _hand_off(chunk, profiler, detail, budget)
+
+
+def _hand_off(chunk, profiler, detail, budget):
+    spilled = isinstance(chunk, SpilledChunk)
+    if detail is not None:
+        detail.update(items=len(chunk), spilled=spilled)
+        profiler.end()
+    if spilled:
+        budget.spilled_items += len(chunk)
+    yield chunk
+    if spilled:
+        chunk.discard()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Run the planner over the client book and store results."
+    )
+    parser.add_argument("--mode", choices=["rules", "agent"], default="rules")
+    parser.add_argument("--store", type=Path, default=DEFAULT_PATH)
+    parser.add_argument("--chunk-size", type=int, default=500)
+    parser.add_argument("--label")
+    parser.add_argument(
+        "--memory-profile",
+        action="store_true",
+        help="Report peak/retained memory per stage and chunk (tracemalloc).",
+    )
+    parser.add_argument("--memory-budget-mb", type=float)
+    parser.add_argument("--spill-dir", type=Path)
+    parser.add_argument(
+        "--delta",
+        action="store_true",
+        help="Recompute only clients whose fingerprint changed since the last "
+        "run in this mode; carry the other results forward.",
+    )
+    args = parser.parse_args()
+
+    config = get_config()
+    if args.memory_profile:
+        config["memory_profile"] = True
+    if args.memory_budget_mb:
+        config["memory_budget_mb"] = args.memory_budget_mb
+    if args.spill_dir:
+        config["memory_spill_dir"] = str(args.spill_dir)
+    profiler, budget = build_memory_tools(config)
+    if profiler is not None:
+        profiler.start()
+
+    started = time.perf_counter()
+    with stage(profiler, "load"):
+        users, accounts, goals = load_users(), load_accounts(), load_goals()
+    items = iter_book(users, accounts, goals)
+    with ResultsStore(args.store) as store:
+        # Full runs refresh the fingerprint index too, so a later --delta run
+        # has a baseline; they just ignore what is already there.
+        index = store.fingerprints(args.mode) if args.delta else {}
+        delta = DeltaRun(index, args.mode, config)
+        items = delta.filter(items)
+        run_id = store.create_run(args.mode, args.label)
+        stored = 0
+        for chunk in run_batch(
+            items, args.mode, config, args.chunk_size, profiler=profiler, budget=budget
+        ):
+            delta.record(chunk)
+            with stage(profiler, "store"):
+                stored += store.save_results(run_id, chunk)
+        with stage(profiler, "store"):
+            stored += store.carry_forward(run_id, delta.carried.values())
+            store.update_fingerprints(delta.index_rows(store.run_result_ids(run_id)))
+        store.optimize()
+    elapsed = time.perf_counter() - started
+    print(f"run {run_id}: stored {stored} results in {elapsed:.2f}s -> {args.store}")
+    if args.delta:
+        print(json.dumps({"delta": delta.report()}, indent=2))
+    if profiler is not None or budget is not None:
+        report = {"memory": profiler.report() if profiler else None}
+        if budget is not None:
+            report["budget"] = budget.report()
+        print(json.dumps(report, indent=2))
+        if profiler is not None:
+            profiler.stop()
+
+
+if __name__ == "__main__":
+    main()
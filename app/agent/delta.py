@@ -0,0 +1,175 @@
+import hashlib
+import json
+import time
+from functools import lru_cache
+from typing import Any, Iterable, Iterator
+
+from app.config import ROOT
+
+# Sources whose behaviour decides a stored result, including the derived
+# columns (recommendation, KPIs) that carry_forward copies. Editing any of
+# them changes the planner version and so every fingerprint.
+PLANNER_SOURCES = (
+    "app/agent/orchestrator.py",
+    "app/agent/factory.py",
+    "app/data/results_store.py",
+    "app/kpi.py",
+    "app/money.py",
+    "app/report_data.py",
+    "app/tools/**/*.py",
+    "app/tools/**/*.json",
+)
+
+
+def _canonical(value: Any) -> Any:
+    # 850 and 850.0 are the same balance; key order never matters.
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, dict):
+        return {str(k): _canonical(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    return value
+
+
+def canonical_json(value: Any) -> str:
+    return json.dumps(
+        _canonical(value), sort_keys=True, separators=(",", ":"), ensure_ascii=False
+    )
+
+
+@lru_cache(maxsize=1)
+def planner_version() -> str:
+    """Digest of the planning code and strategy spec."""
+    digest = hashlib.sha256()
+    paths = sorted({p for pattern in PLANNER_SOURCES for p in ROOT.glob(pattern)})
+    for path in paths:
+        digest.update(str(path.relative_to(ROOT)).encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+def model_signature(mode: str, config: dict) -> dict[str, Any]:
+    """Settings that can change an agent-mode answer; rules mode has none."""
+    if mode != "agent":
+        return {}
+    return {
+        "model": config.get("gemini_model"),
+        "temperature": config.get("llm_temperature"),
+        "router_enabled": config.get("router_enabled", True),
+        "router_threshold": config.get("router_confidence_threshold"),
+        "fallback": config.get("llm_fallback_enabled", True),
+    }
+
+
+def client_fingerprint(
+    user: dict,
+    accounts: dict,
+    goals_text: str,
+    mode: str,
+    model: dict[str, Any],
+    version: str,
+) -> str:
+    payload = {
+        "user": user,
+        "accounts": accounts,
+        "goals": " ".join((goals_text or "").split()),
+        "mode": mode,
+        "model": model,
+        "version": version,
+    }
+    return hashlib.sha256(canonical_json(payload).encode()).hexdigest()
+
+
+class DeltaRun:
+    """Split a batch into clients to recompute and results to carry forward.
+
+    ``index`` is the previous fingerprint index for this mode (see
+    ``ResultsStore.fingerprints``). ``filter`` yields only clients whose
+    fingerprint changed, are new, or whose last result fell back from the
+    LLM; the others are collected in ``carried`` as previous result ids.
+    """
+
+    def __init__(
+        self,
+        index: dict[str, dict[str, Any]],
+        mode: str,
+        config: dict,
+        version: str | None = None,
+    ):
+        self.index = index
+        self.mode = mode
+        self.model = model_signature(mode, config)
+        self.version = version or config.get("planner_version") or planner_version()
+        self.fingerprints: dict[str, str] = {}
+        self.seconds: dict[str, float] = {}
+        self.degraded: set[str] = set()
+        self.carried: dict[str, int] = {}
+        self.changed = 0
+        self.new = 0
+        self.saved_seconds = 0.0
+        self.compute_seconds = 0.0
+
+    def filter(
+        self, items: Iterable[tuple[dict, dict, str]]
+    ) -> Iterator[tuple[dict, dict, str]]:
+        for user, accounts, goals_text in items:
+            user_id = user["id"]
+            fingerprint = client_fingerprint(
+                user, accounts, goals_text, self.mode, self.model, self.version
+            )
+            self.fingerprints[user_id] = fingerprint
+            previous = self.index.get(user_id)
+            if (
+                previous is not None
+                and previous["fingerprint"] == fingerprint
+                and not previous["degraded"]
+            ):
+                self.carried[user_id] = previous["result_id"]
+                self.seconds[user_id] = previous["seconds"] or 0.0
+                self.saved_seconds += self.seconds[user_id]
+                continue
+            if previous is None:
+                self.new += 1
+            else:
+                self.changed += 1
+            # Time until the next item is pulled is this client's run cost.
+            started = time.perf_counter()
+            yield user, accounts, goals_text
+            self.seconds[user_id] = time.perf_counter() - started
+            self.compute_seconds += self.seconds[user_id]
+
+    def record(self, chunk: Iterable[tuple[dict, dict, str, Any]]) -> None:
+        """Note results that fell back to rules so they are retried next run."""
+        for user, _, _, result in chunk:
+            if result.meta.get("degraded"):
+                self.degraded.add(user["id"])
+
+    def index_rows(
+        self, result_ids: dict[str, int]
+    ) -> list[tuple[str, str, str, int, float, int]]:
+        """Rows for ``ResultsStore.update_fingerprints`` once the run is stored."""
+        return [
+            (
+                user_id,
+                self.mode,
+                fingerprint,
+                result_ids[user_id],
+                self.seconds.get(user_id, 0.0),
+                int(user_id in self.degraded),
+            )
+            for user_id, fingerprint in self.fingerprints.items()
+            if user_id in result_ids
+        ]
+
+    def report(self) -> dict[str, Any]:
+        return {
+            "clients": len(self.fingerprints),
+            "recomputed": self.changed + self.new,
+            "changed": self.changed,
+            "new": self.new,
+            "unchanged": len(self.carried),
+            "compute_s": round(self.compute_seconds, 3),
+            "saved_s": round(self.saved_seconds, 3),
+            "planner_version": self.version,
+        }
@@ -2,8 +2,22 @@ from app.config import get_config
 from app.tools.rules.goal_parser import RuleGoalParser
 from app.tools.rules.explainer import RulePlanExplainer
 from app.tools.gemini.client import GeminiClient
+from app.tools.gemini.transport import get_transport
 from app.tools.gemini.goal_parser import GeminiGoalParser
 from app.tools.gemini.explainer import GeminiPlanExplainer
+from app.tools.routing.goal_parser import RoutingGoalParser
+
+
+def build_gemini_client(cfg: dict) -> GeminiClient:
+    if not cfg.get("agent_enabled"):
+        raise RuntimeError("Agent mode requires GEMINI_API_KEY.")
+    return GeminiClient(
+        api_key=cfg.get("gemini_api_key", ""),
+        model=cfg.get("gemini_model", "gemini-3-flash-preview"),
+        timeout_seconds=cfg.get("llm_timeout_seconds", 20),
+        temperature=cfg.get("llm_temperature", 0.2),
+        transport=get_transport(cfg),
+    )
 
 
 def build_tools(mode: str, config: dict | None = None):
@@ -11,13 +25,13 @@ def build_tools(mode: str, config: dict | None = None):
     if mode == "rules":
         return RuleGoalParser(), RulePlanExplainer()
     if mode == "agent":
-        if not cfg.get("agent_enabled"):
-            raise RuntimeError("Agent mode requires GEMINI_API_KEY.")
-        client = GeminiClient(
-            api_key=cfg.get("gemini_api_key", ""),
-            model=cfg.get("gemini_model", "gemini-3-flash-preview"),
-            timeout_seconds=cfg.get("llm_timeout_seconds", 20),
-            temperature=cfg.get("llm_temperature", 0.2),
-        )
-        return GeminiGoalParser(client), GeminiPlanExplainer(client)
+        client = build_gemini_client(cfg)
+        parser = GeminiGoalParser(client)
+        if cfg.get("router_enabled", True):
+            parser = RoutingGoalParser(
+                RuleGoalParser(),
+                parser,
+                threshold=cfg.get("router_confidence_threshold", 0.85),
+            )
+        return parser, GeminiPlanExplainer(client)
     raise ValueError(f"Unsupported mode: {mode}")
@@ -0,0 +1,316 @@
+import os
+import pickle
+import tempfile
+import threading
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterator
+
+try:
+    import psutil
+except ImportError:  # pragma: no cover - optional dependency
+    psutil = None
+
+# tracemalloc's own bookkeeping; Snapshot.filter_traces is too slow to use
+# on every chunk, so only the top diff entries are checked against this.
+_IGNORED = (tracemalloc.__file__, "<frozen importlib._bootstrap>", "<unknown>")
+MB = 1024 * 1024
+
+
+def _resident_memory() -> int | None:
+    """Current resident set size, or None where it cannot be read."""
+    try:
+        with open("/proc/self/statm", encoding="ascii") as handle:
+            return int(handle.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    if psutil is not None:
+        return psutil.Process().memory_info().rss
+    # ru_maxrss is the peak, which never comes down, so it is not used.
+    return None
+
+
+def current_memory() -> int:
+    """Bytes in use: traced Python memory if tracing, else resident set size."""
+    if tracemalloc.is_tracing():
+        return tracemalloc.get_traced_memory()[0]
+    resident = _resident_memory()
+    if resident is None:
+        raise RuntimeError(
+            "Reading memory use needs /proc or psutil; install psutil or "
+            "enable MEMORY_PROFILE."
+        )
+    return resident
+
+
+@dataclass
+class StageMemory:
+    calls: int = 0
+    peak_bytes: int = 0
+    retained_bytes: int = 0
+    sites: Counter = field(default_factory=Counter)
+
+    def summary(self, top_n: int) -> dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "peak_mb": round(self.peak_bytes / MB, 3),
+            "retained_mb": round(self.retained_bytes / MB, 3),
+            "top_sites": [
+                {"site": site, "kb": round(size / 1024, 1)}
+                for site, size in self.sites.most_common(top_n)
+            ],
+        }
+
+
+@dataclass
+class _Frame:
+    name: str
+    start: int
+    peak: int
+    snapshot: tracemalloc.Snapshot | None
+    detail: dict | None
+
+
+class MemoryProfiler:
+    """Per-stage peak and retained allocations from ``tracemalloc``.
+
+    ``peak`` is the highest traced memory above the stage's starting point;
+    ``retained`` is what the stage left allocated when it finished. Stages
+    may nest. With ``stage_snapshots`` every stage diffs before/after
+    snapshots to attribute growth to source lines; otherwise only stages
+    entered with ``snapshot=True`` (batch chunks) pay for snapshots.
+    """
+
+    def __init__(self, top_n: int = 10, frames: int = 1, stage_snapshots: bool = False):
+        self.top_n = top_n
+        self.frames = frames
+        self.stage_snapshots = stage_snapshots
+        self.stages: dict[str, StageMemory] = {}
+        self.chunks: list[dict[str, Any]] = []
+        # Open stages per thread, so concurrent runs do not pop each other's.
+        self._stacks: dict[int, list[_Frame]] = {}
+        self._owns_tracing = False
+        self._lock = threading.RLock()
+
+    def start(self) -> "MemoryProfiler":
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self._owns_tracing = True
+        return self
+
+    def stop(self) -> None:
+        if self._owns_tracing:
+            tracemalloc.stop()
+            self._owns_tracing = False
+
+    def __enter__(self) -> "MemoryProfiler":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def begin(
+        self, name: str, snapshot: bool | None = None, detail: dict | None = None
+    ) -> None:
+        if not tracemalloc.is_tracing():
+            return
+        with self._lock:
+            current, peak = tracemalloc.get_traced_memory()
+            # reset_peak below is process-wide and would hide the peak so far
+            # from every open stage, on this thread or another.
+            for stack in self._stacks.values():
+                for frame in stack:
+                    frame.peak = max(frame.peak, peak)
+            take = self.stage_snapshots if snapshot is None else snapshot
+            before = tracemalloc.take_snapshot() if take else None
+            tracemalloc.reset_peak()
+            stack = self._stacks.setdefault(threading.get_ident(), [])
+            stack.append(_Frame(name, current, current, before, detail))
+
+    def end(self) -> None:
+        if not tracemalloc.is_tracing():
+            return
+        with self._lock:
+            stack = self._stacks.get(threading.get_ident())
+            if not stack:
+                return
+            frame = stack.pop()
+            current, peak = tracemalloc.get_traced_memory()
+            peak = max(frame.peak, peak)
+            if stack:
+                stack[-1].peak = max(stack[-1].peak, peak)
+            else:
+                del self._stacks[threading.get_ident()]
+            stats = self.stages.setdefault(frame.name, StageMemory())
+            stats.calls += 1
+            stats.peak_bytes = max(stats.peak_bytes, peak - frame.start)
+            stats.retained_bytes += current - frame.start
+            sites = Counter()
+            if frame.snapshot is not None:
+                after = tracemalloc.take_snapshot()
+                for diff in after.compare_to(frame.snapshot, "lineno"):
+                    where = diff.traceback[0]
+                    if diff.size_diff <= 0 or where.filename in _IGNORED:
+                        continue
+                    sites[f"{where.filename}:{where.lineno}"] += diff.size_diff
+                    if len(sites) >= self.top_n * 2:
+                        break
+                stats.sites.update(sites)
+            if frame.detail is not None:
+                self.chunks.append(
+                    {
+                        **frame.detail,
+                        "peak_mb": round((peak - frame.start) / MB, 3),
+                        "retained_mb": round((current - frame.start) / MB, 3),
+                        "top_sites": [
+                            {"site": site, "kb": round(size / 1024, 1)}
+                            for site, size in sites.most_common(3)
+                        ],
+                    }
+                )
+
+    @contextmanager
+    def stage(self, name: str, snapshot: bool | None = None):
+        self.begin(name, snapshot)
+        try:
+            yield
+        finally:
+            self.end()
+
+    def report(self) -> dict[str, Any]:
+        total = Counter()
+        for stats in self.stages.values():
+            total.update(stats.sites)
+        traced = tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else 0
+        return {
+            "traced_mb": round(traced / MB, 3),
+            "stages": {
+                name: stats.summary(self.top_n) for name, stats in self.stages.items()
+            },
+            "chunks": self.chunks,
+            "top_sites": [
+                {"site": site, "kb": round(size / 1024, 1)}
+                for site, size in total.most_common(self.top_n)
+            ],
+        }
+
+
+def stage(profiler: MemoryProfiler | None, name: str):
+    return profiler.stage(name) if profiler is not None else nullcontext()
+
+
+class SpilledChunk:
+    """Batch items pickled to a temp file and streamed back one at a time."""
+
+    def __init__(self, directory: str | Path):
+        Path(directory).mkdir(parents=True, exist_ok=True)
+        handle, path = tempfile.mkstemp(suffix=".pkl", dir=directory)
+        self.path = Path(path)
+        self._handle = os.fdopen(handle, "wb")
+        self.count = 0
+
+    def append(self, item: Any) -> None:
+        pickle.dump(item, self._handle, protocol=pickle.HIGHEST_PROTOCOL)
+        self.count += 1
+
+    def close(self) -> None:
+        if not self._handle.closed:
+            self._handle.close()
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __iter__(self) -> Iterator[Any]:
+        self.close()
+        with self.path.open("rb") as handle:
+            for _ in range(self.count):
+                yield pickle.load(handle)
+
+    def discard(self) -> None:
+        self.close()
+        self.path.unlink(missing_ok=True)
+
+
+class MemoryBudget:
+    """Keep a batch under ``limit_bytes``.
+
+    Each chunk's growth per item is measured from where the chunk started
+    and projected to the chunk's full size. When that projection would cross
+    the limit the chunk is flushed early and later chunks are sized to fit,
+    halving at least, down to ``min_chunk``. Once it cannot shrink further,
+    results are spilled to ``spill_dir`` (if set) instead of being held in
+    memory until the chunk is handed off.
+    """
+
+    def __init__(
+        self,
+        limit_bytes: int,
+        spill_dir: str | Path | None = None,
+        min_chunk: int = 10,
+    ):
+        self.limit_bytes = limit_bytes
+        self.spill_dir = Path(spill_dir) if spill_dir else None
+        self.min_chunk = min_chunk
+        self.shrinks = 0
+        self.spilled_chunks = 0
+        self.spilled_items = 0
+        self.max_usage = 0
+        self._baseline = 0
+        self._per_item = 0.0
+
+    def start_chunk(self) -> None:
+        self._baseline = current_memory()
+        self.max_usage = max(self.max_usage, self._baseline)
+
+    def over(self, items: int, chunk_size: int) -> bool:
+        """Whether a chunk of ``chunk_size`` would cross the limit.
+
+        ``items`` is how many results the current chunk holds so far.
+        """
+        usage = current_memory()
+        self.max_usage = max(self.max_usage, usage)
+        if items:
+            self._per_item = max(0, usage - self._baseline) / items
+        projected = usage + self._per_item * max(0, chunk_size - items)
+        return projected > self.limit_bytes
+
+    def shrink(self, chunk_size: int) -> int:
+        smaller = chunk_size // 2
+        if self._per_item > 0:
+            headroom = self.limit_bytes - self._baseline
+            smaller = min(smaller, int(headroom / self._per_item))
+        smaller = max(self.min_chunk, smaller)
+        if smaller < chunk_size:
+            self.shrinks += 1
+        return smaller
+
+    def report(self) -> dict[str, Any]:
+        self.max_usage = max(self.max_usage, current_memory())
+        return {
+            "limit_mb": round(self.limit_bytes / MB, 1),
+            "max_usage_mb": round(self.max_usage / MB, 1),
+            "shrinks": self.shrinks,
+            "spilled_chunks": self.spilled_chunks,
+            "spilled_items": self.spilled_items,
+        }
+
+
+def build_memory_tools(
+    cfg: dict,
+) -> tuple[MemoryProfiler | None, MemoryBudget | None]:
+    profiler = None
+    if cfg.get("memory_profile"):
+        profiler = MemoryProfiler(
+            top_n=int(cfg.get("memory_top_n", 10)),
+            stage_snapshots=bool(cfg.get("memory_stage_snapshots", False)),
+        )
+    budget = None
+    if cfg.get("memory_budget_mb"):
+        budget = MemoryBudget(
+            int(float(cfg["memory_budget_mb"]) * MB),
+            spill_dir=cfg.get("memory_spill_dir"),
+        )
+    return profiler, budget
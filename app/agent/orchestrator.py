@@ -1,28 +1,150 @@
+import asyncio
+from functools import partial
+
 from app.tools.common.plan_generator import generate_plans
 from app.tools.common.scorer import score_plans
 from app.tools.common.guardrail import apply_guardrails
 from app.tools.interfaces import DemoResult
+from app.tools.rules.goal_parser import RuleGoalParser
+from app.tools.rules.explainer import RulePlanExplainer
 from app.agent.factory import build_tools
+from app.agent.memory import MemoryProfiler, stage
+from app.agent.resilience import HedgedCaller, get_hedged_caller
+from app.agent.scheduler import LLMScheduler, get_scheduler
 from app.config import get_config
 
 
 class OrchestratorAgent:
-    def __init__(self, config: dict | None = None):
+    def __init__(
+        self,
+        config: dict | None = None,
+        caller: HedgedCaller | None = None,
+        scheduler: LLMScheduler | None = None,
+        profiler: MemoryProfiler | None = None,
+    ):
         self.config = config or get_config()
+        self.caller = caller
+        self.scheduler = scheduler
+        self.profiler = profiler
+
+    def _caller(self) -> HedgedCaller:
+        return self.caller or get_hedged_caller(self.config)
+
+    def _scheduler(self) -> LLMScheduler:
+        return self.scheduler or get_scheduler(self.config)
 
-    def run(self, mode: str, user: dict, accounts: dict, goals_text: str) -> DemoResult:
+    def _run_stage(
+        self,
+        mode: str,
+        priority: str,
+        stage: str,
+        primary,
+        fallback,
+        meta: dict,
+        *args,
+    ):
+        if mode != "agent":
+            return primary(*args)
+        scheduler = self._scheduler()
+        try:
+            value, info = self._caller().call(
+                primary,
+                *args,
+                submit=partial(scheduler.submit, priority),
+                hedge_submit=partial(scheduler.submit_hedge, priority),
+            )
+        except Exception as exc:
+            if not self.config.get("llm_fallback_enabled", True):
+                raise
+            meta.setdefault("degraded", []).append(
+                {"stage": stage, "reason": type(exc).__name__, "detail": str(exc)}
+            )
+            meta.setdefault("providers", {})[stage] = "rules"
+            return fallback(*args)
+        meta.setdefault("llm_calls", {})[stage] = info
+        meta.setdefault("providers", {})[stage] = "gemini"
+        return value
+
+    def _parse(
+        self, mode: str, priority: str, parser, meta: dict, goals_text: str, user: dict
+    ):
+        route = getattr(parser, "route", None)
+        if route is None:
+            return self._run_stage(
+                mode,
+                priority,
+                "parse",
+                parser.parse,
+                RuleGoalParser().parse,
+                meta,
+                goals_text,
+                user,
+            )
+        constraints, decision = route(goals_text, user)
+        meta["routing"] = {**decision, "calibration": parser.calibration()}
+        if decision["route"] == "rules":
+            meta.setdefault("providers", {})["parse"] = "rules"
+            return constraints
+        return self._run_stage(
+            mode,
+            priority,
+            "parse",
+            parser.llm_parser.parse,
+            lambda *_: constraints,
+            meta,
+            goals_text,
+            user,
+        )
+
+    def run(
+        self,
+        mode: str,
+        user: dict,
+        accounts: dict,
+        goals_text: str,
+        priority: str = "interactive",
+    ) -> DemoResult:
         parser, explainer = build_tools(mode, self.config)
+        meta = {"mode": mode, "priority": priority}
         user_with_mode = {**user, "mode": mode}
-        constraints = parser.parse(goals_text, user_with_mode)
-        plans = generate_plans(user, accounts, constraints)
-        scored = score_plans(plans, constraints)
-        guarded = apply_guardrails(scored, user, accounts, constraints)
-        markdown = explainer.explain(
-            guarded, {**user_with_mode, "goals_text": goals_text}, constraints
-        )
+        with stage(self.profiler, "parse"):
+            constraints = self._parse(
+                mode, priority, parser, meta, goals_text, user_with_mode
+            )
+        with stage(self.profiler, "plan"):
+            plans = generate_plans(user, accounts, constraints)
+            scored = score_plans(plans, constraints)
+            guarded = apply_guardrails(scored, user, accounts, constraints)
+        with stage(self.profiler, "explain"):
+            markdown = self._run_stage(
+                mode,
+                priority,
+                "explain",
+                explainer.explain,
+                RulePlanExplainer().explain,
+                meta,
+                guarded,
+                {**user_with_mode, "goals_text": goals_text},
+                constraints,
+            )
+        if mode == "agent":
+            meta["breaker_state"] = self._caller().breaker.state
+            meta["scheduler"] = self._scheduler().stats()[priority]
         return DemoResult(
             constraints=constraints,
             plans=guarded,
             markdown=markdown,
-            meta={"mode": mode},
+            meta=meta,
+        )
+
+    async def arun(
+        self,
+        mode: str,
+        user: dict,
+        accounts: dict,
+        goals_text: str,
+        priority: str = "interactive",
+    ) -> DemoResult:
+        return await asyncio.to_thread(
+            self.run, mode, user, accounts, goals_text, priority
         )
@@ -0,0 +1,247 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    CancelledError,
+    Future,
+    ThreadPoolExecutor,
+    wait,
+)
+from typing import Any, Callable
+
+
+class DeadlineExceeded(RuntimeError):
+    pass
+
+
+class CircuitOpenError(RuntimeError):
+    pass
+
+
+class LatencyTracker:
+    def __init__(self, window: int = 200):
+        self._samples: deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def percentile(self, pct: float) -> float | None:
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return None
+        index = min(len(samples) - 1, max(0, int(round(pct / 100 * len(samples))) - 1))
+        return samples[index]
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold: int = 5, reset_seconds: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state()
+
+    def _state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at >= self.reset_seconds:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        with self._lock:
+            state = self._state()
+            if state == "closed":
+                return True
+            if state == "half_open" and not self._probing:
+                self._probing = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._probing = False
+
+    def release(self) -> None:
+        """Give back a half-open probe that never reached the provider."""
+        with self._lock:
+            self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._probing or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+            self._probing = False
+
+
+class _Attempt:
+    """One submitted call; ``started`` is stamped when it begins executing."""
+
+    def __init__(self, fn: Callable[..., Any]):
+        self.fn = fn
+        self.started: float | None = None
+        self.dispatched = threading.Event()
+
+    def __call__(self, *args, **kwargs) -> Any:
+        self.started = time.monotonic()
+        self.dispatched.set()
+        return self.fn(*args, **kwargs)
+
+
+class HedgedCaller:
+    """Runs LLM calls under a deadline, hedging slow attempts with a duplicate.
+
+    The hedge is issued once the primary attempt has been running longer than
+    the configured latency percentile of recent successful calls. Time spent
+    queued in ``submit`` (a scheduler or this caller's pool) is not the
+    provider's: the deadline starts when the primary is dispatched and
+    latency samples cover execution only.
+    """
+
+    def __init__(
+        self,
+        deadline_seconds: float = 20.0,
+        hedge_percentile: float = 95.0,
+        hedge_min_samples: int = 20,
+        breaker: CircuitBreaker | None = None,
+        max_workers: int = 8,
+    ):
+        self.deadline_seconds = deadline_seconds
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_samples = hedge_min_samples
+        self.breaker = breaker or CircuitBreaker()
+        self.latency = LatencyTracker()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="llm-call"
+        )
+
+    def hedge_delay(self) -> float | None:
+        if len(self.latency) < self.hedge_min_samples:
+            return None
+        delay = self.latency.percentile(self.hedge_percentile)
+        if delay is None or delay >= self.deadline_seconds:
+            return None
+        return delay
+
+    def call(
+        self,
+        fn: Callable[..., Any],
+        *args,
+        submit: Callable[..., Future] | None = None,
+        hedge_submit: Callable[..., Future] | None = None,
+        **kwargs,
+    ) -> tuple[Any, dict]:
+        submit = submit or self._executor.submit
+        hedge_submit = hedge_submit or submit
+        if not self.breaker.allow():
+            raise CircuitOpenError("LLM circuit breaker is open.")
+
+        submitted = time.monotonic()
+        primary = _Attempt(fn)
+        future = submit(primary, *args, **kwargs)
+        future.add_done_callback(lambda _: primary.dispatched.set())
+        attempts = {future: primary}
+        pending = {future}
+        primary.dispatched.wait()
+        started = primary.started or time.monotonic()
+        deadline = started + self.deadline_seconds
+        info = {
+            "hedged": False,
+            "attempts": 1,
+            "queued_seconds": round(started - submitted, 3),
+        }
+        hedge_delay = self.hedge_delay()
+        last_error: BaseException | None = None
+
+        while pending:
+            now = time.monotonic()
+            if now >= deadline:
+                break
+            timeout = deadline - now
+            if hedge_delay is not None and not info["hedged"]:
+                timeout = min(timeout, max(0.0, started + hedge_delay - now))
+            done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                if future.cancelled():
+                    last_error = CancelledError()
+                    continue
+                error = future.exception()
+                if error is None:
+                    elapsed = time.monotonic() - attempts[future].started
+                    self.latency.record(elapsed)
+                    self.breaker.record_success()
+                    for other in pending:
+                        other.cancel()
+                    info["latency_seconds"] = round(elapsed, 3)
+                    return future.result(), info
+                last_error = error
+
+            if (
+                not done
+                and hedge_delay is not None
+                and not info["hedged"]
+                and time.monotonic() >= started + hedge_delay
+            ):
+                info["hedged"] = True
+                info["attempts"] += 1
+                hedge = _Attempt(fn)
+                future = hedge_submit(hedge, *args, **kwargs)
+                attempts[future] = hedge
+                pending.add(future)
+
+        for future in pending:
+            future.cancel()
+        # An attempt cancelled before it ran says nothing about the
+        # provider, so it does not count against the breaker.
+        if pending or not isinstance(last_error, CancelledError):
+            self.breaker.record_failure()
+        else:
+            self.breaker.release()
+        if last_error is not None and not pending:
+            raise last_error
+        raise DeadlineExceeded(
+            f"LLM call exceeded deadline of {self.deadline_seconds:.1f}s."
+        )
+
+
+_shared_callers: dict[tuple, HedgedCaller] = {}
+_shared_lock = threading.Lock()
+
+
+def get_hedged_caller(cfg: dict) -> HedgedCaller:
+    key = (
+        cfg.get("gemini_model"),
+        float(cfg.get("llm_deadline_seconds", 20)),
+        float(cfg.get("llm_hedge_percentile", 95)),
+        int(cfg.get("llm_hedge_min_samples", 20)),
+        int(cfg.get("llm_breaker_failures", 5)),
+        float(cfg.get("llm_breaker_reset_seconds", 30)),
+    )
+    with _shared_lock:
+        caller = _shared_callers.get(key)
+        if caller is None:
+            caller = HedgedCaller(
+                deadline_seconds=key[1],
+                hedge_percentile=key[2],
+                hedge_min_samples=key[3],
+                breaker=CircuitBreaker(failure_threshold=key[4], reset_seconds=key[5]),
+            )
+            _shared_callers[key] = caller
+        return caller
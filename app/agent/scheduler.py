@@ -0,0 +1,284 @@
+import asyncio
+import itertools
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+PRIORITIES = ("interactive", "nearline", "batch")
+
+
+@dataclass
+class ClassPolicy:
+    weight: float
+    max_concurrency: int
+    rate_per_second: float | None = None
+    burst: int = 1
+
+
+@dataclass
+class _Item:
+    priority: str
+    finish_tag: float
+    seq: int
+    enqueued_at: float
+    fn: Callable[..., Any]
+    args: tuple
+    kwargs: dict
+    future: Future = field(default_factory=Future)
+    held: bool = False
+
+
+@dataclass
+class _ClassState:
+    policy: ClassPolicy
+    queue: deque = field(default_factory=deque)
+    running: int = 0
+    last_finish: float = 0.0
+    tokens: float = 0.0
+    refilled_at: float = field(default_factory=time.monotonic)
+    submitted: int = 0
+    completed: int = 0
+    preempted: int = 0
+    wait_total: float = 0.0
+    wait_max: float = 0.0
+
+
+def default_policies(max_concurrency: int = 8) -> dict[str, ClassPolicy]:
+    return {
+        "interactive": ClassPolicy(weight=6, max_concurrency=max_concurrency),
+        "nearline": ClassPolicy(weight=3, max_concurrency=max(1, max_concurrency // 2)),
+        "batch": ClassPolicy(weight=1, max_concurrency=max(1, max_concurrency // 4)),
+    }
+
+
+class LLMScheduler:
+    """Weighted-fair scheduler shared by every LLM call in the process.
+
+    Each priority class has its own queue, concurrency cap and optional token
+    bucket. Dispatch picks the eligible head with the smallest virtual finish
+    tag, so classes share capacity in proportion to their weights. While the
+    interactive queue is at or above ``preempt_threshold`` queued batch work is
+    held back and its slots go to interactive calls.
+    """
+
+    def __init__(
+        self,
+        policies: dict[str, ClassPolicy] | None = None,
+        max_concurrency: int = 8,
+        preempt_threshold: int = 2,
+    ):
+        self.policies = policies or default_policies(max_concurrency)
+        unknown = set(self.policies) - set(PRIORITIES)
+        if unknown:
+            raise ValueError(f"Unsupported priority classes: {sorted(unknown)}")
+        self.max_concurrency = max_concurrency
+        self.preempt_threshold = preempt_threshold
+        self._classes = {
+            name: _ClassState(policy=policy, tokens=float(policy.burst))
+            for name, policy in self.policies.items()
+        }
+        self._running = 0
+        self._vtime = 0.0
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_concurrency, thread_name_prefix="llm-sched"
+        )
+        self._dispatcher = threading.Thread(
+            target=self._dispatch_loop, name="llm-sched-dispatch", daemon=True
+        )
+        self._dispatcher.start()
+
+    def submit(self, priority: str, fn: Callable[..., Any], *args, **kwargs) -> Future:
+        return self._enqueue(priority, fn, args, kwargs, hedge=False)
+
+    def submit_hedge(
+        self, priority: str, fn: Callable[..., Any], *args, **kwargs
+    ) -> Future:
+        """Submit a duplicate of a call that is already running.
+
+        The hedge goes to the head of its class queue rather than behind the
+        backlog it would otherwise wait out; it still needs a free slot and a
+        rate token, and batch hedges are still held during a spike.
+        """
+        return self._enqueue(priority, fn, args, kwargs, hedge=True)
+
+    def _enqueue(
+        self,
+        priority: str,
+        fn: Callable[..., Any],
+        args: tuple,
+        kwargs: dict,
+        hedge: bool,
+    ) -> Future:
+        if priority not in self._classes:
+            raise ValueError(f"Unsupported priority: {priority}")
+        with self._cond:
+            state = self._classes[priority]
+            if hedge:
+                finish_tag = self._vtime
+            else:
+                start = max(self._vtime, state.last_finish)
+                state.last_finish = finish_tag = start + 1.0 / state.policy.weight
+            item = _Item(
+                priority=priority,
+                finish_tag=finish_tag,
+                seq=next(self._seq),
+                enqueued_at=time.monotonic(),
+                fn=fn,
+                args=args,
+                kwargs=kwargs,
+                # Hedges are not counted as preempted work; pre-flagging them
+                # keeps the unflagged items a suffix of the queue.
+                held=hedge,
+            )
+            if hedge:
+                state.queue.appendleft(item)
+            else:
+                state.queue.append(item)
+            state.submitted += 1
+            self._cond.notify()
+        return item.future
+
+    def run(self, priority: str, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        return self.submit(priority, fn, *args, **kwargs).result()
+
+    async def arun(self, priority: str, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        return await asyncio.wrap_future(self.submit(priority, fn, *args, **kwargs))
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        now = time.monotonic()
+        with self._cond:
+            out = {}
+            for name, state in self._classes.items():
+                oldest = state.queue[0].enqueued_at if state.queue else None
+                started = state.completed + state.running
+                out[name] = {
+                    "queue_depth": len(state.queue),
+                    "running": state.running,
+                    "submitted": state.submitted,
+                    "completed": state.completed,
+                    "preempted": state.preempted,
+                    "avg_wait_seconds": (
+                        round(state.wait_total / started, 4) if started else 0.0
+                    ),
+                    "max_wait_seconds": round(state.wait_max, 4),
+                    "oldest_wait_seconds": (
+                        round(now - oldest, 4) if oldest is not None else 0.0
+                    ),
+                }
+            return out
+
+    def _refill(self, state: _ClassState, now: float) -> None:
+        rate = state.policy.rate_per_second
+        if rate is None:
+            return
+        state.tokens = min(
+            float(state.policy.burst),
+            state.tokens + (now - state.refilled_at) * rate,
+        )
+        state.refilled_at = now
+
+    def _interactive_spike(self) -> bool:
+        interactive = self._classes.get("interactive")
+        return bool(interactive) and len(interactive.queue) >= self.preempt_threshold
+
+    def _next_item(self, now: float) -> tuple[_Item | None, float | None]:
+        best: _Item | None = None
+        wake: float | None = None
+        spike = self._interactive_spike()
+        for name, state in self._classes.items():
+            while state.queue and state.queue[0].future.cancelled():
+                state.queue.popleft()
+            if not state.queue or state.running >= state.policy.max_concurrency:
+                continue
+            if name == "batch" and spike:
+                # Count each held item once; unflagged items are always a
+                # suffix of the FIFO queue, so this stops at the first seen.
+                for item in reversed(state.queue):
+                    if item.held:
+                        break
+                    item.held = True
+                    state.preempted += 1
+                continue
+            self._refill(state, now)
+            if state.policy.rate_per_second is not None and state.tokens < 1:
+                delay = (1 - state.tokens) / state.policy.rate_per_second
+                wake = delay if wake is None else min(wake, delay)
+                continue
+            head = state.queue[0]
+            if best is None or (head.finish_tag, head.seq) < (best.finish_tag, best.seq):
+                best = head
+        return best, wake
+
+    def _dispatch_loop(self) -> None:
+        while True:
+            with self._cond:
+                while True:
+                    if self._running < self.max_concurrency:
+                        now = time.monotonic()
+                        item, wake = self._next_item(now)
+                        if item is not None:
+                            break
+                        self._cond.wait(timeout=wake)
+                    else:
+                        self._cond.wait()
+                state = self._classes[item.priority]
+                state.queue.popleft()
+                if not item.future.set_running_or_notify_cancel():
+                    continue
+                if state.policy.rate_per_second is not None:
+                    state.tokens -= 1
+                waited = now - item.enqueued_at
+                state.wait_total += waited
+                state.wait_max = max(state.wait_max, waited)
+                state.running += 1
+                self._running += 1
+                self._vtime = max(self._vtime, item.finish_tag - 1.0 / state.policy.weight)
+            self._executor.submit(self._execute, item)
+
+    def _execute(self, item: _Item) -> None:
+        try:
+            result = item.fn(*item.args, **item.kwargs)
+        except BaseException as exc:
+            item.future.set_exception(exc)
+        else:
+            item.future.set_result(result)
+        finally:
+            with self._cond:
+                state = self._classes[item.priority]
+                state.running -= 1
+                state.completed += 1
+                self._running -= 1
+                self._cond.notify()
+
+
+_shared_schedulers: dict[tuple, LLMScheduler] = {}
+_shared_lock = threading.Lock()
+
+
+def get_scheduler(cfg: dict) -> LLMScheduler:
+    key = (
+        int(cfg.get("llm_max_concurrency", 8)),
+        cfg.get("llm_rate_per_second"),
+        int(cfg.get("llm_preempt_threshold", 2)),
+    )
+    with _shared_lock:
+        scheduler = _shared_schedulers.get(key)
+        if scheduler is None:
+            max_concurrency, rate, preempt_threshold = key
+            policies = default_policies(max_concurrency)
+            if rate:
+                for name, share in (("interactive", 0.6), ("nearline", 0.3), ("batch", 0.1)):
+                    policies[name].rate_per_second = rate * share
+                    policies[name].burst = max(1, int(rate * share))
+            scheduler = LLMScheduler(
+                policies=policies,
+                max_concurrency=max_concurrency,
+                preempt_threshold=preempt_threshold,
+            )
+            _shared_schedulers[key] = scheduler
+        return scheduler
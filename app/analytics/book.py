@@ -0,0 +1,355 @@
+from typing import Any, Iterable
+
+import numpy as np
+
+USER_ATTRIBUTES = ("region", "age", "risk_tolerance", "dependents")
+DEFAULT_AGE_BANDS = (0, 30, 45, 60)
+
+
+class _Column:
+    """Growable 1-D array with amortised O(1) appends of whole chunks."""
+
+    def __init__(self, dtype):
+        self._data = np.empty(1024, dtype=dtype)
+        self._size = 0
+
+    def extend(self, values: np.ndarray) -> None:
+        needed = self._size + len(values)
+        if needed > len(self._data):
+            grown = np.empty(max(needed, 2 * len(self._data)), dtype=self._data.dtype)
+            grown[: self._size] = self._data[: self._size]
+            self._data = grown
+        self._data[self._size : needed] = values
+        self._size = needed
+
+    @property
+    def values(self) -> np.ndarray:
+        return self._data[: self._size]
+
+    def __len__(self) -> int:
+        return self._size
+
+
+class _Codes:
+    """Maps labels to dense integer codes."""
+
+    def __init__(self):
+        self.labels: list[Any] = []
+        self._index: dict[Any, int] = {}
+
+    def encode(self, values: Iterable[Any]) -> np.ndarray:
+        values = np.asarray(
+            list(values) if not isinstance(values, np.ndarray) else values
+        )
+        if not len(values):
+            return np.empty(0, dtype=np.int64)
+        uniq, first, inverse = np.unique(values, return_index=True, return_inverse=True)
+        # New labels get codes in order of first appearance, so codes line
+        # up with columns appended in input order.
+        mapped = np.empty(len(uniq), dtype=np.int64)
+        labels = uniq.tolist()
+        for i in np.argsort(first, kind="stable").tolist():
+            mapped[i] = self._code(labels[i])
+        return mapped[inverse.reshape(-1)]
+
+    def _code(self, label: Any) -> int:
+        code = self._index.get(label)
+        if code is None:
+            code = len(self.labels)
+            self._index[label] = code
+            self.labels.append(label)
+        return code
+
+    def lookup(self, labels: Iterable[Any]) -> np.ndarray:
+        labels = np.asarray(
+            list(labels) if not isinstance(labels, np.ndarray) else labels
+        )
+        if not len(labels):
+            return np.empty(0, dtype=np.int64)
+        uniq, inverse = np.unique(labels, return_inverse=True)
+        missing = [label for label in uniq.tolist() if label not in self._index]
+        if missing:
+            raise KeyError(f"Unknown ids: {missing[:5]}")
+        mapped = np.array(
+            [self._index[label] for label in uniq.tolist()], dtype=np.int64
+        )
+        return mapped[inverse.reshape(-1)]
+
+
+class AccountBook:
+    """Columnar store of a client book for vectorized KPI aggregation.
+
+    Clients, debts and investments are kept as flat numpy columns keyed by a
+    dense client index, and per-client totals are maintained incrementally so
+    that streaming in new account rows costs O(rows added).
+    """
+
+    def __init__(self):
+        self._clients = _Codes()
+        self._debt_types = _Codes()
+        self._attr_codes = {name: _Codes() for name in ("region", "risk_tolerance")}
+        self._client_cols = {
+            "income": _Column(np.float64),
+            "expenses": _Column(np.float64),
+            "cash": _Column(np.float64),
+            "age": _Column(np.int64),
+            "dependents": _Column(np.int64),
+            "region": _Column(np.int64),
+            "risk_tolerance": _Column(np.int64),
+        }
+        self._debts = {
+            "client": _Column(np.int64),
+            "type": _Column(np.int64),
+            "balance": _Column(np.float64),
+            "apr": _Column(np.float64),
+            "min_payment": _Column(np.float64),
+        }
+        self._invest = {"client": _Column(np.int64), "balance": _Column(np.float64)}
+        self._totals = {
+            name: np.zeros(0)
+            for name in (
+                "debt",
+                "debt_positive",
+                "debt_apr_weighted",
+                "min_payments",
+                "investments",
+            )
+        }
+
+    @classmethod
+    def from_records(cls, users: list[dict], accounts: list[dict]) -> "AccountBook":
+        book = cls()
+        book.add_users(users)
+        book.add_accounts(accounts)
+        return book
+
+    def __len__(self) -> int:
+        return len(self._clients.labels)
+
+    @property
+    def client_ids(self) -> list[str]:
+        return list(self._clients.labels)
+
+    @property
+    def debt_rows(self) -> int:
+        return len(self._debts["client"])
+
+    def add_users(self, users: list[dict]) -> None:
+        # First record wins for ids repeated within the batch.
+        fresh: dict[str, dict] = {}
+        for user in users:
+            if user["id"] not in self._clients._index:
+                fresh.setdefault(user["id"], user)
+        new = list(fresh.values())
+        if not new:
+            return
+        for user_id in fresh:
+            self._clients._code(user_id)
+        cols = self._client_cols
+        cols["income"].extend(
+            np.array([u.get("income_monthly", 0) for u in new], float)
+        )
+        cols["expenses"].extend(
+            np.array([u.get("expenses_monthly", 0) for u in new], float)
+        )
+        cols["cash"].extend(np.zeros(len(new)))
+        cols["age"].extend(np.array([u.get("age", 0) for u in new], np.int64))
+        cols["dependents"].extend(
+            np.array([u.get("dependents", 0) for u in new], np.int64)
+        )
+        for name in ("region", "risk_tolerance"):
+            cols[name].extend(
+                self._attr_codes[name].encode([str(u.get(name, "")) for u in new])
+            )
+        for name, values in self._totals.items():
+            self._totals[name] = np.concatenate([values, np.zeros(len(new))])
+
+    def add_accounts(self, accounts: list[dict]) -> None:
+        """Add account records in the shape of ``accounts.json``.
+
+        ``cash`` on a record replaces the client's cash balance; debts and
+        investments are appended.
+        """
+        if not accounts:
+            return
+        clients = self._clients.lookup([a["user_id"] for a in accounts])
+        has_cash = np.array(["cash" in a for a in accounts])
+        cash = np.array([a.get("cash", 0) for a in accounts], float)
+        self._client_cols["cash"].values[clients[has_cash]] = cash[has_cash]
+
+        debt_client, debt_type, balance, apr, min_payment = [], [], [], [], []
+        invest_client, invest_balance = [], []
+        for idx, record in zip(clients.tolist(), accounts):
+            for debt in record.get("debts", []):
+                debt_client.append(idx)
+                debt_type.append(debt.get("type", "unknown"))
+                balance.append(debt.get("balance", 0))
+                apr.append(debt.get("apr", 0))
+                min_payment.append(debt.get("min_payment", 0))
+            for item in record.get("investments", []):
+                invest_client.append(idx)
+                invest_balance.append(item.get("balance", 0))
+        self.append_debts(
+            np.array(debt_client, np.int64),
+            np.array(debt_type, dtype=object),
+            np.array(balance, float),
+            np.array(apr, float),
+            np.array(min_payment, float),
+        )
+        self.append_investments(
+            np.array(invest_client, np.int64), np.array(invest_balance, float)
+        )
+
+    def client_index(self, user_ids: Iterable[str]) -> np.ndarray:
+        return self._clients.lookup(user_ids)
+
+    def debt_type_codes(self, labels: Iterable[str]) -> np.ndarray:
+        return self._debt_types.encode(labels)
+
+    def append_debts(
+        self,
+        client: np.ndarray,
+        debt_type: np.ndarray,
+        balance: np.ndarray,
+        apr: np.ndarray,
+        min_payment: np.ndarray,
+    ) -> None:
+        """Append already-flattened debt rows.
+
+        ``client`` holds client indexes (see ``client_index``); ``debt_type``
+        holds either labels or codes from ``debt_type_codes``.
+        """
+        if not len(client):
+            return
+        n = len(self)
+        positive = np.where(balance > 0, balance, 0.0)
+        totals = self._totals
+        totals["debt"] += np.bincount(client, weights=balance, minlength=n)
+        totals["debt_positive"] += np.bincount(client, weights=positive, minlength=n)
+        totals["debt_apr_weighted"] += np.bincount(
+            client, weights=positive * apr, minlength=n
+        )
+        totals["min_payments"] += np.bincount(client, weights=min_payment, minlength=n)
+        self._debts["client"].extend(client)
+        if not np.issubdtype(np.asarray(debt_type).dtype, np.integer):
+            debt_type = self._debt_types.encode(debt_type)
+        self._debts["type"].extend(debt_type)
+        self._debts["balance"].extend(balance)
+        self._debts["apr"].extend(apr)
+        self._debts["min_payment"].extend(min_payment)
+
+    def append_investments(self, client: np.ndarray, balance: np.ndarray) -> None:
+        if not len(client):
+            return
+        self._totals["investments"] += np.bincount(
+            client, weights=balance, minlength=len(self)
+        )
+        self._invest["client"].extend(client)
+        self._invest["balance"].extend(balance)
+
+    def client_kpis(self, min_emergency_fund_months: int = 3) -> dict[str, np.ndarray]:
+        cols = {name: col.values for name, col in self._client_cols.items()}
+        totals = self._totals
+        with np.errstate(divide="ignore", invalid="ignore"):
+            apr = np.where(
+                totals["debt_positive"] > 0,
+                totals["debt_apr_weighted"] / totals["debt_positive"],
+                0.0,
+            )
+            target = cols["expenses"] * min_emergency_fund_months
+            progress = np.where(target > 0, cols["cash"] / target * 100, 100.0)
+        return {
+            "cash": cols["cash"],
+            "debt_total": totals["debt"],
+            "investment_total": totals["investments"],
+            "min_payments": totals["min_payments"],
+            "weighted_apr": apr,
+            "net_worth": cols["cash"] + totals["investments"] - totals["debt"],
+            "monthly_disposable": cols["income"] - cols["expenses"],
+            "emergency_target": target,
+            "emergency_progress": progress,
+            "below_emergency_target": cols["cash"] < target,
+        }
+
+    def group_codes(
+        self, by: str, age_bands: tuple[int, ...] = DEFAULT_AGE_BANDS
+    ) -> tuple[np.ndarray, list[Any]]:
+        if by in self._attr_codes:
+            return self._client_cols[by].values, list(self._attr_codes[by].labels)
+        if by == "dependents":
+            uniq, codes = np.unique(
+                self._client_cols["dependents"].values, return_inverse=True
+            )
+            return codes, uniq.tolist()
+        if by in ("age", "age_band"):
+            codes = np.searchsorted(
+                np.asarray(age_bands[1:]), self._client_cols["age"].values, side="right"
+            )
+            bounds = list(age_bands) + [None]
+            labels = [
+                f"{lo}+" if hi is None else f"{lo}-{hi - 1}"
+                for lo, hi in zip(bounds[:-1], bounds[1:])
+            ]
+            return codes, labels
+        raise ValueError(f"Unsupported group attribute: {by}")
+
+    def group_kpis(
+        self,
+        by: str,
+        min_emergency_fund_months: int = 3,
+        age_bands: tuple[int, ...] = DEFAULT_AGE_BANDS,
+    ) -> dict[Any, dict[str, float]]:
+        codes, labels = self.group_codes(by, age_bands)
+        k = len(labels)
+        kpis = self.client_kpis(min_emergency_fund_months)
+
+        def total(values):
+            return np.bincount(codes, weights=values, minlength=k)
+
+        clients = np.bincount(codes, minlength=k)
+        debt_positive = total(self._totals["debt_positive"])
+        apr_weighted = total(self._totals["debt_apr_weighted"])
+        below = total(kpis["below_emergency_target"].astype(float))
+        net_worth = total(kpis["net_worth"])
+        with np.errstate(divide="ignore", invalid="ignore"):
+            apr = np.where(debt_positive > 0, apr_weighted / debt_positive, 0.0)
+            share_below = np.where(clients > 0, below / clients, 0.0)
+            mean_net_worth = np.where(clients > 0, net_worth / clients, 0.0)
+        columns = {
+            "clients": clients,
+            "debt_total": total(kpis["debt_total"]),
+            "investment_total": total(kpis["investment_total"]),
+            "cash_total": total(kpis["cash"]),
+            "min_payments": total(kpis["min_payments"]),
+            "net_worth_total": net_worth,
+            "net_worth_mean": mean_net_worth,
+            "weighted_apr": apr,
+            "share_below_emergency_target": share_below,
+        }
+        return {
+            labels[i]: {name: values[i].item() for name, values in columns.items()}
+            for i in range(k)
+            if clients[i]
+        }
+
+    def debt_exposure(
+        self, by: str | None = None, age_bands: tuple[int, ...] = DEFAULT_AGE_BANDS
+    ) -> dict[Any, dict[str, float]]:
+        """Total debt balance by debt type, optionally split by a user attribute."""
+        types = self._debts["type"].values
+        balance = self._debts["balance"].values
+        type_labels = self._debt_types.labels
+        t = len(type_labels)
+        if by is None:
+            sums = np.bincount(types, weights=balance, minlength=t)
+            return {type_labels[i]: sums[i].item() for i in range(t)}
+        client_codes, labels = self.group_codes(by, age_bands)
+        groups = client_codes[self._debts["client"].values]
+        sums = np.bincount(
+            groups * t + types, weights=balance, minlength=len(labels) * t
+        ).reshape(len(labels), t)
+        return {
+            labels[g]: {type_labels[i]: sums[g, i].item() for i in range(t)}
+            for g in range(len(labels))
+            if sums[g].any()
+        }
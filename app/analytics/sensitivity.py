@@ -0,0 +1,179 @@
+from typing import Any, Sequence
+
+import numpy as np
+
+from app.kpi import sum_debt, sum_investments, weighted_apr
+from app.money import CENTS, DOLLAR, allocate_cents, scale_cents, to_cents, to_dollars
+from app.tools.common.strategies import StrategySet, load_strategies
+from app.tools.interfaces import Constraints
+
+AXES = ("income_pct", "expense_pct", "apr_shift", "cash_shock")
+EMERGENCY, DEBT, INVEST = "Emergency fund", "Debt payment", "Invest"
+
+
+def _guard(
+    amounts: np.ndarray, disposable: np.ndarray, gap: np.ndarray, emergency: int
+) -> np.ndarray:
+    """``apply_guardrails`` over the grid; ``disposable`` and ``gap`` in cents."""
+    total = amounts.sum(axis=-1)
+    over = total * CENTS > disposable[..., None]
+    budget = disposable[..., None]
+    split = allocate_cents(budget, amounts, unit=DOLLAR) // CENTS
+    guarded = np.where(over[..., None], split, np.round(amounts))
+    missing = (gap[..., None] > 0) & (amounts[..., emergency] <= 0)
+    insert = np.minimum(-(-gap // CENTS), disposable // CENTS)
+    guarded[..., emergency] = np.where(
+        missing, insert[..., None], guarded[..., emergency]
+    )
+    return guarded
+
+
+def _recommend(
+    scores: np.ndarray, guarded: np.ndarray, tie_break: Sequence[int]
+) -> np.ndarray:
+    # Same ordering as pick_recommendation: score, then debt, emergency, invest;
+    # ties keep the first plan.
+    whole = np.trunc(guarded)
+    keys = (scores, *(whole[..., j] for j in tie_break))
+    best = np.zeros(scores.shape[:-1], dtype=np.int64)
+    for plan in range(1, scores.shape[-1]):
+        better = np.zeros(best.shape, dtype=bool)
+        decided = np.zeros(best.shape, dtype=bool)
+        for key in keys:
+            current = np.take_along_axis(key, best[..., None], axis=-1)[..., 0]
+            candidate = key[..., plan]
+            better |= ~decided & (candidate > current)
+            decided |= candidate != current
+        best = np.where(better, plan, best)
+    return best
+
+
+def sensitivity_grid(
+    user: dict,
+    accounts: dict,
+    constraints: Constraints,
+    income_pct: Sequence[float] = (0.0,),
+    expense_pct: Sequence[float] = (0.0,),
+    apr_shift: Sequence[float] = (0.0,),
+    cash_shock: Sequence[float] = (0.0,),
+    months: int = 12,
+    strategies: StrategySet | None = None,
+) -> dict[str, Any]:
+    """Evaluate plans, scores and projections over a grid of perturbations.
+
+    ``income_pct`` and ``expense_pct`` are relative changes (-0.1 is a 10%
+    drop), ``apr_shift`` is added to every debt APR and ``cash_shock`` to the
+    cash balance. Constraints are held fixed, so no parser call is needed.
+    Every returned array is indexed by the four axes in ``AXES`` order.
+    """
+    axes = {
+        "income_pct": np.asarray(income_pct, dtype=float),
+        "expense_pct": np.asarray(expense_pct, dtype=float),
+        "apr_shift": np.asarray(apr_shift, dtype=float),
+        "cash_shock": np.asarray(cash_shock, dtype=float),
+    }
+    inc, exp, apr, shock = np.meshgrid(*axes.values(), indexing="ij")
+    income = user["income_monthly"] * (1 + inc)
+    expenses = user["expenses_monthly"] * (1 + exp)
+    cash = np.maximum(0.0, accounts.get("cash", 0) + shock)
+
+    # Budget and gap in cents, as the scalar plan generator computes them.
+    expense_cents = to_cents(expenses)
+    disposable_cents = np.maximum(0, to_cents(income) - expense_cents)
+    target = scale_cents(expense_cents, constraints.min_emergency_fund_months)
+    gap_cents = np.maximum(0, target - to_cents(cash))
+    disposable = to_dollars(disposable_cents)
+    gap = to_dollars(gap_cents)
+
+    strategies = strategies or load_strategies()
+    index = strategies.action_index
+    emergency, debt, invest = index[EMERGENCY], index[DEBT], index[INVEST]
+    amounts, scores = strategies.evaluate(
+        disposable, {"emergency_gap": -(-gap_cents // CENTS)}, constraints.__dict__
+    )
+    guarded = _guard(amounts, disposable_cents, gap_cents, emergency)
+    recommended = _recommend(scores, guarded, (debt, emergency, invest))
+
+    chosen = np.take_along_axis(guarded, recommended[..., None, None], axis=-2)[
+        ..., 0, :
+    ]
+    debt0 = float(sum_debt(accounts))
+    invest0 = float(sum_investments(accounts))
+    steps = np.arange(1, months + 1)
+    debt_path = np.maximum(0.0, debt0 - chosen[..., debt, None] * steps)
+    emergency_end = cash + chosen[..., emergency] * months
+    invest_end = invest0 + chosen[..., invest] * months
+    rate = np.maximum(0.0, weighted_apr(accounts) + apr) / 12
+    interest = (debt_path * rate[..., None]).sum(axis=-1)
+
+    return {
+        "axes": axes,
+        "plan_names": list(strategies.names),
+        "action_types": list(strategies.action_types),
+        "disposable": disposable,
+        "emergency_gap": gap,
+        "scores": scores,
+        "allocations": guarded,
+        "recommended": recommended,
+        "recommended_score": np.take_along_axis(
+            scores, recommended[..., None], axis=-1
+        )[..., 0],
+        "emergency_end": emergency_end,
+        "debt_end": debt_path[..., -1],
+        "investments_end": invest_end,
+        "net_worth_end": emergency_end + invest_end - debt_path[..., -1],
+        "interest_cost": interest,
+    }
+
+
+def surface_records(
+    grid: dict[str, Any],
+    x: str = "income_pct",
+    y: str = "expense_pct",
+    fixed: dict[str, int] | None = None,
+) -> list[dict[str, Any]]:
+    """Flatten a 2-D slice of the grid into rows for charting.
+
+    Axes other than ``x`` and ``y`` are held at the index given in ``fixed``
+    (default 0).
+    """
+    fixed = fixed or {}
+    index = []
+    for name in AXES:
+        index.append(slice(None) if name in (x, y) else fixed.get(name, 0))
+    index = tuple(index)
+    xs, ys = grid["axes"][x], grid["axes"][y]
+    transpose = AXES.index(x) > AXES.index(y)
+
+    def cut(values):
+        sliced = values[index]
+        return sliced.T if transpose else sliced
+
+    recommended = cut(grid["recommended"])
+    score = cut(grid["recommended_score"])
+    net_worth = cut(grid["net_worth_end"])
+    interest = cut(grid["interest_cost"])
+    allocations = grid["allocations"][index]
+    emergency, debt, invest = (
+        grid["action_types"].index(name) for name in (EMERGENCY, DEBT, INVEST)
+    )
+    if transpose:
+        allocations = allocations.transpose(1, 0, 2, 3)
+    rows = []
+    for i, xv in enumerate(xs.tolist()):
+        for j, yv in enumerate(ys.tolist()):
+            plan = int(recommended[i, j])
+            rows.append(
+                {
+                    x: xv,
+                    y: yv,
+                    "Recommended plan": grid["plan_names"][plan],
+                    "Score": int(score[i, j]),
+                    "Emergency": float(allocations[i, j, plan, emergency]),
+                    "Debt": float(allocations[i, j, plan, debt]),
+                    "Invest": float(allocations[i, j, plan, invest]),
+                    "Net worth (end)": float(net_worth[i, j]),
+                    "Interest cost": float(interest[i, j]),
+                }
+            )
+    return rows
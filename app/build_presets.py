@@ -0,0 +1,191 @@
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from app.config import ROOT, get_config
+from app.data.goal_library import get_goal_library
+
+DOCS_DATA = ROOT / "docs" / "data"
+MOCK_DIR = DOCS_DATA / "mock"
+PRESET_DIR = DOCS_DATA / "presets"
+CURATED_PRESETS = PRESET_DIR / "preset_outputs.json"
+MANIFEST_VERSION = 1
+
+
+def _read_json(path: Path):
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def _preset_id(mode: str, user_id: str, goals_text: str) -> str:
+    digest = hashlib.sha1(goals_text.encode("utf-8")).hexdigest()[:10]
+    return f"{mode}_{user_id}_{digest}"
+
+
+def _label(goals_text: str, limit: int = 60) -> str:
+    text = goals_text.rstrip(".")
+    return text if len(text) <= limit else text[: limit - 3].rstrip() + "..."
+
+
+def build_persona(args: tuple[str, dict, dict, list[str], dict]) -> list[dict]:
+    """Run every goal for one persona; executed in a worker process."""
+    from app.agent.orchestrator import OrchestratorAgent
+
+    mode, user, accounts, goal_texts, config = args
+    agent = OrchestratorAgent(config=config)
+    presets = []
+    for goals_text in goal_texts:
+        result = agent.run(mode, user, accounts, goals_text, priority="batch")
+        presets.append(
+            {
+                "id": _preset_id(mode, user["id"], goals_text),
+                "mode": mode,
+                "user_id": user["id"],
+                "label": _label(goals_text),
+                "input_goals_text": goals_text,
+                "constraints": result.constraints.__dict__,
+                "plans": [
+                    {
+                        "name": plan.name,
+                        "score": plan.score,
+                        "actions": [a.__dict__ for a in plan.actions],
+                    }
+                    for plan in result.plans
+                ],
+                "markdown_output": result.markdown,
+            }
+        )
+    return presets
+
+
+def _encode_shard(presets: list[dict]) -> bytes:
+    payload = json.dumps(presets, sort_keys=True, separators=(",", ":"))
+    # mtime=0 keeps the gzip header, and so the file bytes, reproducible.
+    return gzip.compress(payload.encode("utf-8"), compresslevel=9, mtime=0)
+
+
+def _worker_config(cfg: dict, workers: int) -> dict:
+    """Split the LLM scheduler's global limits evenly across ``workers``.
+
+    Each worker process gets its own scheduler, so without this every
+    worker would allow the full concurrency and rate.
+    """
+    cfg = dict(cfg)
+    cfg["llm_max_concurrency"] = max(
+        1, int(cfg.get("llm_max_concurrency", 8)) // workers
+    )
+    if cfg.get("llm_rate_per_second"):
+        cfg["llm_rate_per_second"] = float(cfg["llm_rate_per_second"]) / workers
+    return cfg
+
+
+def build_presets(
+    mode: str,
+    out_dir: Path = PRESET_DIR,
+    workers: int | None = None,
+    include_curated: bool = True,
+    config: dict | None = None,
+) -> dict:
+    started = time.perf_counter()
+    cfg = config or get_config()
+    users = _read_json(MOCK_DIR / "users.json")
+    accounts = {a["user_id"]: a for a in _read_json(MOCK_DIR / "accounts.json")}
+    goals = _read_json(MOCK_DIR / "goals.json")
+    empty = {"cash": 0, "debts": [], "investments": []}
+    workers = min(workers or os.cpu_count() or 1, max(1, len(users)))
+    if mode == "agent":
+        # Never run more workers than the global concurrency allows.
+        workers = min(workers, max(1, int(cfg.get("llm_max_concurrency", 8))))
+        cfg = _worker_config(cfg, workers)
+
+    jobs = [
+        (
+            mode,
+            user,
+            accounts.get(user["id"], empty),
+            get_goal_library(user["id"], goals),
+            cfg,
+        )
+        for user in users
+    ]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        generated = list(pool.map(build_persona, jobs))
+
+    by_user: dict[str, list[dict]] = {user["id"]: [] for user in users}
+    if include_curated and CURATED_PRESETS.exists():
+        for preset in _read_json(CURATED_PRESETS):
+            by_user.setdefault(preset["user_id"], []).append(preset)
+    for presets in generated:
+        for preset in presets:
+            by_user[preset["user_id"]].append(preset)
+
+    shard_dir = out_dir / "shards"
+    shard_dir.mkdir(parents=True, exist_ok=True)
+    # Shards of personas that no longer exist would linger on Pages forever.
+    for stale in shard_dir.glob("*.json.gz"):
+        if stale.name.removesuffix(".json.gz") not in by_user:
+            stale.unlink()
+    manifest = {"version": MANIFEST_VERSION, "shards": {}}
+    shard_bytes = {}
+    for user_id in sorted(by_user):
+        presets = by_user[user_id]
+        data = _encode_shard(presets)
+        path = shard_dir / f"{user_id}.json.gz"
+        path.write_bytes(data)
+        shard_bytes[user_id] = len(data)
+        manifest["shards"][user_id] = {
+            "path": f"shards/{user_id}.json.gz",
+            "bytes": len(data),
+            "sha256": hashlib.sha256(data).hexdigest(),
+            "presets": len(presets),
+        }
+    manifest_data = (
+        json.dumps(manifest, sort_keys=True, separators=(",", ":")) + "\n"
+    ).encode("utf-8")
+    (out_dir / "manifest.json").write_bytes(manifest_data)
+
+    first_user = users[0]["id"] if users else None
+    return {
+        "mode": mode,
+        "personas": len(users),
+        "presets": sum(len(p) for p in by_user.values()),
+        "build_seconds": round(time.perf_counter() - started, 3),
+        "manifest_bytes": len(manifest_data),
+        "total_bytes": len(manifest_data) + sum(shard_bytes.values()),
+        "first_load_bytes": len(manifest_data) + shard_bytes.get(first_user, 0),
+        "curated_blob_bytes": (
+            CURATED_PRESETS.stat().st_size if CURATED_PRESETS.exists() else 0
+        ),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Precompute sharded preset outputs for the GitHub Pages demo."
+    )
+    parser.add_argument("--mode", choices=["rules", "agent"], default="agent")
+    parser.add_argument("--out", type=Path, default=PRESET_DIR)
+    parser.add_argument("--workers", type=int)
+    parser.add_argument(
+        "--no-curated",
+        action="store_true",
+        help="Do not fold preset_outputs.json into the shards.",
+    )
+    args = parser.parse_args()
+
+    config = get_config()
+    if args.mode == "agent" and not config["agent_enabled"]:
+        sys.exit("Agent presets require GEMINI_API_KEY; use --mode rules instead.")
+    report = build_presets(
+        args.mode, args.out, args.workers, not args.no_curated, config
+    )
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -19,14 +19,56 @@ def _get_bool(name: str, default: bool) -> bool:
     return default
 
 
+def _get_optional_float(name: str) -> float | None:
+    raw = os.getenv(name, "").strip()
+    return float(raw) if raw else None
+
+
 def get_config():
     api_key = os.getenv("GEMINI_API_KEY", "").strip()
+    cassette = os.getenv("LLM_CASSETTE", "").strip() or None
+    cassette_mode = os.getenv("LLM_CASSETTE_MODE", "").strip().lower() or None
+    replay = cassette is not None and cassette_mode in (None, "replay")
     return {
-        "agent_enabled": bool(api_key),
+        # Replaying a cassette runs agent mode offline, without a key.
+        "agent_enabled": bool(api_key) or replay,
         "gemini_api_key": api_key,
         "gemini_model": os.getenv("GEMINI_MODEL", "gemini-3-flash-preview"),
         "llm_timeout_seconds": int(os.getenv("LLM_TIMEOUT_SECONDS", "20")),
         "llm_temperature": float(os.getenv("LLM_TEMPERATURE", "0.2")),
+        "llm_deadline_seconds": float(os.getenv("LLM_DEADLINE_SECONDS", "20")),
+        "llm_hedge_percentile": float(os.getenv("LLM_HEDGE_PERCENTILE", "95")),
+        "llm_hedge_min_samples": int(os.getenv("LLM_HEDGE_MIN_SAMPLES", "20")),
+        "llm_breaker_failures": int(os.getenv("LLM_BREAKER_FAILURES", "5")),
+        "llm_breaker_reset_seconds": float(
+            os.getenv("LLM_BREAKER_RESET_SECONDS", "30")
+        ),
+        "llm_fallback_enabled": _get_bool("LLM_FALLBACK_ENABLED", True),
+        "llm_max_concurrency": int(os.getenv("LLM_MAX_CONCURRENCY", "8")),
+        "llm_rate_per_second": _get_optional_float("LLM_RATE_PER_SECOND"),
+        "llm_preempt_threshold": int(os.getenv("LLM_PREEMPT_THRESHOLD", "2")),
+        "llm_cassette": cassette,
+        "llm_cassette_mode": cassette_mode,
+        "llm_replay_latency": os.getenv("LLM_REPLAY_LATENCY", "instant"),
+        "llm_replay_speed": float(os.getenv("LLM_REPLAY_SPEED", "1")),
+        "llm_replay_on_miss": os.getenv("LLM_REPLAY_ON_MISS", "error"),
+        "llm_fault_timeout": float(os.getenv("LLM_FAULT_TIMEOUT", "0")),
+        "llm_fault_empty": float(os.getenv("LLM_FAULT_EMPTY", "0")),
+        "llm_fault_malformed": float(os.getenv("LLM_FAULT_MALFORMED", "0")),
+        "llm_fault_seed": int(os.getenv("LLM_FAULT_SEED", "0")),
+        "router_enabled": _get_bool("ROUTER_ENABLED", True),
+        "router_confidence_threshold": float(
+            os.getenv("ROUTER_CONFIDENCE_THRESHOLD", "0.85")
+        ),
+        "memory_profile": _get_bool("MEMORY_PROFILE", False),
+        "memory_stage_snapshots": _get_bool("MEMORY_STAGE_SNAPSHOTS", False),
+        "memory_top_n": int(os.getenv("MEMORY_TOP_N", "10")),
+        "memory_budget_mb": _get_optional_float("MEMORY_BUDGET_MB"),
+        "memory_spill_dir": os.getenv("MEMORY_SPILL_DIR", "").strip() or None,
+        "planner_version": os.getenv("PLANNER_VERSION", "").strip() or None,
+        "results_store_path": os.getenv(
+            "RESULTS_STORE_PATH", str(ROOT / "data" / "results.db")
+        ),
         "goals_min_chars": int(os.getenv("GOALS_MIN_CHARS", "20")),
         "goals_max_chars": int(os.getenv("GOALS_MAX_CHARS", "400")),
         "goals_max_lines": int(os.getenv("GOALS_MAX_LINES", "5")),
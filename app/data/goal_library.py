@@ -0,0 +1,18 @@
+GOAL_TEMPLATES = [
+    "Pay off high-interest debt first while keeping a minimum emergency buffer.",
+    "Increase long-term investments but avoid large monthly drawdown risk.",
+    "Build a 6-month emergency fund before increasing discretionary spending.",
+    "Stabilize cash flow, reduce monthly obligations, and avoid new debt.",
+]
+
+
+def get_goal_library(user_id: str, all_goals: list[dict[str, str]]) -> list[str]:
+    goals = [item["goals_text"] for item in all_goals if item["user_id"] == user_id]
+    merged = goals + GOAL_TEMPLATES
+    deduped = []
+    seen = set()
+    for text in merged:
+        if text not in seen:
+            seen.add(text)
+            deduped.append(text)
+    return deduped
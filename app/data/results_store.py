@@ -0,0 +1,642 @@
+import json
+import re
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Iterable
+
+from app.config import ROOT
+from app.kpi import emergency_progress, net_worth, sum_debt, weighted_apr
+from app.report_data import build_plan_rows, pick_recommendation
+from app.tools.interfaces import Constraints, DemoResult, Plan, PlanAction
+
+DEFAULT_PATH = ROOT / "data" / "results.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY,
+    created_at REAL NOT NULL,
+    mode TEXT NOT NULL,
+    label TEXT
+);
+CREATE TABLE IF NOT EXISTS clients (
+    user_id TEXT PRIMARY KEY,
+    age INTEGER,
+    region TEXT,
+    risk_tolerance TEXT,
+    dependents INTEGER,
+    income_monthly REAL,
+    expenses_monthly REAL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS results (
+    result_id INTEGER PRIMARY KEY,
+    run_id INTEGER NOT NULL REFERENCES runs(run_id),
+    user_id TEXT NOT NULL REFERENCES clients(user_id),
+    mode TEXT NOT NULL,
+    goals_text TEXT NOT NULL,
+    min_emergency_fund_months INTEGER,
+    focus_debt_reduction INTEGER,
+    risk_tolerance TEXT,
+    time_horizon_months INTEGER,
+    priority_order TEXT,
+    must_avoid TEXT,
+    conflicts TEXT,
+    disposable REAL,
+    emergency_gap REAL,
+    net_worth REAL,
+    debt_total REAL,
+    weighted_apr REAL,
+    emergency_progress REAL,
+    recommended_plan TEXT,
+    recommended_score INTEGER,
+    meta TEXT
+);
+CREATE TABLE IF NOT EXISTS result_text (
+    result_id INTEGER PRIMARY KEY REFERENCES results(result_id),
+    markdown TEXT
+);
+CREATE TABLE IF NOT EXISTS result_accounts (
+    result_id INTEGER PRIMARY KEY REFERENCES results(result_id),
+    accounts TEXT
+);
+CREATE TABLE IF NOT EXISTS result_users (
+    result_id INTEGER PRIMARY KEY REFERENCES results(result_id),
+    user TEXT
+);
+CREATE TABLE IF NOT EXISTS plans (
+    plan_id INTEGER PRIMARY KEY,
+    result_id INTEGER NOT NULL REFERENCES results(result_id),
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    score INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS actions (
+    plan_id INTEGER NOT NULL REFERENCES plans(plan_id),
+    position INTEGER NOT NULL,
+    type TEXT NOT NULL,
+    amount NUMERIC NOT NULL,
+    requires_human_approval INTEGER NOT NULL,
+    PRIMARY KEY (plan_id, position)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS fingerprints (
+    user_id TEXT NOT NULL,
+    mode TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    result_id INTEGER NOT NULL,
+    seconds REAL,
+    degraded INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (user_id, mode)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_results_run_user ON results(run_id, user_id);
+CREATE INDEX IF NOT EXISTS idx_results_user ON results(user_id);
+CREATE INDEX IF NOT EXISTS idx_results_run_net_worth ON results(run_id, net_worth);
+CREATE INDEX IF NOT EXISTS idx_results_run_progress
+    ON results(run_id, emergency_progress);
+CREATE INDEX IF NOT EXISTS idx_results_run_apr ON results(run_id, weighted_apr);
+CREATE INDEX IF NOT EXISTS idx_results_recommended
+    ON results(recommended_plan, emergency_gap);
+CREATE INDEX IF NOT EXISTS idx_plans_result ON plans(result_id);
+CREATE INDEX IF NOT EXISTS idx_plans_name_score ON plans(name, score, result_id);
+CREATE INDEX IF NOT EXISTS idx_actions_type_amount ON actions(type, amount);
+CREATE INDEX IF NOT EXISTS idx_clients_region ON clients(region);
+CREATE INDEX IF NOT EXISTS idx_clients_risk ON clients(risk_tolerance);
+"""
+
+# Columns that filters and group-bys may reference: (table alias, SQL).
+COLUMNS = {
+    "run_id": ("r", "r.run_id"),
+    "user_id": ("r", "r.user_id"),
+    "mode": ("r", "r.mode"),
+    "recommended_plan": ("r", "r.recommended_plan"),
+    "recommended_score": ("r", "r.recommended_score"),
+    "emergency_gap": ("r", "r.emergency_gap"),
+    "disposable": ("r", "r.disposable"),
+    "net_worth": ("r", "r.net_worth"),
+    "debt_total": ("r", "r.debt_total"),
+    "weighted_apr": ("r", "r.weighted_apr"),
+    "emergency_progress": ("r", "r.emergency_progress"),
+    "focus_debt_reduction": ("r", "r.focus_debt_reduction"),
+    "constraint_risk_tolerance": ("r", "r.risk_tolerance"),
+    "region": ("c", "c.region"),
+    "age": ("c", "c.age"),
+    "age_band": (
+        "c",
+        "CASE WHEN c.age < 30 THEN '0-29' WHEN c.age < 45 THEN '30-44' "
+        "WHEN c.age < 60 THEN '45-59' ELSE '60+' END",
+    ),
+    "risk_tolerance": ("c", "c.risk_tolerance"),
+    "dependents": ("c", "c.dependents"),
+    "plan_name": ("p", "p.name"),
+    "score": ("p", "p.score"),
+    "action_type": ("a", "{a}.type"),
+    "amount": ("a", "{a}.amount"),
+}
+OPERATORS = {
+    "eq": "=",
+    "ne": "!=",
+    "gt": ">",
+    "gte": ">=",
+    "lt": "<",
+    "lte": "<=",
+    "in": "IN",
+    "startswith": "LIKE",
+}
+AGGREGATES = {"count", "sum", "avg", "min", "max"}
+
+
+def _column(name: str, action_alias: str = "a") -> tuple[str, str]:
+    if name not in COLUMNS:
+        raise ValueError(f"Unsupported column: {name}")
+    alias, sql = COLUMNS[name]
+    return alias, sql.format(a=action_alias)
+
+
+def _build_where(
+    filters: dict[str, Any], action_alias: str = "a"
+) -> tuple[str, list[Any], set[str]]:
+    """Turn ``{"score__gte": 70, "region": "west"}`` into SQL.
+
+    Returns the WHERE clause, its parameters and the table aliases it needs.
+    """
+    clauses, params, aliases = [], [], set()
+    for key, value in filters.items():
+        name, _, op = key.partition("__")
+        op = op or "eq"
+        if op not in OPERATORS:
+            raise ValueError(f"Unsupported filter: {key}")
+        alias, column = _column(name, action_alias)
+        aliases.add(alias)
+        if op == "in":
+            values = list(value)
+            clauses.append(f"{column} IN ({', '.join('?' * len(values))})")
+            params.extend(values)
+        elif op == "startswith":
+            escaped = re.sub(r"([\\%_])", r"\\\1", str(value))
+            clauses.append(f"{column} LIKE ? ESCAPE '\\'")
+            params.append(escaped + "%")
+        else:
+            clauses.append(f"{column} {OPERATORS[op]} ?")
+            params.append(value)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    return where, params, aliases
+
+
+def _joins(aliases: set[str]) -> str:
+    joins = []
+    if "c" in aliases:
+        joins.append("JOIN clients c ON c.user_id = r.user_id")
+    if "p" in aliases or "a" in aliases:
+        joins.append("JOIN plans p ON p.result_id = r.result_id")
+    if "a" in aliases:
+        joins.append("JOIN actions a ON a.plan_id = p.plan_id")
+    return " ".join(joins)
+
+
+class ResultsStore:
+    """SQLite store of orchestrator results, one row per client per run."""
+
+    def __init__(self, path: str | Path = DEFAULT_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA foreign_keys=OFF")
+        self.conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> "ResultsStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def create_run(self, mode: str, label: str | None = None) -> int:
+        with self.conn:
+            cursor = self.conn.execute(
+                "INSERT INTO runs (created_at, mode, label) VALUES (?, ?, ?)",
+                (time.time(), mode, label),
+            )
+        return int(cursor.lastrowid)
+
+    def list_runs(self) -> list[dict[str, Any]]:
+        sql = "SELECT run_id, created_at, mode, label FROM runs ORDER BY run_id DESC"
+        return [dict(row) for row in self.conn.execute(sql)]
+
+    def latest_run_id(self) -> int | None:
+        row = self.conn.execute("SELECT MAX(run_id) FROM runs").fetchone()
+        return row[0]
+
+    def save_results(
+        self,
+        run_id: int,
+        items: Iterable[tuple[dict, dict, str, DemoResult]],
+    ) -> int:
+        """Insert ``(user, accounts, goals_text, result)`` tuples in one transaction."""
+        clients, results, texts, plans, actions = [], [], [], [], []
+        users, snapshots = [], []
+        with self.conn:
+            self.conn.execute("BEGIN IMMEDIATE")
+            result_id = self._next_id("results", "result_id")
+            plan_id = self._next_id("plans", "plan_id")
+            for user, accounts, goals_text, result in items:
+                clients.append(
+                    (
+                        user["id"],
+                        user.get("age"),
+                        user.get("region"),
+                        user.get("risk_tolerance"),
+                        user.get("dependents"),
+                        user.get("income_monthly"),
+                        user.get("expenses_monthly"),
+                    )
+                )
+                results.append(
+                    self._result_row(
+                        result_id, run_id, user, accounts, goals_text, result
+                    )
+                )
+                texts.append((result_id, result.markdown))
+                users.append((result_id, json.dumps(user)))
+                snapshots.append((result_id, json.dumps(accounts)))
+                for position, plan in enumerate(result.plans):
+                    plans.append((plan_id, result_id, position, plan.name, plan.score))
+                    actions.extend(
+                        (
+                            plan_id,
+                            i,
+                            action.type,
+                            action.amount,
+                            int(action.requires_human_approval),
+                        )
+                        for i, action in enumerate(plan.actions)
+                    )
+                    plan_id += 1
+                result_id += 1
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO clients VALUES (?, ?, ?, ?, ?, ?, ?)", clients
+            )
+            self.conn.executemany(
+                f"INSERT INTO results VALUES ({', '.join('?' * 21)})", results
+            )
+            self.conn.executemany("INSERT INTO result_text VALUES (?, ?)", texts)
+            self.conn.executemany("INSERT INTO result_users VALUES (?, ?)", users)
+            self.conn.executemany(
+                "INSERT INTO result_accounts VALUES (?, ?)", snapshots
+            )
+            self.conn.executemany("INSERT INTO plans VALUES (?, ?, ?, ?, ?)", plans)
+            self.conn.executemany("INSERT INTO actions VALUES (?, ?, ?, ?, ?)", actions)
+        return len(results)
+
+    def carry_forward(self, run_id: int, result_ids: Iterable[int]) -> int:
+        """Copy earlier results, with their plans and text, into ``run_id``."""
+        columns = [
+            row["name"] for row in self.conn.execute("PRAGMA table_info(results)")
+        ]
+        copied = ", ".join(f"r.{c}" for c in columns[2:])
+        with self.conn:
+            self.conn.execute("BEGIN IMMEDIATE")
+            self.conn.execute(
+                "CREATE TEMP TABLE carry (old INTEGER PRIMARY KEY, new INTEGER)"
+            )
+            self.conn.execute(
+                "CREATE TEMP TABLE carry_plans (old INTEGER PRIMARY KEY, new INTEGER)"
+            )
+            try:
+                result_id = self._next_id("results", "result_id")
+                self.conn.executemany(
+                    "INSERT INTO carry VALUES (?, ?)",
+                    ((old, result_id + i) for i, old in enumerate(result_ids)),
+                )
+                self.conn.execute(
+                    "INSERT INTO carry_plans SELECT p.plan_id, ? + ROW_NUMBER() "
+                    "OVER (ORDER BY p.plan_id) - 1 "
+                    "FROM plans p JOIN carry c ON c.old = p.result_id",
+                    (self._next_id("plans", "plan_id"),),
+                )
+                count = self.conn.execute(
+                    f"INSERT INTO results SELECT c.new, ?, {copied} "
+                    "FROM results r JOIN carry c ON c.old = r.result_id",
+                    (run_id,),
+                ).rowcount
+                for table, column in (
+                    ("result_text", "markdown"),
+                    ("result_accounts", "accounts"),
+                    ("result_users", "user"),
+                ):
+                    self.conn.execute(
+                        f"INSERT INTO {table} SELECT c.new, t.{column} "
+                        f"FROM {table} t JOIN carry c ON c.old = t.result_id"
+                    )
+                self.conn.execute(
+                    "INSERT INTO plans SELECT cp.new, c.new, p.position, p.name, "
+                    "p.score FROM plans p JOIN carry c ON c.old = p.result_id "
+                    "JOIN carry_plans cp ON cp.old = p.plan_id"
+                )
+                self.conn.execute(
+                    "INSERT INTO actions SELECT cp.new, a.position, a.type, "
+                    "a.amount, a.requires_human_approval "
+                    "FROM actions a JOIN carry_plans cp ON cp.old = a.plan_id"
+                )
+            finally:
+                self.conn.execute("DROP TABLE temp.carry")
+                self.conn.execute("DROP TABLE temp.carry_plans")
+        return count
+
+    def run_result_ids(self, run_id: int) -> dict[str, int]:
+        sql = "SELECT user_id, result_id FROM results WHERE run_id = ?"
+        return {row[0]: row[1] for row in self.conn.execute(sql, (run_id,))}
+
+    def fingerprints(self, mode: str) -> dict[str, dict[str, Any]]:
+        """Fingerprint index for ``mode``, keyed by user id."""
+        sql = (
+            "SELECT user_id, fingerprint, result_id, seconds, degraded "
+            "FROM fingerprints WHERE mode = ?"
+        )
+        return {row["user_id"]: dict(row) for row in self.conn.execute(sql, (mode,))}
+
+    def update_fingerprints(
+        self, rows: Iterable[tuple[str, str, str, int, float, int]]
+    ) -> None:
+        """Upsert ``(user_id, mode, fingerprint, result_id, seconds, degraded)``."""
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO fingerprints VALUES (?, ?, ?, ?, ?, ?)", rows
+            )
+
+    def optimize(self) -> None:
+        """Refresh planner statistics; call once after a bulk load."""
+        self.conn.execute("ANALYZE")
+
+    def _next_id(self, table: str, column: str) -> int:
+        row = self.conn.execute(f"SELECT MAX({column}) FROM {table}").fetchone()
+        return (row[0] or 0) + 1
+
+    def _result_row(
+        self,
+        result_id: int,
+        run_id: int,
+        user: dict,
+        accounts: dict,
+        goals_text: str,
+        result: DemoResult,
+    ) -> tuple:
+        c = result.constraints
+        disposable = max(0, user["income_monthly"] - user["expenses_monthly"])
+        target = user["expenses_monthly"] * c.min_emergency_fund_months
+        gap = max(0, target - accounts.get("cash", 0))
+        recommendation = pick_recommendation(build_plan_rows(result, disposable))
+        return (
+            result_id,
+            run_id,
+            user["id"],
+            result.meta.get("mode", ""),
+            goals_text,
+            c.min_emergency_fund_months,
+            int(c.focus_debt_reduction),
+            c.risk_tolerance,
+            c.time_horizon_months,
+            json.dumps(c.priority_order),
+            json.dumps(c.must_avoid),
+            json.dumps(c.conflicts),
+            disposable,
+            gap,
+            net_worth(accounts),
+            sum_debt(accounts),
+            weighted_apr(accounts),
+            emergency_progress(user, accounts, c.min_emergency_fund_months),
+            recommendation.get("Plan"),
+            recommendation.get("Score"),
+            json.dumps(result.meta, default=str),
+        )
+
+    def query_results(
+        self,
+        filters: dict[str, Any] | None = None,
+        order_by: str = "result_id",
+        descending: bool = False,
+        limit: int | None = 100,
+        offset: int = 0,
+    ) -> list[dict[str, Any]]:
+        """Result-level rows matching ``filters``.
+
+        Filter keys are ``COLUMNS`` names with an optional ``__op`` suffix
+        from ``OPERATORS``; plan or action filters match results that have
+        at least one such plan or action.
+        """
+        where, params, aliases = _build_where(filters or {})
+        if order_by == "result_id":
+            order_column = "r.result_id"
+        else:
+            alias, order_column = _column(order_by)
+            aliases.add(alias)
+        aliases.add("c")
+        distinct = "DISTINCT " if aliases & {"p", "a"} else ""
+        sql = (
+            f"SELECT {distinct}r.result_id, r.run_id, r.user_id, r.mode, "
+            "r.goals_text, r.recommended_plan, r.recommended_score, "
+            "r.disposable, r.emergency_gap, r.net_worth, r.debt_total, "
+            "r.weighted_apr, r.emergency_progress, c.region, c.age, "
+            "c.risk_tolerance, c.dependents "
+            f"FROM results r {_joins(aliases)} {where} "
+            f"ORDER BY {order_column} {'DESC' if descending else 'ASC'}, r.result_id"
+        )
+        if limit is not None:
+            sql += " LIMIT ? OFFSET ?"
+            params = [*params, limit, offset]
+        return [dict(row) for row in self.conn.execute(sql, params)]
+
+    def count_results(self, filters: dict[str, Any] | None = None) -> int:
+        where, params, aliases = _build_where(filters or {})
+        target = "DISTINCT r.result_id" if aliases & {"p", "a"} else "*"
+        sql = f"SELECT COUNT({target}) FROM results r {_joins(aliases)} {where}"
+        return int(self.conn.execute(sql, params).fetchone()[0])
+
+    def query_plans(
+        self,
+        filters: dict[str, Any] | None = None,
+        limit: int | None = 100,
+        offset: int = 0,
+    ) -> list[dict[str, Any]]:
+        """Plan-level rows with their action amounts pivoted into columns."""
+        where, params, aliases = _build_where(filters or {}, action_alias="fa")
+        action_filter = "a" in aliases
+        aliases = (aliases - {"a"}) | {"c", "p"}
+        joins = _joins(aliases)
+        if action_filter:
+            # Action filters select plans; amounts come from a separate join.
+            joins += " JOIN actions fa ON fa.plan_id = p.plan_id"
+        sql = (
+            "SELECT p.plan_id, r.result_id, r.run_id, r.user_id, p.name, p.score, "
+            "c.region, c.risk_tolerance, "
+            "SUM(CASE WHEN x.type = 'Emergency fund' THEN x.amount ELSE 0 END) "
+            "AS emergency, "
+            "SUM(CASE WHEN x.type = 'Debt payment' THEN x.amount ELSE 0 END) AS debt, "
+            "SUM(CASE WHEN x.type = 'Invest' THEN x.amount ELSE 0 END) AS invest "
+            f"FROM results r {joins} "
+            "LEFT JOIN actions x ON x.plan_id = p.plan_id "
+            f"{where} GROUP BY p.plan_id ORDER BY p.plan_id"
+        )
+        if limit is not None:
+            sql += " LIMIT ? OFFSET ?"
+            params = [*params, limit, offset]
+        return [dict(row) for row in self.conn.execute(sql, params)]
+
+    def aggregate(
+        self,
+        by: list[str] | tuple[str, ...],
+        metrics: dict[str, str] | None = None,
+        filters: dict[str, Any] | None = None,
+    ) -> list[dict[str, Any]]:
+        """Group-by aggregation, e.g. ``aggregate(["region"], {"score": "avg"})``.
+
+        ``metrics`` maps a column to one of ``AGGREGATES``; a row count is
+        always included as ``count``.
+        """
+        metrics = metrics or {}
+        where, params, aliases = _build_where(filters or {})
+        selects = []
+        for name in by:
+            alias, column = _column(name)
+            selects.append(f"{column} AS {name}")
+            aliases.add(alias)
+        for name, func in metrics.items():
+            if func not in AGGREGATES:
+                raise ValueError(f"Unsupported metric: {name}={func}")
+            alias, column = _column(name)
+            selects.append(f"{func.upper()}({column}) AS {func}_{name}")
+            aliases.add(alias)
+        selects.append("COUNT(*) AS count")
+        # Group by position: output names such as risk_tolerance would be
+        # ambiguous between results and clients.
+        group = ", ".join(str(i) for i in range(1, len(by) + 1))
+        if aliases and aliases <= {"p", "a"}:
+            # Plan and action aggregates do not need the results table.
+            source = "plans p" + (
+                " JOIN actions a ON a.plan_id = p.plan_id" if "a" in aliases else ""
+            )
+        else:
+            source = f"results r {_joins(aliases)}"
+        sql = f"SELECT {', '.join(selects)} FROM {source} {where}" + (
+            f" GROUP BY {group} ORDER BY {group}" if by else ""
+        )
+        return [dict(row) for row in self.conn.execute(sql, params)]
+
+    def load_result(self, result_id: int) -> DemoResult:
+        results = self.load_results([result_id])
+        if not results:
+            raise KeyError(f"Unknown result_id: {result_id}")
+        return results[result_id]
+
+    def load_results(self, result_ids: Iterable[int]) -> dict[int, DemoResult]:
+        """Load many results with one query per table; unknown ids are skipped."""
+        ids = list(result_ids)
+        if not ids:
+            return {}
+        marks = ", ".join("?" * len(ids))
+        rows = self.conn.execute(
+            "SELECT r.*, t.markdown FROM results r "
+            "LEFT JOIN result_text t ON t.result_id = r.result_id "
+            f"WHERE r.result_id IN ({marks})",
+            ids,
+        ).fetchall()
+        plan_rows = self.conn.execute(
+            "SELECT plan_id, result_id, name, score FROM plans "
+            f"WHERE result_id IN ({marks}) ORDER BY result_id, position",
+            ids,
+        ).fetchall()
+        actions: dict[int, list[PlanAction]] = {}
+        for a in self.conn.execute(
+            "SELECT a.plan_id, a.type, a.amount, a.requires_human_approval "
+            "FROM plans p JOIN actions a ON a.plan_id = p.plan_id "
+            f"WHERE p.result_id IN ({marks}) ORDER BY a.plan_id, a.position",
+            ids,
+        ):
+            actions.setdefault(a["plan_id"], []).append(
+                PlanAction(a["type"], a["amount"], bool(a["requires_human_approval"]))
+            )
+        plans: dict[int, list[Plan]] = {}
+        for plan in plan_rows:
+            plans.setdefault(plan["result_id"], []).append(
+                Plan(
+                    name=plan["name"],
+                    score=plan["score"],
+                    actions=actions.get(plan["plan_id"], []),
+                )
+            )
+
+        results = {}
+        for row in rows:
+            constraints = Constraints(
+                min_emergency_fund_months=row["min_emergency_fund_months"],
+                focus_debt_reduction=bool(row["focus_debt_reduction"]),
+                risk_tolerance=row["risk_tolerance"],
+                priority_order=json.loads(row["priority_order"]),
+                time_horizon_months=row["time_horizon_months"],
+                must_avoid=json.loads(row["must_avoid"]),
+                conflicts=json.loads(row["conflicts"]),
+            )
+            results[row["result_id"]] = DemoResult(
+                constraints=constraints,
+                plans=plans.get(row["result_id"], []),
+                markdown=row["markdown"] or "",
+                meta=json.loads(row["meta"] or "{}"),
+            )
+        return results
+
+    def load_client_result(self, result_id: int) -> tuple[dict, dict, str, DemoResult]:
+        """``(user, accounts, goals_text, result)`` as they were when stored."""
+        loaded = self.load_client_results([result_id])
+        if not loaded:
+            raise KeyError(f"Unknown result_id: {result_id}")
+        return loaded[result_id]
+
+    def load_client_results(
+        self, result_ids: Iterable[int]
+    ) -> dict[int, tuple[dict, dict, str, DemoResult]]:
+        """Many ``load_client_result`` tuples at once; unknown ids are skipped.
+
+        The user and accounts come from the snapshots saved with each result,
+        not the ``clients`` table, which only holds the latest profile. Rows
+        stored before user snapshots existed fall back to that table.
+        """
+        ids = list(result_ids)
+        if not ids:
+            return {}
+        rows = self.conn.execute(
+            "SELECT r.result_id, r.user_id, r.goals_text, u.user, s.accounts, "
+            "c.age, c.region, c.risk_tolerance, c.dependents, c.income_monthly, "
+            "c.expenses_monthly FROM results r "
+            "LEFT JOIN result_users u ON u.result_id = r.result_id "
+            "LEFT JOIN result_accounts s ON s.result_id = r.result_id "
+            "LEFT JOIN clients c ON c.user_id = r.user_id "
+            f"WHERE r.result_id IN ({', '.join('?' * len(ids))})",
+            ids,
+        ).fetchall()
+        results = self.load_results(ids)
+        loaded = {}
+        for row in rows:
+            user = json.loads(row["user"] or "null") or {
+                "id": row["user_id"],
+                "age": row["age"],
+                "risk_tolerance": row["risk_tolerance"],
+                "income_monthly": row["income_monthly"],
+                "expenses_monthly": row["expenses_monthly"],
+                "dependents": row["dependents"],
+                "region": row["region"],
+            }
+            accounts = json.loads(row["accounts"] or "null") or {
+                "cash": 0,
+                "debts": [],
+                "investments": [],
+            }
+            loaded[row["result_id"]] = (
+                user,
+                accounts,
+                row["goals_text"],
+                results[row["result_id"]],
+            )
+        return loaded
@@ -0,0 +1,30 @@
+def sum_debt(accounts: dict) -> float:
+    return sum(item.get("balance", 0) for item in accounts.get("debts", []))
+
+
+def sum_investments(accounts: dict) -> float:
+    return sum(item.get("balance", 0) for item in accounts.get("investments", []))
+
+
+def min_payments(accounts: dict) -> float:
+    return sum(item.get("min_payment", 0) for item in accounts.get("debts", []))
+
+
+def weighted_apr(accounts: dict) -> float:
+    debts = [item for item in accounts.get("debts", []) if item.get("balance", 0) > 0]
+    total = sum(item.get("balance", 0) for item in debts)
+    if total <= 0:
+        return 0.0
+    weighted = sum(item.get("balance", 0) * item.get("apr", 0) for item in debts)
+    return weighted / total
+
+
+def net_worth(accounts: dict) -> float:
+    return accounts.get("cash", 0) + sum_investments(accounts) - sum_debt(accounts)
+
+
+def emergency_progress(user: dict, accounts: dict, months: int = 3) -> float:
+    target = user.get("expenses_monthly", 0) * months
+    if target <= 0:
+        return 100.0
+    return accounts.get("cash", 0) / target * 100
@@ -0,0 +1,175 @@
+from dataclasses import dataclass
+from decimal import (
+    ROUND_CEILING,
+    ROUND_DOWN,
+    ROUND_FLOOR,
+    ROUND_HALF_DOWN,
+    ROUND_HALF_EVEN,
+    ROUND_HALF_UP,
+    ROUND_UP,
+    Decimal,
+)
+from typing import Any
+
+import numpy as np
+
+# Rounding modes are the ``decimal`` module's names; ROUND_HALF_UP and
+# ROUND_UP round away from zero, ROUND_DOWN truncates toward zero.
+ROUNDING_MODES = (
+    ROUND_CEILING,
+    ROUND_DOWN,
+    ROUND_FLOOR,
+    ROUND_HALF_DOWN,
+    ROUND_HALF_EVEN,
+    ROUND_HALF_UP,
+    ROUND_UP,
+)
+CENTS = 100
+DOLLAR = 100  # allocation unit for whole-dollar splits
+# Binary floats land just off the half-cent (0.285 * 100 == 28.4999...);
+# snapping to this many decimals first makes array rounding agree with
+# rounding the decimal literal.
+_SNAP_DECIMALS = 6
+
+
+def round_array(values: Any, rounding: str = ROUND_HALF_UP) -> np.ndarray:
+    """Round a float array to integers as int64 using ``rounding``."""
+    values = np.round(np.asarray(values, dtype=np.float64), _SNAP_DECIMALS)
+    if rounding == ROUND_HALF_UP:
+        rounded = np.copysign(np.floor(np.abs(values) + 0.5), values)
+    elif rounding == ROUND_HALF_EVEN:
+        rounded = np.rint(values)
+    elif rounding == ROUND_HALF_DOWN:
+        rounded = np.copysign(np.ceil(np.abs(values) - 0.5), values)
+    elif rounding == ROUND_DOWN:
+        rounded = np.trunc(values)
+    elif rounding == ROUND_UP:
+        rounded = np.copysign(np.ceil(np.abs(values)), values)
+    elif rounding == ROUND_FLOOR:
+        rounded = np.floor(values)
+    elif rounding == ROUND_CEILING:
+        rounded = np.ceil(values)
+    else:
+        raise ValueError(f"Unsupported rounding mode: {rounding}")
+    return rounded.astype(np.int64)
+
+
+def to_cents(amounts: Any, rounding: str = ROUND_HALF_UP) -> np.ndarray:
+    """Dollar amounts (floats) as int64 cents."""
+    return round_array(np.asarray(amounts, dtype=np.float64) * CENTS, rounding)
+
+
+def to_dollars(cents: Any) -> np.ndarray:
+    """int64 cents as float dollars, for display and charting."""
+    return np.asarray(cents, dtype=np.int64) / CENTS
+
+
+def scale_cents(cents: Any, factor: Any, rounding: str = ROUND_HALF_UP) -> np.ndarray:
+    """``cents * factor`` rounded back to int64 cents; broadcasts."""
+    return round_array(np.asarray(cents, dtype=np.int64) * np.asarray(factor), rounding)
+
+
+def quantize_cents(
+    cents: Any, unit: int = DOLLAR, rounding: str = ROUND_HALF_UP
+) -> np.ndarray:
+    """Round int64 cents to a multiple of ``unit`` cents (whole dollars)."""
+    cents = np.asarray(cents, dtype=np.int64)
+    return round_array(cents / unit, rounding) * unit
+
+
+def allocate_cents(total: Any, weights: Any, unit: int = 1) -> np.ndarray:
+    """Split ``total`` cents over the last axis of ``weights``.
+
+    Largest-remainder method: each share is floored to a multiple of
+    ``unit``, then the leftover units go to the largest fractional parts
+    (ties to the earlier position), so shares always sum to ``total``
+    rounded down to ``unit``. ``total`` broadcasts against
+    ``weights.shape[:-1]``; rows whose weights sum to zero get nothing.
+    """
+    weights = np.asarray(weights, dtype=np.float64)
+    total = np.asarray(total, dtype=np.int64)
+    sign = np.where(total < 0, -1, 1)
+    units = np.abs(total) // unit
+    weight_sum = weights.sum(axis=-1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        quota = np.where(
+            weight_sum[..., None] > 0,
+            units[..., None] * (weights / weight_sum[..., None]),
+            0.0,
+        )
+    shares = np.floor(quota).astype(np.int64)
+    # Float quotas can over-floor by one; a negative leftover takes units
+    # back from the smallest remainders.
+    leftover = np.where(weight_sum > 0, units - shares.sum(axis=-1), 0)
+    order = np.argsort(-(quota - shares), axis=-1, kind="stable")
+    rank = np.empty_like(order)
+    np.put_along_axis(
+        rank, order, np.broadcast_to(np.arange(order.shape[-1]), order.shape), -1
+    )
+    width = order.shape[-1]
+    shares += rank < leftover[..., None]
+    shares -= rank >= width + np.minimum(leftover, 0)[..., None]
+    return shares * unit * sign[..., None]
+
+
+@dataclass(frozen=True, order=True)
+class Money:
+    """An exact amount of money stored as integer cents."""
+
+    cents: int = 0
+
+    @classmethod
+    def of(cls, amount: Any, rounding: str = ROUND_HALF_UP) -> "Money":
+        """From dollars; floats are read by their shortest repr, so 0.285
+        rounds like the literal rather than its binary neighbour."""
+        if isinstance(amount, Money):
+            return amount
+        if isinstance(amount, (float, np.floating)):
+            amount = repr(float(amount))
+        elif isinstance(amount, np.integer):
+            amount = int(amount)
+        cents = (Decimal(amount) * CENTS).quantize(Decimal(1), rounding=rounding)
+        return cls(int(cents))
+
+    def __add__(self, other: "Money") -> "Money":
+        if not isinstance(other, Money):
+            return NotImplemented
+        return Money(self.cents + other.cents)
+
+    def __sub__(self, other: "Money") -> "Money":
+        if not isinstance(other, Money):
+            return NotImplemented
+        return Money(self.cents - other.cents)
+
+    def __neg__(self) -> "Money":
+        return Money(-self.cents)
+
+    def __bool__(self) -> bool:
+        return self.cents != 0
+
+    def __float__(self) -> float:
+        return self.cents / CENTS
+
+    def scale(self, factor: Any, rounding: str = ROUND_HALF_UP) -> "Money":
+        cents = (Decimal(self.cents) * Decimal(str(factor))).quantize(
+            Decimal(1), rounding=rounding
+        )
+        return Money(int(cents))
+
+    def dollars(self, rounding: str = ROUND_DOWN) -> int:
+        """Whole dollars, as plan actions carry them."""
+        return int(
+            (Decimal(self.cents) / CENTS).quantize(Decimal(1), rounding=rounding)
+        )
+
+    def allocate(self, weights: list[float], unit: int = 1) -> list["Money"]:
+        """Split into shares proportional to ``weights`` that sum exactly."""
+        if not weights:
+            return []
+        shares = allocate_cents(self.cents, weights, unit)
+        return [Money(int(c)) for c in shares.tolist()]
+
+    def __str__(self) -> str:
+        sign = "-" if self.cents < 0 else ""
+        whole, part = divmod(abs(self.cents), CENTS)
+        return f"{sign}${whole:,}.{part:02d}"
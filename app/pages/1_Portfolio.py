@@ -0,0 +1,186 @@
+from datetime import datetime
+from pathlib import Path
+import sys
+from typing import Any
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import streamlit as st
+from app.config import get_config
+from app.data.results_store import ResultsStore
+
+PAGE_SIZES = (25, 50, 100)
+SORT_COLUMNS = {
+    "Net worth": "net_worth",
+    "Emergency progress": "emergency_progress",
+    "Weighted APR": "weighted_apr",
+    "Recommended plan": "recommended_plan",
+    "Score": "recommended_score",
+    "Client": "user_id",
+}
+
+
+@st.cache_resource
+def get_store(path: str) -> ResultsStore:
+    return ResultsStore(path)
+
+
+@st.cache_data(ttl=60)
+def list_runs(path: str) -> list[dict[str, Any]]:
+    return get_store(path).list_runs()
+
+
+@st.cache_data(ttl=600)
+def filter_options(path: str, run_id: int) -> dict[str, list[str]]:
+    store = get_store(path)
+    options = {}
+    for column in ("region", "risk_tolerance", "recommended_plan"):
+        rows = store.aggregate([column], filters={"run_id": run_id})
+        options[column] = [row[column] for row in rows if row[column] is not None]
+    return options
+
+
+@st.cache_data(ttl=600, max_entries=256)
+def count_clients(path: str, filters: dict[str, Any]) -> int:
+    return get_store(path).count_results(filters)
+
+
+@st.cache_data(ttl=600, max_entries=512)
+def fetch_page(
+    path: str,
+    filters: dict[str, Any],
+    order_by: str,
+    descending: bool,
+    page: int,
+    page_size: int,
+) -> list[dict[str, Any]]:
+    """Rows of one page; only these are read from the store."""
+    return get_store(path).query_results(
+        filters,
+        order_by=order_by,
+        descending=descending,
+        limit=page_size,
+        offset=page * page_size,
+    )
+
+
+def table_rows(rows: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    return [
+        {
+            "Client": row["user_id"],
+            "Region": row["region"],
+            "Age": row["age"],
+            "Risk": row["risk_tolerance"],
+            "Net worth": row["net_worth"],
+            "Emergency progress %": row["emergency_progress"],
+            "Weighted APR %": (row["weighted_apr"] or 0) * 100,
+            "Recommended plan": row["recommended_plan"],
+            "Score": row["recommended_score"],
+        }
+        for row in rows
+    ]
+
+
+st.set_page_config(page_title="Portfolio | Smart Money Planner", layout="wide")
+st.title("Advisor portfolio")
+
+config = get_config()
+store_path = config["results_store_path"]
+if not Path(store_path).exists():
+    st.info(
+        f"No results store at `{store_path}`. Run `python -m app.agent.batch` "
+        "to precompute results for the client book."
+    )
+    st.stop()
+
+runs = list_runs(store_path)
+if not runs:
+    st.info("The results store has no runs yet.")
+    st.stop()
+
+with st.sidebar:
+    run = st.selectbox(
+        "Run",
+        runs,
+        format_func=lambda r: (
+            f"#{r['run_id']} {r['mode']} "
+            f"{datetime.fromtimestamp(r['created_at']):%Y-%m-%d %H:%M}"
+            + (f" ({r['label']})" if r["label"] else "")
+        ),
+    )
+    options = filter_options(store_path, run["run_id"])
+    search = st.text_input("Client id starts with")
+    regions = st.multiselect("Region", options["region"])
+    risks = st.multiselect("Risk tolerance", options["risk_tolerance"])
+    plans = st.multiselect("Recommended plan", options["recommended_plan"])
+    max_progress = st.slider("Emergency progress at most (%)", 0, 100, 100)
+    sort_label = st.selectbox("Sort by", list(SORT_COLUMNS))
+    descending = st.toggle("Descending", value=True)
+    page_size = st.selectbox("Rows per page", PAGE_SIZES, index=1)
+
+filters: dict[str, Any] = {"run_id": run["run_id"]}
+if search.strip():
+    filters["user_id__startswith"] = search.strip()
+if regions:
+    filters["region__in"] = regions
+if risks:
+    filters["risk_tolerance__in"] = risks
+if plans:
+    filters["recommended_plan__in"] = plans
+if max_progress < 100:
+    filters["emergency_progress__lte"] = max_progress
+
+# Any change to the query goes back to the first page.
+query_key = (repr(filters), sort_label, descending, page_size)
+if st.session_state.get("portfolio_query") != query_key:
+    st.session_state["portfolio_query"] = query_key
+    st.session_state["portfolio_page"] = 1
+
+total = count_clients(store_path, filters)
+pages = max(1, -(-total // page_size))
+p1, p2 = st.columns([1, 3])
+with p1:
+    page = st.number_input(
+        "Page", min_value=1, max_value=pages, step=1, key="portfolio_page"
+    )
+with p2:
+    st.caption(f"{total:,} clients match | page {page} of {pages:,}")
+
+rows = fetch_page(
+    store_path,
+    filters,
+    SORT_COLUMNS[sort_label],
+    descending,
+    int(page) - 1,
+    page_size,
+)
+selection = st.dataframe(
+    table_rows(rows),
+    use_container_width=True,
+    hide_index=True,
+    on_select="rerun",
+    selection_mode="single-row",
+    column_config={
+        "Net worth": st.column_config.NumberColumn(format="$%.0f"),
+        "Emergency progress %": st.column_config.ProgressColumn(
+            min_value=0, max_value=100, format="%.0f%%"
+        ),
+        "Weighted APR %": st.column_config.NumberColumn(format="%.2f%%"),
+    },
+)
+
+selected = selection.selection.rows if selection else []
+if selected:
+    row = rows[selected[0]]
+    st.caption(
+        f"Selected {row['user_id']}: {row['goals_text']} "
+        f"({row['recommended_plan']}, score {row['recommended_score']})"
+    )
+    if st.button("Open client dashboard", type="primary"):
+        st.switch_page(
+            "streamlit_app.py", query_params={"result": str(row["result_id"])}
+        )
+else:
+    st.caption("Select a row to open the client dashboard.")
@@ -0,0 +1,123 @@
+import html
+from typing import Any
+
+PALETTE = ("#2f6db5", "#d9822b", "#3a9d5d", "#c23b3b", "#7a5cb8")
+PAD_LEFT, PAD_RIGHT, PAD_TOP, PAD_BOTTOM = 60, 12, 30, 44
+TICKS = 4
+
+
+def _money(value: float) -> str:
+    if abs(value) >= 1000:
+        return f"${value / 1000:,.0f}k"
+    return f"${value:,.0f}"
+
+
+def _frame(width: int, height: int, title: str) -> list[str]:
+    return [
+        f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {width} {height}" '
+        f'width="{width}" height="{height}" role="img" '
+        f'aria-label="{html.escape(title)}">',
+        f'<text x="{PAD_LEFT}" y="18" class="chart-title">{html.escape(title)}</text>',
+    ]
+
+
+def _axis(parts: list[str], lo: float, hi: float, width: int, height: int) -> None:
+    plot_h = height - PAD_TOP - PAD_BOTTOM
+    for i in range(TICKS + 1):
+        value = lo + (hi - lo) * i / TICKS
+        y = PAD_TOP + plot_h - plot_h * i / TICKS
+        parts.append(
+            f'<line x1="{PAD_LEFT}" x2="{width - PAD_RIGHT}" y1="{y:.1f}" '
+            f'y2="{y:.1f}" class="grid"/>'
+        )
+        parts.append(
+            f'<text x="{PAD_LEFT - 6}" y="{y + 4:.1f}" class="tick" '
+            f'text-anchor="end">{_money(value)}</text>'
+        )
+
+
+def _legend(parts: list[str], names: list[str], height: int) -> None:
+    x = PAD_LEFT
+    for i, name in enumerate(names):
+        color = PALETTE[i % len(PALETTE)]
+        parts.append(
+            f'<rect x="{x}" y="{height - 14}" width="10" height="10" fill="{color}"/>'
+        )
+        parts.append(
+            f'<text x="{x + 14}" y="{height - 5}" class="tick">{html.escape(name)}</text>'
+        )
+        x += 24 + 7 * len(name)
+
+
+def _bounds(values: list[float]) -> tuple[float, float]:
+    lo, hi = min(0.0, *values), max(0.0, *values)
+    return (lo, hi) if hi > lo else (lo, lo + 1.0)
+
+
+def line_chart_svg(
+    series: dict[str, list[float]],
+    title: str,
+    width: int = 480,
+    height: int = 240,
+) -> str:
+    """Static multi-series line chart; x is the step index (month)."""
+    values = [float(v) for points in series.values() for v in points]
+    parts = _frame(width, height, title)
+    if not values:
+        return "".join(parts + ["</svg>"])
+    lo, hi = _bounds(values)
+    _axis(parts, lo, hi, width, height)
+    plot_w = width - PAD_LEFT - PAD_RIGHT
+    plot_h = height - PAD_TOP - PAD_BOTTOM
+    steps = max(len(points) for points in series.values())
+    for i, points in enumerate(series.values()):
+        coords = " ".join(
+            f"{PAD_LEFT + plot_w * j / max(steps - 1, 1):.1f},"
+            f"{PAD_TOP + plot_h * (hi - float(v)) / (hi - lo):.1f}"
+            for j, v in enumerate(points)
+        )
+        parts.append(
+            f'<polyline points="{coords}" fill="none" stroke-width="2" '
+            f'stroke="{PALETTE[i % len(PALETTE)]}"/>'
+        )
+    _legend(parts, list(series), height)
+    parts.append("</svg>")
+    return "".join(parts)
+
+
+def bar_chart_svg(
+    rows: list[dict[str, Any]],
+    category: str,
+    fields: list[str],
+    title: str,
+    width: int = 480,
+    height: int = 240,
+) -> str:
+    """Static grouped bar chart with one group per row."""
+    values = [float(row.get(f, 0)) for row in rows for f in fields]
+    parts = _frame(width, height, title)
+    if not values:
+        return "".join(parts + ["</svg>"])
+    lo, hi = _bounds(values)
+    _axis(parts, lo, hi, width, height)
+    plot_w = width - PAD_LEFT - PAD_RIGHT
+    plot_h = height - PAD_TOP - PAD_BOTTOM
+    group_w = plot_w / len(rows)
+    bar_w = group_w * 0.8 / len(fields)
+    zero = PAD_TOP + plot_h * hi / (hi - lo)
+    for g, row in enumerate(rows):
+        x0 = PAD_LEFT + group_w * g + group_w * 0.1
+        for i, name in enumerate(fields):
+            y = PAD_TOP + plot_h * (hi - float(row.get(name, 0))) / (hi - lo)
+            parts.append(
+                f'<rect x="{x0 + bar_w * i:.1f}" y="{min(y, zero):.1f}" '
+                f'width="{bar_w:.1f}" height="{abs(zero - y):.1f}" '
+                f'fill="{PALETTE[i % len(PALETTE)]}"/>'
+            )
+        parts.append(
+            f'<text x="{x0 + group_w * 0.4:.1f}" y="{height - PAD_BOTTOM + 14}" '
+            f'class="tick" text-anchor="middle">{html.escape(str(row[category]))}</text>'
+        )
+    _legend(parts, fields, height)
+    parts.append("</svg>")
+    return "".join(parts)
@@ -0,0 +1,77 @@
+from typing import Any
+
+import numpy as np
+
+from app.kpi import sum_debt, sum_investments
+from app.money import to_cents, to_dollars
+
+
+def get_action_amount(plan: Any, action_type: str) -> int:
+    action = next((item for item in plan.actions if item.type == action_type), None)
+    return int(action.amount) if action else 0
+
+
+def build_plan_rows(result: Any, monthly_disposable: float) -> list[dict[str, Any]]:
+    rows = []
+    for plan in result.plans:
+        emergency = get_action_amount(plan, "Emergency fund")
+        debt = get_action_amount(plan, "Debt payment")
+        invest = get_action_amount(plan, "Invest")
+        total_alloc = emergency + debt + invest
+        approvals = sum(1 for item in plan.actions if item.requires_human_approval)
+        utilization = (
+            (total_alloc / monthly_disposable * 100) if monthly_disposable > 0 else 0
+        )
+        rows.append(
+            {
+                "Plan": plan.name,
+                "Score": plan.score,
+                "Emergency": emergency,
+                "Debt": debt,
+                "Invest": invest,
+                "Allocation total": total_alloc,
+                "Budget utilization %": round(utilization, 1),
+                "Approval-required actions": approvals,
+            }
+        )
+    return rows
+
+
+def pick_recommendation(rows: list[dict[str, Any]]) -> dict[str, Any]:
+    if not rows:
+        return {}
+    sorted_rows = sorted(
+        rows,
+        key=lambda row: (row["Score"], row["Debt"], row["Emergency"], row["Invest"]),
+        reverse=True,
+    )
+    return sorted_rows[0]
+
+
+def build_projection(
+    account: dict,
+    recommendation: dict[str, Any],
+    months: int = 12,
+) -> dict[str, list[float]]:
+    # Balances are accumulated in integer cents so month 12 is exact.
+    emergency, debt, invest = to_cents(
+        [account.get("cash", 0), sum_debt(account), sum_investments(account)]
+    )
+    emergency_add, debt_add, invest_add = to_cents(
+        [
+            recommendation.get("Emergency", 0),
+            recommendation.get("Debt", 0),
+            recommendation.get("Invest", 0),
+        ]
+    )
+    steps = np.arange(1, months + 1, dtype=np.int64)
+    emergency_path = emergency + emergency_add * steps
+    debt_path = np.maximum(0, debt - debt_add * steps)
+    invest_path = invest + invest_add * steps
+
+    return {
+        "Emergency fund": to_dollars(emergency_path).tolist(),
+        "Debt balance": to_dollars(debt_path).tolist(),
+        "Investments": to_dollars(invest_path).tolist(),
+        "Net worth": to_dollars(emergency_path + invest_path - debt_path).tolist(),
+    }
@@ -0,0 +1,379 @@
+import argparse
+import html
+import itertools
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import date
+from functools import lru_cache
+from pathlib import Path
+from string import Template
+from typing import Iterable, Iterator
+
+try:
+    from weasyprint import HTML as WeasyHTML
+except ImportError:  # pragma: no cover
+    WeasyHTML = None
+
+from app.config import ROOT, get_config
+from app.kpi import (
+    emergency_progress,
+    min_payments,
+    net_worth,
+    sum_debt,
+    weighted_apr,
+)
+from app.report_charts import bar_chart_svg, line_chart_svg
+from app.report_data import build_plan_rows, build_projection, pick_recommendation
+from app.report_render import parse_report_blocks
+from app.tools.interfaces import DemoResult
+
+TEMPLATE_DIR = Path(__file__).resolve().parent / "templates"
+DEFAULT_OUT = ROOT / "data" / "reports"
+FORMATS = ("html", "pdf")
+PLAN_COLUMNS = (
+    "Plan",
+    "Score",
+    "Emergency",
+    "Debt",
+    "Invest",
+    "Allocation total",
+    "Budget utilization %",
+    "Approval-required actions",
+)
+
+# (name, user, accounts, goals_text, result); result None means compute it.
+ExportJob = tuple[str, dict, dict, str, DemoResult | None]
+
+
+def as_currency(value: float) -> str:
+    return f"${value:,.0f}"
+
+
+@lru_cache(maxsize=None)
+def _assets() -> tuple[Template, str]:
+    """Template and stylesheet, read once per process."""
+    template = Template((TEMPLATE_DIR / "report.html").read_text(encoding="utf-8"))
+    styles = (TEMPLATE_DIR / "report.css").read_text(encoding="utf-8")
+    return template, styles
+
+
+def _table(columns: Iterable[str], rows: list[dict], highlight: str | None = None):
+    columns = list(columns)
+    head = "".join(f"<th>{html.escape(c)}</th>" for c in columns)
+    body = []
+    for row in rows:
+        cls = (
+            ' class="recommended"' if highlight and row.get("Plan") == highlight else ""
+        )
+        cells = "".join(f"<td>{html.escape(str(row.get(c, '')))}</td>" for c in columns)
+        body.append(f"<tr{cls}>{cells}</tr>")
+    return (
+        f"<table><thead><tr>{head}</tr></thead><tbody>{''.join(body)}</tbody></table>"
+    )
+
+
+def render_narrative(markdown_text: str) -> str:
+    """HTML for the narrative, mirroring the Streamlit ``render_plain_report``."""
+    parts = []
+    for block in parse_report_blocks(markdown_text):
+        if block["type"] == "heading":
+            level = max(2, min(3, int(block.get("level", 2)))) + 1
+            parts.append(f"<h{level}>{html.escape(block['text'])}</h{level}>")
+        elif block["type"] == "plan_table":
+            rows = block["rows"]
+            parts.append(_table(rows[0].keys(), rows))
+        elif block["type"] == "paragraph":
+            parts.append(f"<p>{html.escape(block['text'])}</p>")
+        elif block["type"] == "bullets":
+            items = "".join(f"<li>{html.escape(item)}</li>" for item in block["items"])
+            parts.append(f"<ul>{items}</ul>")
+    return "\n".join(parts)
+
+
+def _kpis(user: dict, accounts: dict, result: DemoResult) -> str:
+    expenses = float(user.get("expenses_monthly", 0))
+    disposable = float(user.get("income_monthly", 0)) - expenses
+    debt_total = float(sum_debt(accounts))
+    months = result.constraints.min_emergency_fund_months
+    target = expenses * float(months)
+    progress = emergency_progress(user, accounts, months)
+    items = [
+        ("Net worth", as_currency(float(net_worth(accounts)))),
+        ("Monthly cash flow", as_currency(disposable)),
+        ("Emergency target", as_currency(target)),
+        ("Emergency progress", f"{progress:.0f}%"),
+        ("Debt total", as_currency(debt_total)),
+        ("Weighted APR", f"{weighted_apr(accounts) * 100:.2f}%"),
+    ]
+    cells = "".join(
+        f'<td><span class="label">{label}</span>{html.escape(value)}</td>'
+        for label, value in items
+    )
+    return (
+        f'<table class="kpis"><tr>{cells}</tr></table>'
+        f'<p class="meta">Minimum monthly debt payments: '
+        f"{as_currency(min_payments(accounts))} | Risk tolerance: "
+        f"{html.escape(result.constraints.risk_tolerance)}</p>"
+    )
+
+
+def render_report_html(
+    user: dict, accounts: dict, result: DemoResult, as_of: str | None = None
+) -> str:
+    """Self-contained HTML report: inline styles and pre-rendered SVG charts."""
+    template, styles = _assets()
+    disposable = float(user.get("income_monthly", 0)) - float(
+        user.get("expenses_monthly", 0)
+    )
+    plan_rows = build_plan_rows(result, disposable)
+    recommendation = pick_recommendation(plan_rows)
+
+    charts = [
+        bar_chart_svg(
+            plan_rows, "Plan", ["Emergency", "Debt", "Invest"], "Allocation by plan"
+        )
+    ]
+    if recommendation:
+        projection = build_projection(accounts, recommendation, months=12)
+        worth = {"Net worth": projection.pop("Net worth")}
+        charts.append(line_chart_svg(projection, "Projected balances"))
+        charts.append(line_chart_svg(worth, "Projected net worth"))
+        summary = (
+            f"<p><strong>Recommended plan:</strong> "
+            f"{html.escape(recommendation['Plan'])} (score {recommendation['Score']}). "
+            f"Allocates {as_currency(recommendation['Allocation total'])} per month, "
+            f"{recommendation['Budget utilization %']}% of disposable cash flow.</p>"
+        )
+    else:
+        summary = "<p>No plans were generated for this input.</p>"
+
+    return template.substitute(
+        title=html.escape(f"Financial plan for {user.get('name', user['id'])}"),
+        subtitle=html.escape(
+            f"Client {user['id']} | {as_of or date.today().isoformat()} | "
+            f"Mode: {result.meta.get('mode', 'rules')}"
+        ),
+        styles=styles,
+        kpis=_kpis(user, accounts, result),
+        plans=_table(
+            PLAN_COLUMNS,
+            plan_rows,
+            recommendation.get("Plan") if recommendation else None,
+        ),
+        recommendation=summary,
+        charts="\n".join(charts),
+        narrative=render_narrative(result.markdown),
+        footer="Projections assume flat income, unchanged APRs and no market returns.",
+    )
+
+
+def pdf_renderer() -> str | None:
+    if WeasyHTML is not None:
+        return "weasyprint"
+    return shutil.which("wkhtmltopdf")
+
+
+def html_to_pdf(document: str, path: Path) -> None:
+    """Render with WeasyPrint if installed, else a local ``wkhtmltopdf``."""
+    renderer = pdf_renderer()
+    if renderer is None:
+        raise RuntimeError("PDF export requires weasyprint or wkhtmltopdf.")
+    if renderer == "weasyprint":
+        WeasyHTML(string=document).write_pdf(str(path))
+        return
+    subprocess.run(
+        [renderer, "--quiet", "-", str(path)],
+        input=document.encode("utf-8"),
+        check=True,
+    )
+
+
+def export_chunk(
+    args: tuple[list[ExportJob], str, tuple[str, ...], str, str, dict | None],
+) -> dict:
+    """Render one chunk of jobs to files; executed in a worker process."""
+    jobs, out_dir, formats, as_of, mode, config = args
+    out = Path(out_dir)
+    agent = None
+    written = {"reports": 0, "files": 0, "bytes": 0}
+    for name, user, accounts, goals_text, result in jobs:
+        if result is None:
+            if agent is None:
+                from app.agent.orchestrator import OrchestratorAgent
+
+                agent = OrchestratorAgent(config=config)
+            result = agent.run(mode, user, accounts, goals_text, priority="batch")
+        document = render_report_html(user, accounts, result, as_of)
+        if "html" in formats:
+            path = out / f"{name}.html"
+            path.write_text(document, encoding="utf-8")
+            written["bytes"] += path.stat().st_size
+            written["files"] += 1
+        if "pdf" in formats:
+            path = out / f"{name}.pdf"
+            html_to_pdf(document, path)
+            written["bytes"] += path.stat().st_size
+            written["files"] += 1
+        written["reports"] += 1
+    return written
+
+
+def _chunks(jobs: Iterable[ExportJob], size: int) -> Iterator[list[ExportJob]]:
+    chunk = []
+    for job in jobs:
+        chunk.append(job)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def export_reports(
+    jobs: Iterable[ExportJob],
+    out_dir: Path = DEFAULT_OUT,
+    formats: Iterable[str] = ("html",),
+    workers: int | None = None,
+    chunk_size: int = 200,
+    as_of: str | None = None,
+    mode: str = "rules",
+    config: dict | None = None,
+) -> dict:
+    """Render ``jobs`` across a process pool, one file per job and format.
+
+    Jobs are shipped in chunks so each worker reuses its cached template,
+    stylesheet and (for jobs without a result) orchestrator.
+    """
+    formats = tuple(formats)
+    for fmt in formats:
+        if fmt not in FORMATS:
+            raise ValueError(f"Unsupported format: {fmt}")
+    if "pdf" in formats and pdf_renderer() is None:
+        raise RuntimeError("PDF export requires weasyprint or wkhtmltopdf.")
+    started = time.perf_counter()
+    out_dir.mkdir(parents=True, exist_ok=True)
+    as_of = as_of or date.today().isoformat()
+    totals = {"reports": 0, "files": 0, "bytes": 0}
+    tasks = (
+        (chunk, str(out_dir), formats, as_of, mode, config)
+        for chunk in _chunks(jobs, chunk_size)
+    )
+    workers = workers or os.cpu_count() or 1
+
+    def collect(futures) -> None:
+        for future in futures:
+            written = future.result()
+            for key in totals:
+                totals[key] += written[key]
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_assets) as pool:
+        # Keep a bounded window of chunks in flight so jobs are read as the
+        # pool drains them; pool.map would consume the whole generator first.
+        in_flight = set()
+        for task in tasks:
+            if len(in_flight) >= 2 * workers:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                collect(done)
+            in_flight.add(pool.submit(export_chunk, task))
+        collect(wait(in_flight).done)
+    seconds = time.perf_counter() - started
+    return {
+        **totals,
+        "formats": list(formats),
+        "seconds": round(seconds, 3),
+        "reports_per_minute": round(totals["reports"] / seconds * 60) if seconds else 0,
+        "out_dir": str(out_dir),
+    }
+
+
+def stored_jobs(
+    store_path: Path, run_id: int | None = None, batch_size: int = 500
+) -> Iterator[ExportJob]:
+    """Jobs for every result in a stored run (latest by default).
+
+    Each client is rebuilt from the snapshot saved with its result, so an
+    old run prints the balances its plans were made for.
+    """
+    from app.data.results_store import ResultsStore
+
+    with ResultsStore(store_path) as store:
+        run_id = run_id or store.latest_run_id()
+        if run_id is None:
+            return
+        for offset in itertools.count(0, batch_size):
+            rows = store.query_results(
+                {"run_id": run_id}, limit=batch_size, offset=offset
+            )
+            if not rows:
+                return
+            ids = [row["result_id"] for row in rows]
+            loaded = store.load_client_results(ids)
+            for result_id in ids:
+                user, accounts, goals_text, result = loaded[result_id]
+                yield (
+                    f"{user['id']}_{result_id}",
+                    user,
+                    accounts,
+                    goals_text,
+                    result,
+                )
+
+
+def fresh_jobs() -> Iterator[ExportJob]:
+    """Jobs for the whole book, to be computed in the workers."""
+    from app.agent.batch import iter_book
+    from app.data.loader import load_accounts, load_goals, load_users
+
+    for user, accounts, goals_text in iter_book(
+        load_users(), load_accounts(), load_goals()
+    ):
+        yield user["id"], user, accounts, goals_text, None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Export per-client HTML/PDF reports across a process pool."
+    )
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--store", type=Path, help="Export results from a store.")
+    source.add_argument(
+        "--fresh", action="store_true", help="Compute results for the whole book."
+    )
+    parser.add_argument("--run-id", type=int)
+    parser.add_argument("--mode", choices=["rules", "agent"], default="rules")
+    parser.add_argument("--out", type=Path, default=DEFAULT_OUT)
+    parser.add_argument("--format", nargs="+", choices=FORMATS, default=["html"])
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--chunk-size", type=int, default=200)
+    parser.add_argument("--as-of", help="Report date label (default: today).")
+    args = parser.parse_args()
+
+    config = get_config()
+    if "pdf" in args.format and pdf_renderer() is None:
+        sys.exit("PDF export requires weasyprint or a wkhtmltopdf binary on PATH.")
+    if args.fresh or args.store is None:
+        if args.mode == "agent" and not config["agent_enabled"]:
+            sys.exit("Agent mode requires GEMINI_API_KEY; use --mode rules instead.")
+        jobs = fresh_jobs()
+    else:
+        jobs = stored_jobs(args.store, args.run_id)
+    report = export_reports(
+        jobs,
+        args.out,
+        args.format,
+        args.workers,
+        args.chunk_size,
+        args.as_of,
+        args.mode,
+        config,
+    )
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,7 @@ from pathlib import Path
 import html
 import re
 import sys
+import uuid
 from typing import Any
 
 try:
@@ -13,100 +14,33 @@ ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
+import altair as alt
 import streamlit as st
 from app.data.loader import load_users, load_accounts, load_goals
+from app.data.goal_library import get_goal_library
 from app.agent.orchestrator import OrchestratorAgent
 from app.config import get_config
 from app.report_render import parse_report_blocks
+from app.kpi import (
+    emergency_progress,
+    min_payments,
+    net_worth,
+    sum_debt,
+    sum_investments,
+    weighted_apr,
+)
+from app.report_data import build_plan_rows, build_projection, pick_recommendation
+from app.analytics.sensitivity import sensitivity_grid, surface_records
+from app.data.results_store import ResultsStore
 
-
-GOAL_TEMPLATES = [
-    "Pay off high-interest debt first while keeping a minimum emergency buffer.",
-    "Increase long-term investments but avoid large monthly drawdown risk.",
-    "Build a 6-month emergency fund before increasing discretionary spending.",
-    "Stabilize cash flow, reduce monthly obligations, and avoid new debt.",
-]
+SENSITIVITY_INCOME_PCT = (-0.3, -0.2, -0.1, 0.0, 0.1, 0.2)
+SENSITIVITY_EXPENSE_PCT = (-0.1, 0.0, 0.1, 0.2, 0.3)
 
 
 def as_currency(value: float) -> str:
     return f"${value:,.0f}"
 
 
-def sum_debt(accounts: dict) -> float:
-    return sum(item.get("balance", 0) for item in accounts.get("debts", []))
-
-
-def sum_investments(accounts: dict) -> float:
-    return sum(item.get("balance", 0) for item in accounts.get("investments", []))
-
-
-def min_payments(accounts: dict) -> float:
-    return sum(item.get("min_payment", 0) for item in accounts.get("debts", []))
-
-
-def weighted_apr(accounts: dict) -> float:
-    debts = [item for item in accounts.get("debts", []) if item.get("balance", 0) > 0]
-    total = sum(item.get("balance", 0) for item in debts)
-    if total <= 0:
-        return 0.0
-    weighted = sum(item.get("balance", 0) * item.get("apr", 0) for item in debts)
-    return weighted / total
-
-
-def get_goal_library(user_id: str, all_goals: list[dict[str, str]]) -> list[str]:
-    goals = [item["goals_text"] for item in all_goals if item["user_id"] == user_id]
-    merged = goals + GOAL_TEMPLATES
-    deduped = []
-    seen = set()
-    for text in merged:
-        if text not in seen:
-            seen.add(text)
-            deduped.append(text)
-    return deduped
-
-
-def get_action_amount(plan: Any, action_type: str) -> int:
-    action = next((item for item in plan.actions if item.type == action_type), None)
-    return int(action.amount) if action else 0
-
-
-def build_plan_rows(result: Any, monthly_disposable: float) -> list[dict[str, Any]]:
-    rows = []
-    for plan in result.plans:
-        emergency = get_action_amount(plan, "Emergency fund")
-        debt = get_action_amount(plan, "Debt payment")
-        invest = get_action_amount(plan, "Invest")
-        total_alloc = emergency + debt + invest
-        approvals = sum(1 for item in plan.actions if item.requires_human_approval)
-        utilization = (
-            (total_alloc / monthly_disposable * 100) if monthly_disposable > 0 else 0
-        )
-        rows.append(
-            {
-                "Plan": plan.name,
-                "Score": plan.score,
-                "Emergency": emergency,
-                "Debt": debt,
-                "Invest": invest,
-                "Allocation total": total_alloc,
-                "Budget utilization %": round(utilization, 1),
-                "Approval-required actions": approvals,
-            }
-        )
-    return rows
-
-
-def pick_recommendation(rows: list[dict[str, Any]]) -> dict[str, Any]:
-    if not rows:
-        return {}
-    sorted_rows = sorted(
-        rows,
-        key=lambda row: (row["Score"], row["Debt"], row["Emergency"], row["Invest"]),
-        reverse=True,
-    )
-    return sorted_rows[0]
-
-
 def style_plan_table(
     rows: list[dict[str, Any]],
     recommended_plan_name: str | None,
@@ -125,13 +59,16 @@ def style_plan_table(
 
     def row_style(row):
         if row.name == highlight_idx:
-            return [
-                "background-color: #fff4d6",
-                "color: #1a1a1a",
-                "border-top: 2px solid #e6a700",
-                "border-bottom: 2px solid #e6a700",
-                "font-weight: 600",
-            ]
+            highlight = "; ".join(
+                [
+                    "background-color: #fff4d6",
+                    "color: #1a1a1a",
+                    "border-top: 2px solid #e6a700",
+                    "border-bottom: 2px solid #e6a700",
+                    "font-weight: 600",
+                ]
+            )
+            return [highlight] * len(row)
         return [""] * len(row)
 
     return frame.style.apply(row_style, axis=1)
@@ -218,8 +155,13 @@ def validate_goal_text(text: str, mode: str, config: dict[str, Any]) -> list[str
     return errors
 
 
+@st.cache_data(max_entries=64, show_spinner=False)
+def report_blocks(markdown_text: str) -> list[dict]:
+    return parse_report_blocks(markdown_text)
+
+
 def render_plain_report(markdown_text: str) -> None:
-    for block in parse_report_blocks(markdown_text):
+    for block in report_blocks(markdown_text):
         if block["type"] == "heading":
             level = max(2, min(3, int(block.get("level", 2))))
             st.markdown(f"{'#' * level} {block['text']}")
@@ -238,142 +180,156 @@ def render_plain_report(markdown_text: str) -> None:
             st.markdown(f"<ul>{items}</ul>", unsafe_allow_html=True)
 
 
-def build_projection(
-    account: dict,
-    recommendation: dict[str, Any],
-    months: int = 12,
-) -> dict[str, list[float]]:
-    emergency = float(account.get("cash", 0))
-    debt = float(sum_debt(account))
-    invest = float(sum_investments(account))
-
-    emergency_add = float(recommendation.get("Emergency", 0))
-    debt_add = float(recommendation.get("Debt", 0))
-    invest_add = float(recommendation.get("Invest", 0))
-
-    series = {
-        "Emergency fund": [],
-        "Debt balance": [],
-        "Investments": [],
-        "Net worth": [],
-    }
-
-    for _ in range(months):
-        emergency += emergency_add
-        debt = max(0.0, debt - debt_add)
-        invest += invest_add
-        net_worth = emergency + invest - debt
-
-        series["Emergency fund"].append(emergency)
-        series["Debt balance"].append(debt)
-        series["Investments"].append(invest)
-        series["Net worth"].append(net_worth)
+def sensitivity_heatmap(rows: list[dict[str, Any]], value: str, title: str):
+    return (
+        alt.Chart(alt.Data(values=rows), title=title)
+        .mark_rect()
+        .encode(
+            x=alt.X("income_pct:O", title="Income change", axis=alt.Axis(format="+%")),
+            y=alt.Y(
+                "expense_pct:O",
+                title="Expense change",
+                axis=alt.Axis(format="+%"),
+                sort="descending",
+            ),
+            color=alt.Color(f"{value}:Q", title=value),
+            tooltip=[
+                alt.Tooltip("income_pct:O", format="+.0%"),
+                alt.Tooltip("expense_pct:O", format="+.0%"),
+                "Recommended plan:N",
+                "Score:Q",
+                alt.Tooltip("Net worth (end):Q", format=",.0f"),
+            ],
+        )
+    )
 
-    return series
 
+@st.cache_data(show_spinner=False)
+def load_book() -> tuple[list[dict], dict[str, dict], list[dict]]:
+    users = load_users()
+    accounts_by_user = {a["user_id"]: a for a in load_accounts()}
+    return users, accounts_by_user, load_goals()
 
-st.set_page_config(page_title="Smart Money Planner", layout="wide")
-st.title("Smart Money Planner (Local Demo)")
 
-users = load_users()
-accounts = load_accounts()
-goals = load_goals()
-accounts_by_user = {a["user_id"]: a for a in accounts}
+@st.cache_data(max_entries=64, show_spinner=False)
+def load_stored_result(path: str, result_id: int):
+    with ResultsStore(path) as store:
+        return store.load_client_result(result_id)
 
-config = get_config()
 
-with st.sidebar:
-    modes = ["rules"] if not config["agent_enabled"] else ["rules", "agent"]
-    mode = st.selectbox("Mode", modes)
-    if not config["agent_enabled"]:
-        st.warning("Agent mode requires GEMINI_API_KEY.")
-    user_ids = [u["id"] for u in users]
-    user_id = st.selectbox("Persona", user_ids)
-    user = next(u for u in users if u["id"] == user_id)
-    user_goals = get_goal_library(user_id, goals)
-    sample_goal = st.selectbox("Sample goals", user_goals or [""])
-    if st.button("Load sample"):
-        st.session_state["goals_text"] = sample_goal
+# Per-result memoization: ``key`` identifies the result, so the
+# underscore-prefixed arguments are not hashed on every rerun.
+@st.cache_data(max_entries=32, show_spinner=False)
+def dashboard_data(key: str, _user: dict, _account: dict, _result: Any) -> dict:
+    monthly_income = float(_user.get("income_monthly", 0))
+    monthly_expenses = float(_user.get("expenses_monthly", 0))
+    monthly_disposable = monthly_income - monthly_expenses
+    months = _result.constraints.min_emergency_fund_months
+    plan_rows = build_plan_rows(_result, monthly_disposable)
+    recommendation = pick_recommendation(plan_rows)
+    return {
+        "net_worth": float(net_worth(_account)),
+        "monthly_disposable": monthly_disposable,
+        "emergency_target": monthly_expenses * float(months),
+        "emergency_progress": emergency_progress(_user, _account, months),
+        "debt_total": float(sum_debt(_account)),
+        "weighted_apr": weighted_apr(_account),
+        "min_payment_total": float(min_payments(_account)),
+        "plan_rows": plan_rows,
+        "recommendation": recommendation,
+        "allocation": chart_allocation(plan_rows),
+        "balance_sheet": chart_balance_sheet(_user, _account),
+        "debt_rows": chart_debt_stress(_account),
+        "projection": (
+            build_projection(_account, recommendation, months=12)
+            if recommendation
+            else None
+        ),
+    }
 
-goals_text = st.text_area(
-    "Goals text",
-    value=(st.session_state.get("goals_text") or sample_goal or ""),
-    height=130,
-    help=(
-        f"Use {config['goals_min_chars']}-{config['goals_max_chars']} characters, "
-        f"max {config['goals_max_lines']} lines."
-    ),
-)
-run = st.button("Run demo")
 
-mode_hint = "Deterministic rules only." if mode == "rules" else "Agent mode (Gemini)."
-st.caption(mode_hint)
+@st.cache_data(max_entries=32, show_spinner=False)
+def sensitivity_data(
+    key: str, _user: dict, _account: dict, _constraints: Any
+) -> list[dict[str, Any]]:
+    grid = sensitivity_grid(
+        _user,
+        _account,
+        _constraints,
+        income_pct=SENSITIVITY_INCOME_PCT,
+        expense_pct=SENSITIVITY_EXPENSE_PCT,
+    )
+    return surface_records(grid, x="income_pct", y="expense_pct")
 
-if run:
-    if mode == "agent" and not config["agent_enabled"]:
-        st.error("Agent mode is not configured. Set GEMINI_API_KEY and try again.")
-        st.stop()
 
-    cleaned_goals_text = normalize_goal_text(goals_text)
-    validation_errors = validate_goal_text(cleaned_goals_text, mode, config)
-    if validation_errors:
-        st.error("Input validation failed:")
-        for item in validation_errors:
-            st.write(f"- {item}")
-        st.stop()
-
-    agent = OrchestratorAgent(config=config)
-    account = accounts_by_user.get(user_id, {"cash": 0, "debts": [], "investments": []})
-    result = agent.run(
-        mode,
-        user,
-        account,
-        cleaned_goals_text,
-    )
+@st.cache_data(max_entries=32, show_spinner=False)
+def raw_data(key: str, _result: Any) -> dict[str, Any]:
+    return {
+        "constraints": _result.constraints.__dict__,
+        "plans": [
+            {
+                "name": p.name,
+                "score": p.score,
+                "actions": [a.__dict__ for a in p.actions],
+            }
+            for p in _result.plans
+        ],
+    }
 
-    monthly_income = float(user.get("income_monthly", 0))
-    monthly_expenses = float(user.get("expenses_monthly", 0))
-    monthly_disposable = monthly_income - monthly_expenses
-    cash = float(account.get("cash", 0))
-    debt_total = float(sum_debt(account))
-    investment_total = float(sum_investments(account))
-    min_payment_total = float(min_payments(account))
-    emergency_target = monthly_expenses * float(
-        result.constraints.min_emergency_fund_months
-    )
-    emergency_progress = (
-        (cash / emergency_target * 100) if emergency_target > 0 else 100.0
-    )
-    net_worth = cash + investment_total - debt_total
 
+@st.fragment
+def trace_section(mode: str, meta: dict) -> None:
+    providers = meta.get("providers", {})
+    parse_provider = providers.get("parse", "rules")
+    explain_provider = providers.get("explain", "rules")
+    # Name the providers that actually served the run; the router may keep
+    # agent mode on the rules path.
+    used = "+".join(dict.fromkeys((parse_provider, explain_provider)))
     trace = (
-        f"Mode: `{mode}` | Provider: `{('gemini' if mode == 'agent' else 'rules')}` "
-        f"| Parser: `{('RuleGoalParser' if mode == 'rules' else 'GeminiGoalParser')}` "
-        f"| Explainer: `{('RulePlanExplainer' if mode == 'rules' else 'GeminiPlanExplainer')}`"
+        f"Mode: `{mode}` | Provider: `{used}` "
+        f"| Parser: `{('GeminiGoalParser' if parse_provider == 'gemini' else 'RuleGoalParser')}` "
+        f"| Explainer: `{('GeminiPlanExplainer' if explain_provider == 'gemini' else 'RulePlanExplainer')}`"
     )
+    routing = meta.get("routing")
+    if routing:
+        trace += (
+            f" | Route: `{routing['route']}` "
+            f"(confidence {routing['confidence']:.2f}, threshold {routing['threshold']:.2f})"
+        )
     st.info(trace)
+    for item in meta.get("degraded", []):
+        st.warning(
+            f"Gemini {item['stage']} stage unavailable ({item['reason']}); "
+            "used deterministic rules instead."
+        )
+
 
+@st.fragment
+def kpi_section(data: dict, risk_tolerance: str) -> None:
     k1, k2, k3, k4, k5, k6 = st.columns(6)
     with k1:
-        st.metric("Net worth", as_currency(net_worth))
+        st.metric("Net worth", as_currency(data["net_worth"]))
     with k2:
-        st.metric("Monthly cash flow", as_currency(monthly_disposable))
+        st.metric("Monthly cash flow", as_currency(data["monthly_disposable"]))
     with k3:
-        st.metric("Emergency target", as_currency(emergency_target))
+        st.metric("Emergency target", as_currency(data["emergency_target"]))
     with k4:
-        st.metric("Emergency progress", f"{emergency_progress:.0f}%")
+        st.metric("Emergency progress", f"{data['emergency_progress']:.0f}%")
     with k5:
-        st.metric("Debt total", as_currency(debt_total))
+        st.metric("Debt total", as_currency(data["debt_total"]))
     with k6:
-        st.metric("Weighted APR", f"{weighted_apr(account) * 100:.2f}%")
+        st.metric("Weighted APR", f"{data['weighted_apr'] * 100:.2f}%")
 
     st.caption(
-        f"Minimum monthly debt payments: {as_currency(min_payment_total)} | "
-        f"Risk tolerance: {result.constraints.risk_tolerance}"
+        f"Minimum monthly debt payments: {as_currency(data['min_payment_total'])} | "
+        f"Risk tolerance: {risk_tolerance}"
     )
 
-    plan_rows = build_plan_rows(result, monthly_disposable)
-    recommendation = pick_recommendation(plan_rows)
+
+@st.fragment
+def plan_section(data: dict) -> None:
+    plan_rows = data["plan_rows"]
+    recommendation = data["recommendation"]
 
     st.subheader("Plan comparison")
     if plan_rows:
@@ -385,13 +341,13 @@ if run:
     c1, c2, c3 = st.columns(3)
     with c1:
         st.subheader("Allocation by plan")
-        st.bar_chart(chart_allocation(plan_rows), x="Plan")
+        st.bar_chart(data["allocation"], x="Plan")
     with c2:
         st.subheader("Balance sheet")
-        st.bar_chart(chart_balance_sheet(user, account), x="Category")
+        st.bar_chart(data["balance_sheet"], x="Category")
     with c3:
         st.subheader("Debt stress")
-        debt_rows = chart_debt_stress(account)
+        debt_rows = data["debt_rows"]
         if debt_rows:
             st.bar_chart(debt_rows, x="Debt", y="Balance")
             st.dataframe(debt_rows, use_container_width=True)
@@ -413,6 +369,9 @@ if run:
     else:
         st.warning("No plans were generated for this input.")
 
+
+@st.fragment
+def projection_section(data: dict) -> None:
     st.subheader("Assumptions and scenario outlook")
     a1, a2, a3, a4 = st.columns(4)
     with a1:
@@ -424,8 +383,8 @@ if run:
     with a4:
         st.metric("Rate assumption", "APR unchanged")
 
-    if recommendation:
-        projection = build_projection(account, recommendation, months=12)
+    projection = data["projection"]
+    if projection:
         p1, p2 = st.columns(2)
         with p1:
             st.caption("Projected balances under current plan assumptions")
@@ -440,20 +399,166 @@ if run:
             st.caption("Projected net worth trajectory")
             st.area_chart({"Net worth": projection["Net worth"]})
 
-    details_1, details_2 = st.tabs(["Narrative", "Raw data"])
-    with details_1:
-        render_plain_report(result.markdown)
-    with details_2:
-        st.json(
-            {
-                "constraints": result.constraints.__dict__,
-                "plans": [
-                    {
-                        "name": p.name,
-                        "score": p.score,
-                        "actions": [a.__dict__ for a in p.actions],
-                    }
-                    for p in result.plans
-                ],
-            }
+
+@st.fragment
+def sensitivity_section(key: str, user: dict, account: dict, constraints) -> None:
+    st.subheader("What-if sensitivity")
+    st.caption(
+        "Parsed constraints are held fixed; plans, scores and the 12-month "
+        "projection are re-evaluated for each income and expense change."
+    )
+    sensitivity_rows = sensitivity_data(key, user, account, constraints)
+    s1, s2 = st.columns(2)
+    with s1:
+        st.altair_chart(
+            sensitivity_heatmap(sensitivity_rows, "Score", "Recommended plan score"),
+            use_container_width=True,
+        )
+    with s2:
+        st.altair_chart(
+            sensitivity_heatmap(
+                sensitivity_rows, "Net worth (end)", "Projected net worth (12 months)"
+            ),
+            use_container_width=True,
+        )
+
+
+@st.fragment
+def details_section(key: str, result: Any) -> None:
+    # Stateful tabs rerun only this fragment on switch, and only the open
+    # tab's content is built.
+    narrative, raw = st.tabs(
+        ["Narrative", "Raw data"], key="details_tab", on_change="rerun"
+    )
+    if narrative.open:
+        with narrative:
+            render_plain_report(result.markdown)
+    if raw.open:
+        with raw:
+            st.json(raw_data(key, result))
+
+
+def render_dashboard(
+    key: str, mode: str, user: dict, account: dict, result: Any
+) -> None:
+    data = dashboard_data(key, user, account, result)
+    trace_section(mode, result.meta)
+    kpi_section(data, result.constraints.risk_tolerance)
+    plan_section(data)
+    projection_section(data)
+    sensitivity_section(key, user, account, result.constraints)
+    details_section(key, result)
+
+
+st.set_page_config(page_title="Smart Money Planner", layout="wide")
+st.title("Smart Money Planner (Local Demo)")
+
+users, accounts_by_user, goals = load_book()
+
+config = get_config()
+
+with st.sidebar:
+    modes = ["rules"] if not config["agent_enabled"] else ["rules", "agent"]
+    mode = st.selectbox("Mode", modes)
+    if not config["agent_enabled"]:
+        st.warning("Agent mode requires GEMINI_API_KEY.")
+    user_ids = [u["id"] for u in users]
+    user_id = st.selectbox("Persona", user_ids)
+    user = next(u for u in users if u["id"] == user_id)
+    user_goals = get_goal_library(user_id, goals)
+    sample_goal = st.selectbox("Sample goals", user_goals or [""])
+    if st.button("Load sample"):
+        st.session_state["goals_text"] = sample_goal
+
+goals_text = st.text_area(
+    "Goals text",
+    value=(st.session_state.get("goals_text") or sample_goal or ""),
+    height=130,
+    help=(
+        f"Use {config['goals_min_chars']}-{config['goals_max_chars']} characters, "
+        f"max {config['goals_max_lines']} lines."
+    ),
+)
+run = st.button("Run demo")
+
+mode_hint = "Deterministic rules only." if mode == "rules" else "Agent mode (Gemini)."
+st.caption(mode_hint)
+
+if run:
+    if mode == "agent" and not config["agent_enabled"]:
+        st.error("Agent mode is not configured. Set GEMINI_API_KEY and try again.")
+        st.stop()
+
+    cleaned_goals_text = normalize_goal_text(goals_text)
+    validation_errors = validate_goal_text(cleaned_goals_text, mode, config)
+    if validation_errors:
+        st.error("Input validation failed:")
+        for item in validation_errors:
+            st.write(f"- {item}")
+        st.stop()
+
+    # A fresh run replaces any drill-down; otherwise the stale ?result= would
+    # bring the stored result back on the next rerun.
+    st.query_params.pop("result", None)
+    agent = OrchestratorAgent(config=config)
+    account = accounts_by_user.get(user_id, {"cash": 0, "debts": [], "investments": []})
+    result = agent.run(
+        mode,
+        user,
+        account,
+        cleaned_goals_text,
+    )
+    # Kept in session state so later widget interactions keep the dashboard.
+    st.session_state["dashboard"] = {
+        "key": f"run:{uuid.uuid4().hex}",
+        "mode": mode,
+        "user": user,
+        "account": account,
+        "result": result,
+        "stored": None,
+    }
+elif st.query_params.get("result"):
+    try:
+        result_id = int(st.query_params["result"])
+    except ValueError:
+        st.error(f"Stored result #{st.query_params['result']} was not found.")
+        st.stop()
+    key = f"stored:{config['results_store_path']}:{result_id}"
+    if st.session_state.get("dashboard", {}).get("key") != key:
+        try:
+            stored_user, stored_account, stored_goals, stored = load_stored_result(
+                config["results_store_path"], result_id
+            )
+        except KeyError:
+            st.error(f"Stored result #{result_id} was not found.")
+            st.stop()
+        st.session_state["dashboard"] = {
+            "key": key,
+            "mode": stored.meta.get("mode", "rules"),
+            "user": stored_user,
+            "account": stored_account,
+            "result": stored,
+            "stored": (result_id, stored_goals),
+        }
+
+dashboard = st.session_state.get("dashboard")
+if dashboard:
+    if dashboard["stored"]:
+        result_id, stored_goals = dashboard["stored"]
+        st.info(
+            f"Stored result #{result_id} for client `{dashboard['user']['id']}`: "
+            f"{stored_goals}"
         )
+        st.page_link("pages/1_Portfolio.py", label="Back to portfolio")
+    elif dashboard["user"]["id"] != user_id:
+        st.warning(
+            f"Showing the last run for `{dashboard['user']['id']}`. "
+            f"Press Run demo to plan for `{user_id}`."
+        )
+    render_dashboard(
+        dashboard["key"],
+        dashboard["mode"],
+        dashboard["user"],
+        dashboard["account"],
+        dashboard["result"],
+    )
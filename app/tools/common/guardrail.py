@@ -1,27 +1,36 @@
+from app.money import CENTS, DOLLAR, Money, allocate_cents
+from app.tools.common.plan_generator import gap_dollars, monthly_budget
 from app.tools.interfaces import Constraints, Plan, PlanAction
 
 
 def apply_guardrails(
     plans: list[Plan], user: dict, accounts: dict, constraints: Constraints
 ):
-    disposable = max(0, user["income_monthly"] - user["expenses_monthly"])
-    emergency_target = user["expenses_monthly"] * constraints.min_emergency_fund_months
-    emergency_gap = max(0, emergency_target - accounts.get("cash", 0))
+    disposable, emergency_gap = monthly_budget(user, accounts, constraints)
 
     guarded = []
     for plan in plans:
-        total = sum(action.amount for action in plan.actions)
-        scale = (disposable / total) if total > disposable and total > 0 else 1
+        total = Money.of(sum(action.amount for action in plan.actions))
+        if total > disposable:
+            # Split the whole-dollar budget pro rata; largest remainders keep
+            # the sum exact instead of drifting by a dollar from rounding.
+            shares = allocate_cents(
+                disposable.cents,
+                [a.amount for a in plan.actions],
+                unit=DOLLAR,
+            )
+            amounts = [int(c) // CENTS for c in shares.tolist()]
+        else:
+            amounts = [int(round(a.amount)) for a in plan.actions]
 
         actions = [
-            PlanAction(a.type, int(round(a.amount * scale)), a.requires_human_approval)
-            for a in plan.actions
+            PlanAction(a.type, amount, a.requires_human_approval)
+            for a, amount in zip(plan.actions, amounts)
         ]
 
-        if emergency_gap > 0 and not any(a.type == "Emergency fund" for a in actions):
-            actions.insert(
-                0, PlanAction("Emergency fund", min(emergency_gap, disposable), False)
-            )
+        if emergency_gap and not any(a.type == "Emergency fund" for a in actions):
+            amount = min(gap_dollars(emergency_gap), disposable.dollars())
+            actions.insert(0, PlanAction("Emergency fund", amount, False))
 
         guarded.append(Plan(name=plan.name, score=plan.score, actions=actions))
     return guarded
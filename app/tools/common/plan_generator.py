@@ -1,44 +1,35 @@
-from app.tools.interfaces import Plan, PlanAction, Constraints
-
-
-def generate_plans(user: dict, accounts: dict, constraints: Constraints):
-    disposable = max(0, user["income_monthly"] - user["expenses_monthly"])
-    base_cash = accounts.get("cash", 0)
-    emergency_target = user["expenses_monthly"] * constraints.min_emergency_fund_months
-    emergency_gap = max(0, emergency_target - base_cash)
-
-    def plan(name: str, actions):
-        return Plan(name=name, score=0, actions=[a for a in actions if a.amount > 0])
-
-    debt_amount = int(disposable * 0.5)
-    invest_amount = int(disposable * 0.3)
-    cash_amount = int(disposable * 0.2)
-
-    return [
-        plan(
-            "Debt focus",
-            [
-                PlanAction("Emergency fund", min(emergency_gap, cash_amount)),
-                PlanAction("Debt payment", debt_amount, True),
-                PlanAction("Invest", invest_amount, True),
-            ],
-        ),
-        plan(
-            "Balanced",
-            [
-                PlanAction("Emergency fund", min(emergency_gap, int(disposable * 0.3))),
-                PlanAction("Debt payment", int(disposable * 0.35), True),
-                PlanAction("Invest", int(disposable * 0.35), True),
-            ],
-        ),
-        plan(
-            "Growth focus",
-            [
-                PlanAction(
-                    "Emergency fund", min(emergency_gap, int(disposable * 0.15))
-                ),
-                PlanAction("Invest", int(disposable * 0.6), True),
-                PlanAction("Debt payment", int(disposable * 0.25), True),
-            ],
-        ),
-    ]
+from decimal import ROUND_UP
+
+from app.money import Money
+from app.tools.common.strategies import StrategySet, load_strategies
+from app.tools.interfaces import Constraints
+
+
+def monthly_budget(
+    user: dict, accounts: dict, constraints: Constraints
+) -> tuple[Money, Money]:
+    """Disposable income and emergency-fund gap, exact to the cent."""
+    expenses = Money.of(user["expenses_monthly"])
+    disposable = max(Money(), Money.of(user["income_monthly"]) - expenses)
+    target = expenses.scale(constraints.min_emergency_fund_months)
+    gap = max(Money(), target - Money.of(accounts.get("cash", 0)))
+    return disposable, gap
+
+
+def gap_dollars(gap: Money) -> int:
+    # A partial dollar still has to be saved, so the gap rounds up.
+    return gap.dollars(ROUND_UP)
+
+
+def generate_plans(
+    user: dict,
+    accounts: dict,
+    constraints: Constraints,
+    strategies: StrategySet | None = None,
+):
+    disposable, emergency_gap = monthly_budget(user, accounts, constraints)
+
+    strategies = strategies or load_strategies()
+    return strategies.plans(
+        float(disposable), {"emergency_gap": gap_dollars(emergency_gap)}
+    )
@@ -0,0 +1,215 @@
+import json
+import operator
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from app.tools.interfaces import Constraints, Plan, PlanAction
+
+DEFAULT_SPEC_PATH = Path(__file__).with_name("strategies.json")
+CAP_SOURCES = ("emergency_gap",)
+CONSTRAINT_FIELDS = (
+    "min_emergency_fund_months",
+    "focus_debt_reduction",
+    "risk_tolerance",
+    "time_horizon_months",
+)
+OPERATORS = {
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
+
+
+@dataclass(frozen=True)
+class _Operand:
+    action: int | None = None
+    constant: float = 0.0
+
+
+@dataclass(frozen=True)
+class _Rule:
+    when: tuple[tuple[str, Any], ...]
+    lhs: _Operand
+    op: str
+    rhs: _Operand
+    add: int
+
+
+class StrategySet:
+    """A strategy/scoring spec compiled into scalar and array evaluators.
+
+    Allocations are ``int(disposable * ratio)``, optionally capped by a named
+    source such as ``emergency_gap``. Scoring rules add points when all
+    ``when`` constraint values match and the ``require`` comparison holds,
+    reading an action that a plan does not contain as an amount of 0.
+    """
+
+    def __init__(self, spec: dict[str, Any]):
+        action_specs = spec.get("action_types") or {}
+        if not action_specs:
+            raise ValueError("Strategy spec needs at least one action type.")
+        self.action_types = list(action_specs)
+        self.action_index = {name: i for i, name in enumerate(self.action_types)}
+        strategies = spec.get("strategies") or []
+        if not strategies:
+            raise ValueError("Strategy spec needs at least one strategy.")
+
+        s, a = len(strategies), len(self.action_types)
+        self.names = []
+        self.ratios = np.zeros((s, a))
+        self.caps = np.full((s, a), -1, dtype=np.int64)
+        self.approval = np.zeros((s, a), dtype=bool)
+        self.order: list[list[int]] = []
+        for i, strategy in enumerate(strategies):
+            self.names.append(strategy["name"])
+            order = []
+            for action in strategy["actions"]:
+                j = self._action(action["type"])
+                if j in order:
+                    raise ValueError(
+                        f"Duplicate action {action['type']} in {strategy['name']}."
+                    )
+                order.append(j)
+                self.ratios[i, j] = float(action["ratio"])
+                cap = action.get("cap")
+                if cap is not None:
+                    if cap not in CAP_SOURCES:
+                        raise ValueError(f"Unsupported cap source: {cap}")
+                    self.caps[i, j] = CAP_SOURCES.index(cap)
+                self.approval[i, j] = bool(
+                    action.get(
+                        "requires_human_approval",
+                        action_specs[action["type"]].get(
+                            "requires_human_approval", False
+                        ),
+                    )
+                )
+            self.order.append(order)
+
+        scoring = spec.get("scoring") or {}
+        self.base_score = int(scoring.get("base", 0))
+        self.rules = [self._rule(rule) for rule in scoring.get("rules", [])]
+
+    def _action(self, name: str) -> int:
+        if name not in self.action_index:
+            raise ValueError(f"Unknown action type: {name}")
+        return self.action_index[name]
+
+    def _operand(self, value: Any) -> _Operand:
+        if isinstance(value, str):
+            return _Operand(action=self._action(value))
+        return _Operand(constant=float(value))
+
+    def _rule(self, rule: dict[str, Any]) -> _Rule:
+        when = tuple(rule.get("when", {}).items())
+        for name, _ in when:
+            if name not in CONSTRAINT_FIELDS:
+                raise ValueError(f"Unsupported constraint in scoring rule: {name}")
+        lhs, op, rhs = rule["require"]
+        if op not in OPERATORS:
+            raise ValueError(f"Unsupported operator: {op}")
+        return _Rule(when, self._operand(lhs), op, self._operand(rhs), int(rule["add"]))
+
+    def plans(self, disposable: float, caps: dict[str, float]) -> list[Plan]:
+        plans = []
+        for i, name in enumerate(self.names):
+            actions = []
+            for j in self.order[i]:
+                amount = int(disposable * float(self.ratios[i, j]))
+                if self.caps[i, j] >= 0:
+                    amount = min(caps[CAP_SOURCES[self.caps[i, j]]], amount)
+                if amount > 0:
+                    actions.append(
+                        PlanAction(
+                            self.action_types[j], amount, bool(self.approval[i, j])
+                        )
+                    )
+            plans.append(Plan(name=name, score=0, actions=actions))
+        return plans
+
+    def score_plan(self, plan: Plan, constraints: Constraints) -> int:
+        amounts: dict[int, float] = {}
+        for action in plan.actions:
+            j = self.action_index.get(action.type)
+            if j is not None and j not in amounts:
+                amounts[j] = action.amount
+
+        def value(operand: _Operand) -> float:
+            if operand.action is None:
+                return operand.constant
+            return amounts.get(operand.action, 0)
+
+        score = self.base_score
+        for rule in self.rules:
+            if all(getattr(constraints, f) == v for f, v in rule.when) and OPERATORS[
+                rule.op
+            ](value(rule.lhs), value(rule.rhs)):
+                score += rule.add
+        return score
+
+    def allocate(
+        self, disposable: np.ndarray, caps: dict[str, np.ndarray]
+    ) -> np.ndarray:
+        """Amounts shaped ``disposable.shape + (strategies, action_types)``."""
+        disposable = np.asarray(disposable, dtype=float)
+        amounts = disposable[..., None, None] * self.ratios
+        np.trunc(amounts, out=amounts)
+        for c, source in enumerate(CAP_SOURCES):
+            mask = self.caps == c
+            if mask.any():
+                cap = np.asarray(caps[source], dtype=float)[..., None, None]
+                np.minimum(cap, amounts, out=amounts, where=mask)
+        np.maximum(amounts, 0.0, out=amounts)
+        return amounts
+
+    def score(
+        self, amounts: np.ndarray, constraints: dict[str, Any]
+    ) -> np.ndarray:
+        """Scores shaped ``amounts.shape[:-1]``.
+
+        ``constraints`` maps constraint fields to scalars or arrays that
+        broadcast against ``amounts.shape[:-2]``.
+        """
+        score = np.full(amounts.shape[:-1], self.base_score, dtype=np.int64)
+
+        def value(operand: _Operand):
+            if operand.action is None:
+                return operand.constant
+            return amounts[..., operand.action]
+
+        for rule in self.rules:
+            active = np.True_
+            for name, expected in rule.when:
+                active = active & (np.asarray(constraints[name]) == expected)
+            if not np.any(active):
+                continue
+            holds = OPERATORS[rule.op](value(rule.lhs), value(rule.rhs))
+            if np.ndim(active):
+                holds &= np.expand_dims(active, -1)
+            score += holds * np.int64(rule.add)
+        return score
+
+    def evaluate(
+        self,
+        disposable: np.ndarray,
+        caps: dict[str, np.ndarray],
+        constraints: dict[str, Any],
+    ) -> tuple[np.ndarray, np.ndarray]:
+        amounts = self.allocate(disposable, caps)
+        return amounts, self.score(amounts, constraints)
+
+
+def load_strategies(path: str | Path | None = None) -> StrategySet:
+    return _load(str(Path(path or DEFAULT_SPEC_PATH).resolve()))
+
+
+@lru_cache(maxsize=8)
+def _load(path: str) -> StrategySet:
+    return StrategySet(json.loads(Path(path).read_text(encoding="utf-8")))
@@ -1,12 +1,7 @@
 import json
 from typing import Any
 
-try:
-    from google import genai
-    from google.genai import types
-except ImportError:  # pragma: no cover - optional dependency
-    genai = None
-    types = None
+from app.tools.gemini.transport import GenaiTransport, Transport
 
 
 class GeminiClient:
@@ -16,17 +11,16 @@ class GeminiClient:
         model: str,
         timeout_seconds: int = 20,
         temperature: float = 0.2,
+        transport: Transport | None = None,
     ):
         self.api_key = api_key
         self.model = model
         self.timeout_seconds = timeout_seconds
         self.temperature = temperature
-        self.is_configured = bool(api_key)
-        if self.is_configured and genai is None:
-            raise RuntimeError(
-                "google-genai is not installed. Install it to enable Agent mode."
-            )
-        self.client = genai.Client(api_key=api_key) if self.is_configured else None
+        self.is_configured = bool(api_key) or transport is not None
+        if transport is None and api_key:
+            transport = GenaiTransport(api_key)
+        self.transport = transport
 
     def parse_constraints(self, goals_text: str, user: dict) -> dict[str, Any]:
         if not self.is_configured:
@@ -62,17 +56,17 @@ class GeminiClient:
             f"Goals: {goals_text}"
         )
 
-        response = self.client.models.generate_content(
-            model=self.model,
-            contents=prompt,
-            config=types.GenerateContentConfig(
-                response_mime_type="application/json",
-                response_schema=schema,
-                temperature=self.temperature,
-            ),
+        response = self.transport.generate(
+            self.model,
+            prompt,
+            {
+                "response_mime_type": "application/json",
+                "response_schema": schema,
+                "temperature": self.temperature,
+            },
         )
 
-        if not response or not response.text:
+        if not response.text:
             raise RuntimeError("Gemini returned empty constraints.")
 
         return json.loads(response.text)
@@ -88,15 +82,11 @@ class GeminiClient:
             f"Input: {json.dumps(report_input, indent=2)}"
         )
 
-        response = self.client.models.generate_content(
-            model=self.model,
-            contents=prompt,
-            config=types.GenerateContentConfig(
-                temperature=self.temperature,
-            ),
+        response = self.transport.generate(
+            self.model, prompt, {"temperature": self.temperature}
         )
 
-        if not response or not response.text:
+        if not response.text:
             raise RuntimeError("Gemini returned empty report.")
 
         return response.text
@@ -0,0 +1,461 @@
+import atexit
+import gzip
+import hashlib
+import io
+import json
+import multiprocessing
+import os
+import random
+import threading
+import time
+import zlib
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Protocol
+
+try:
+    from google import genai
+    from google.genai import types
+except ImportError:  # pragma: no cover - optional dependency
+    genai = None
+    types = None
+
+CASSETTE_VERSION = 1
+LATENCY_MODES = ("instant", "recorded", "sampled")
+
+
+@dataclass
+class Usage:
+    prompt_tokens: int = 0
+    output_tokens: int = 0
+    total_tokens: int = 0
+
+
+@dataclass
+class TransportResponse:
+    text: str
+    usage: Usage = field(default_factory=Usage)
+    latency_ms: float = 0.0
+
+
+class Transport(Protocol):
+    def generate(
+        self, model: str, prompt: str, config: dict[str, Any]
+    ) -> TransportResponse: ...
+
+
+def request_key(model: str, prompt: str, config: dict[str, Any]) -> str:
+    payload = json.dumps(
+        {"model": model, "prompt": prompt, "config": config},
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()[:32]
+
+
+def request_kind(config: dict[str, Any]) -> str:
+    return "json" if config.get("response_mime_type") == "application/json" else "text"
+
+
+class GenaiTransport:
+    """Live calls through ``google-genai``."""
+
+    def __init__(self, api_key: str):
+        if genai is None:
+            raise RuntimeError(
+                "google-genai is not installed. Install it to enable Agent mode."
+            )
+        self.client = genai.Client(api_key=api_key)
+
+    def generate(
+        self, model: str, prompt: str, config: dict[str, Any]
+    ) -> TransportResponse:
+        started = time.perf_counter()
+        response = self.client.models.generate_content(
+            model=model,
+            contents=prompt,
+            config=types.GenerateContentConfig(**config),
+        )
+        latency_ms = (time.perf_counter() - started) * 1000
+        meta = getattr(response, "usage_metadata", None)
+        usage = Usage(
+            prompt_tokens=getattr(meta, "prompt_token_count", 0) or 0,
+            output_tokens=getattr(meta, "candidates_token_count", 0) or 0,
+            total_tokens=getattr(meta, "total_token_count", 0) or 0,
+        )
+        text = response.text if response else None
+        return TransportResponse(text or "", usage, latency_ms)
+
+
+class Cassette:
+    """Recorded request/response pairs, one JSON line each.
+
+    Requests are stored by key (a hash of model, prompt and config) rather
+    than by prompt, so cassettes stay small and carry no client data beyond
+    the model's answers. A ``.gz`` suffix compresses the file.
+
+    Each process records to its own file: the main process to ``path``,
+    pool workers and forked children to ``<stem>.part-<pid>.<suffixes>``
+    beside it, even when the parent had the main file open at the fork.
+    ``load`` reads the main file and every part.
+    """
+
+    def __init__(self, path: str | Path, entries: list[dict] | None = None):
+        self.path = Path(path)
+        self.entries: list[dict] = entries or []
+        self.by_key: dict[str, list[dict]] = {}
+        for entry in self.entries:
+            self.by_key.setdefault(entry["key"], []).append(entry)
+        self._handle = None
+        self._pid = os.getpid()
+        self._child = False
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _open(path: Path, mode: str):
+        if path.suffix == ".gz":
+            return gzip.open(path, mode + "t", encoding="utf-8")
+        return path.open(mode, encoding="utf-8")
+
+    @staticmethod
+    def part_path(path: Path, tag: str) -> Path:
+        stem, _, rest = path.name.partition(".")
+        return path.with_name(
+            f"{stem}.part-{tag}.{rest}" if rest else f"{stem}.part-{tag}"
+        )
+
+    @classmethod
+    def _read(cls, path: Path) -> tuple[list[dict], bool]:
+        """Entries of one file, and whether it was read to a clean end.
+
+        A recorder killed mid-run leaves a gzip stream without its trailer
+        and possibly half a line; everything before that is kept.
+        """
+        entries: list[dict] = []
+        with cls._open(path, "r") as handle:
+            try:
+                first = handle.readline()
+            except (EOFError, zlib.error):
+                return entries, False
+            header = json.loads(first or "{}")
+            if header.get("cassette") != CASSETTE_VERSION:
+                raise ValueError(f"Not a version {CASSETTE_VERSION} cassette: {path}")
+            try:
+                for line in handle:
+                    if line.strip():
+                        entries.append(json.loads(line))
+            except (EOFError, zlib.error, json.JSONDecodeError):
+                return entries, False
+        return entries, True
+
+    @classmethod
+    def load(cls, path: str | Path) -> "Cassette":
+        path = Path(path)
+        stem, _, rest = path.name.partition(".")
+        parts = sorted(
+            path.parent.glob(f"{stem}.part-*" + (f".{rest}" if rest else ""))
+        )
+        entries: list[dict] = []
+        for source in ([path] if path.exists() else []) + parts:
+            entries.extend(cls._read(source)[0])
+        if not path.exists() and not parts:
+            raise FileNotFoundError(path)
+        return cls(path, entries)
+
+    def _forked(self) -> None:
+        """Drop state inherited from the parent process after a fork."""
+        if self._handle is not None:
+            # Closing this copy would write a gzip trailer into the parent's
+            # stream; point it at a scratch buffer first.
+            if isinstance(self._handle.buffer, gzip.GzipFile):
+                self._handle.buffer.fileobj = io.BytesIO()
+            self._handle.close()
+            self._handle = None
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        self._child = True
+
+    def _start(self) -> None:
+        path = self.path
+        if self._child or multiprocessing.parent_process() is not None:
+            # Pool workers must not interleave writes into a shared file.
+            path = self.part_path(path, str(os.getpid()))
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.exists() and path.stat().st_size:
+            entries, complete = self._read(path)
+            if not complete:
+                # Appending after a truncated gzip member would make the
+                # new data unreadable; rewrite what survived first.
+                with self._open(path, "w") as handle:
+                    handle.write(json.dumps(self._header()) + "\n")
+                    for entry in entries:
+                        handle.write(json.dumps(entry, separators=(",", ":")) + "\n")
+            self._handle = self._open(path, "a")
+        else:
+            self._handle = self._open(path, "a")
+            self._handle.write(json.dumps(self._header()) + "\n")
+        # gzip writes its trailer on close; until then each flush leaves a
+        # readable, if truncated, stream.
+        atexit.register(self.close)
+
+    @staticmethod
+    def _header() -> dict:
+        return {"cassette": CASSETTE_VERSION, "created": time.time()}
+
+    def append(self, entry: dict) -> None:
+        """Add an entry and flush it, so a killed run keeps what it recorded."""
+        if self._pid != os.getpid():
+            self._forked()
+        with self._lock:
+            if self._handle is None:
+                self._start()
+            self._handle.write(json.dumps(entry, separators=(",", ":")) + "\n")
+            self._handle.flush()
+            self.entries.append(entry)
+            self.by_key.setdefault(entry["key"], []).append(entry)
+
+    def close(self) -> None:
+        if self._pid != os.getpid():
+            self._forked()
+        with self._lock:
+            if self._handle is not None:
+                self._handle.close()
+                self._handle = None
+
+    def latencies(self, kind: str | None = None) -> list[float]:
+        return [
+            e["latency_ms"] for e in self.entries if kind is None or e["kind"] == kind
+        ]
+
+
+class RecordingTransport:
+    """Pass calls to ``inner`` and append each exchange to ``cassette``."""
+
+    def __init__(self, inner: Transport, cassette: Cassette):
+        self.inner = inner
+        self.cassette = cassette
+
+    def generate(
+        self, model: str, prompt: str, config: dict[str, Any]
+    ) -> TransportResponse:
+        started = time.perf_counter()
+        response = self.inner.generate(model, prompt, config)
+        latency_ms = response.latency_ms or (time.perf_counter() - started) * 1000
+        self.cassette.append(
+            {
+                "key": request_key(model, prompt, config),
+                "kind": request_kind(config),
+                "model": model,
+                "latency_ms": round(latency_ms, 1),
+                "usage": asdict(response.usage),
+                "text": response.text,
+            }
+        )
+        return response
+
+
+class CassetteMiss(KeyError):
+    pass
+
+
+class ReplayTransport:
+    """Serve responses from a cassette without the network.
+
+    ``latency`` is ``instant``, ``recorded`` (each entry's own latency) or
+    ``sampled`` (drawn from the cassette's latency distribution for that
+    kind of call), scaled by ``speed``. A request that was never recorded
+    raises ``CassetteMiss``, or with ``on_miss="cycle"`` gets the next
+    recorded response of the same kind, so a small cassette can drive a
+    large synthetic book.
+    """
+
+    def __init__(
+        self,
+        cassette: Cassette,
+        latency: str = "instant",
+        speed: float = 1.0,
+        on_miss: str = "error",
+        seed: int = 0,
+    ):
+        if latency not in LATENCY_MODES:
+            raise ValueError(f"Unsupported replay latency: {latency}")
+        self.cassette = cassette
+        self.latency = latency
+        self.speed = speed
+        self.on_miss = on_miss
+        self.stats = Counter()
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._cursor: Counter = Counter()
+        self._by_kind = {
+            kind: [e for e in cassette.entries if e["kind"] == kind]
+            for kind in ("json", "text")
+        }
+        self._latencies = {kind: cassette.latencies(kind) for kind in self._by_kind}
+
+    def _entry(self, key: str, kind: str) -> dict:
+        with self._lock:
+            matches = self.cassette.by_key.get(key)
+            if matches:
+                # Repeated identical requests replay their recordings in turn.
+                entry = matches[self._cursor[key] % len(matches)]
+                self._cursor[key] += 1
+                self.stats["hits"] += 1
+                return entry
+            pool = self._by_kind[kind]
+            if self.on_miss != "cycle" or not pool:
+                self.stats["misses"] += 1
+                raise CassetteMiss(key)
+            entry = pool[self._cursor[kind] % len(pool)]
+            self._cursor[kind] += 1
+            self.stats["cycled"] += 1
+            return entry
+
+    def _delay_ms(self, entry: dict) -> float:
+        if self.latency == "recorded":
+            return entry["latency_ms"]
+        if self.latency == "sampled":
+            with self._lock:
+                return self._rng.choice(self._latencies[entry["kind"]])
+        return 0.0
+
+    def generate(
+        self, model: str, prompt: str, config: dict[str, Any]
+    ) -> TransportResponse:
+        kind = request_kind(config)
+        entry = self._entry(request_key(model, prompt, config), kind)
+        delay_ms = self._delay_ms(entry) / self.speed
+        if delay_ms > 0:
+            time.sleep(delay_ms / 1000)
+        usage = Usage(**entry.get("usage", {}))
+        with self._lock:
+            self.stats["calls"] += 1
+            self.stats["tokens"] += usage.total_tokens
+        return TransportResponse(entry["text"], usage, delay_ms)
+
+
+class FaultInjectingTransport:
+    """Wrap a transport with seeded, synthetic failures.
+
+    Each call independently times out (after ``timeout_seconds``, scaled
+    like replay latency, then ``TimeoutError``), returns an empty response,
+    or returns malformed JSON, with the given probabilities.
+    """
+
+    def __init__(
+        self,
+        inner: Transport,
+        timeout: float = 0.0,
+        empty: float = 0.0,
+        malformed: float = 0.0,
+        timeout_seconds: float = 20.0,
+        speed: float = 1.0,
+        seed: int = 0,
+    ):
+        self.inner = inner
+        self.rates = (("timeout", timeout), ("empty", empty), ("malformed", malformed))
+        self.timeout_seconds = timeout_seconds
+        self.speed = speed
+        self.stats = Counter()
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _fault(self) -> str | None:
+        with self._lock:
+            draw = self._rng.random()
+        for name, rate in self.rates:
+            if draw < rate:
+                return name
+            draw -= rate
+        return None
+
+    def generate(
+        self, model: str, prompt: str, config: dict[str, Any]
+    ) -> TransportResponse:
+        fault = self._fault()
+        if fault is not None:
+            with self._lock:
+                self.stats[fault] += 1
+        if fault == "timeout":
+            time.sleep(self.timeout_seconds / self.speed)
+            raise TimeoutError("Injected Gemini timeout.")
+        if fault == "empty":
+            return TransportResponse("", Usage(), 0.0)
+        response = self.inner.generate(model, prompt, config)
+        if fault == "malformed":
+            text = response.text
+            # Cut JSON mid-document; plain text gets a stray JSON fragment.
+            response.text = text[: len(text) // 2] if text else '{"min_emer'
+        return response
+
+
+def build_transport(cfg: dict) -> Transport:
+    """Transport for ``cfg``: live, recording, or replay, plus any faults.
+
+    Prefer ``get_transport``; a cassette must have a single writer and
+    replay state (cursors, seeded draws) should span the whole run.
+    """
+    path = cfg.get("llm_cassette")
+    mode = cfg.get("llm_cassette_mode") or ("replay" if path else "live")
+    speed = float(cfg.get("llm_replay_speed", 1.0))
+    if mode == "replay":
+        if not path:
+            raise RuntimeError("Replay mode needs LLM_CASSETTE.")
+        transport = ReplayTransport(
+            Cassette.load(path),
+            latency=cfg.get("llm_replay_latency", "instant"),
+            speed=speed,
+            on_miss=cfg.get("llm_replay_on_miss", "error"),
+            seed=int(cfg.get("llm_fault_seed", 0)),
+        )
+    else:
+        transport = GenaiTransport(cfg.get("gemini_api_key", ""))
+        if mode == "record":
+            if not path:
+                raise RuntimeError("Record mode needs LLM_CASSETTE.")
+            transport = RecordingTransport(transport, Cassette(path))
+    rates = {
+        name: float(cfg.get(f"llm_fault_{name}", 0.0) or 0.0)
+        for name in ("timeout", "empty", "malformed")
+    }
+    if any(rates.values()):
+        transport = FaultInjectingTransport(
+            transport,
+            **rates,
+            # Instant replay should not wait out injected timeouts either.
+            timeout_seconds=(
+                0.0
+                if mode == "replay" and transport.latency == "instant"
+                else float(cfg.get("llm_timeout_seconds", 20))
+            ),
+            speed=speed if mode == "replay" else 1.0,
+            seed=int(cfg.get("llm_fault_seed", 0)),
+        )
+    return transport
+
+
+_shared_transports: dict[tuple, Transport] = {}
+_shared_lock = threading.Lock()
+
+
+def get_transport(cfg: dict) -> Transport:
+    key = (
+        cfg.get("gemini_api_key"),
+        cfg.get("llm_cassette"),
+        cfg.get("llm_cassette_mode"),
+        cfg.get("llm_replay_latency"),
+        cfg.get("llm_replay_speed"),
+        cfg.get("llm_replay_on_miss"),
+        cfg.get("llm_fault_timeout"),
+        cfg.get("llm_fault_empty"),
+        cfg.get("llm_fault_malformed"),
+        cfg.get("llm_fault_seed"),
+        cfg.get("llm_timeout_seconds"),
+    )
+    with _shared_lock:
+        transport = _shared_transports.get(key)
+        if transport is None:
+            transport = build_transport(cfg)
+            _shared_transports[key] = transport
+        return transport
@@ -0,0 +1,51 @@
+import argparse
+import json
+from pathlib import Path
+
+from app.config import ROOT, get_config
+from app.data.loader import load_users
+from app.tools.routing.goal_parser import RoutingGoalParser, evaluate_router
+from app.tools.rules.goal_parser import RuleGoalParser
+
+DEFAULT_CORPUS = ROOT / "docs" / "data" / "presets" / "preset_outputs.json"
+
+
+def load_preset_corpus(path: Path) -> list[dict]:
+    users = {u["id"]: u for u in load_users()}
+    presets = json.loads(path.read_text(encoding="utf-8"))
+    return [
+        {
+            "goals_text": preset["input_goals_text"],
+            "user": users.get(preset["user_id"], {}),
+            "constraints": preset.get("constraints"),
+        }
+        for preset in presets
+        if preset.get("mode") == "agent"
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Report rule/LLM goal parsing agreement by confidence threshold."
+    )
+    parser.add_argument("--corpus", type=Path, default=DEFAULT_CORPUS)
+    parser.add_argument("--threshold", type=float, default=0.85)
+    parser.add_argument("--rows", action="store_true", help="Include per-item rows.")
+    args = parser.parse_args()
+
+    corpus = load_preset_corpus(args.corpus)
+    llm_parser = None
+    if any(not item.get("constraints") for item in corpus):
+        from app.agent.factory import build_gemini_client
+        from app.tools.gemini.goal_parser import GeminiGoalParser
+
+        llm_parser = GeminiGoalParser(build_gemini_client(get_config()))
+    router = RoutingGoalParser(RuleGoalParser(), llm_parser, threshold=args.threshold)
+    report = evaluate_router(router, corpus)
+    if not args.rows:
+        report.pop("rows")
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
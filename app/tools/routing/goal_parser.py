@@ -0,0 +1,157 @@
+import threading
+from typing import Any
+
+from app.tools.interfaces import Constraints, GoalParser
+from app.tools.rules.confidence import score_confidence
+
+# Constraint fields that change the generated plans; agreement on these is
+# what "equal quality" means for routing.
+DECISION_FIELDS = (
+    "min_emergency_fund_months",
+    "focus_debt_reduction",
+    "risk_tolerance",
+)
+
+
+class RoutingStats:
+    """Process-wide routing counters used to calibrate the threshold."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = {"rules": 0, "llm": 0}
+        self._confidence_total = 0.0
+        self._buckets = [0] * 10
+
+    def record(self, route: str, confidence: float) -> None:
+        with self._lock:
+            self._counts[route] += 1
+            self._confidence_total += confidence
+            self._buckets[min(9, int(confidence * 10))] += 1
+
+    def summary(self) -> dict[str, Any]:
+        with self._lock:
+            total = self._counts["rules"] + self._counts["llm"]
+            return {
+                "routed_rules": self._counts["rules"],
+                "routed_llm": self._counts["llm"],
+                "llm_share": round(self._counts["llm"] / total, 3) if total else 0.0,
+                "mean_confidence": (
+                    round(self._confidence_total / total, 3) if total else 0.0
+                ),
+                "confidence_histogram": list(self._buckets),
+            }
+
+
+ROUTING_STATS = RoutingStats()
+
+
+class RoutingGoalParser:
+    """Parses with rules first and escalates to the LLM parser when unsure."""
+
+    def __init__(
+        self,
+        rule_parser: GoalParser,
+        llm_parser: GoalParser,
+        threshold: float = 0.85,
+        stats: RoutingStats | None = None,
+    ):
+        self.rule_parser = rule_parser
+        self.llm_parser = llm_parser
+        self.threshold = threshold
+        self.stats = stats or ROUTING_STATS
+
+    def route(self, text: str, user: dict) -> tuple[Constraints, dict[str, Any]]:
+        constraints = self.rule_parser.parse(text, user)
+        confidence, signals = score_confidence(text)
+        route = "rules" if confidence >= self.threshold else "llm"
+        self.stats.record(route, confidence)
+        decision = {
+            "route": route,
+            "confidence": confidence,
+            "threshold": self.threshold,
+            "signals": signals,
+        }
+        return constraints, decision
+
+    def parse(self, text: str, user: dict) -> Constraints:
+        constraints, decision = self.route(text, user)
+        if decision["route"] == "rules":
+            return constraints
+        return self.llm_parser.parse(text, user)
+
+    def calibration(self) -> dict[str, Any]:
+        return self.stats.summary()
+
+
+def _agrees(left: Constraints, right: Constraints) -> bool:
+    return all(getattr(left, f) == getattr(right, f) for f in DECISION_FIELDS)
+
+
+def evaluate_router(
+    router: RoutingGoalParser,
+    corpus: list[dict[str, Any]],
+    thresholds: tuple[float, ...] = (0.5, 0.6, 0.7, 0.8, 0.85, 0.9, 1.0),
+) -> dict[str, Any]:
+    """Compare rule output with LLM output over a labelled corpus.
+
+    Each corpus item holds ``goals_text`` and ``user``, plus optionally
+    ``constraints`` with a recorded LLM answer; the LLM parser is only called
+    for items without one.
+    """
+    rows = []
+    for item in corpus:
+        text, user = item["goals_text"], item.get("user", {})
+        rule_constraints = router.rule_parser.parse(text, user)
+        confidence, signals = score_confidence(text)
+        recorded = item.get("constraints")
+        llm_constraints = (
+            Constraints(**recorded) if recorded else router.llm_parser.parse(text, user)
+        )
+        rows.append(
+            {
+                "goals_text": text,
+                "confidence": confidence,
+                "signals": signals,
+                "agree": _agrees(rule_constraints, llm_constraints),
+                "field_agreement": {
+                    f: getattr(rule_constraints, f) == getattr(llm_constraints, f)
+                    for f in DECISION_FIELDS
+                },
+            }
+        )
+
+    total = len(rows)
+    sweep = []
+    for threshold in thresholds:
+        routed_rules = [row for row in rows if row["confidence"] >= threshold]
+        disagreements = sum(1 for row in routed_rules if not row["agree"])
+        sweep.append(
+            {
+                "threshold": threshold,
+                "llm_calls_saved": (
+                    round(len(routed_rules) / total, 3) if total else 0.0
+                ),
+                # Final output matches LLM-only parsing except where a
+                # rule-routed item disagrees.
+                "agreement_with_llm": (
+                    round(1 - disagreements / total, 3) if total else 1.0
+                ),
+            }
+        )
+
+    return {
+        "items": total,
+        "rule_agreement": (
+            round(sum(row["agree"] for row in rows) / total, 3) if total else 1.0
+        ),
+        "field_agreement": {
+            f: (
+                round(sum(row["field_agreement"][f] for row in rows) / total, 3)
+                if total
+                else 1.0
+            )
+            for f in DECISION_FIELDS
+        },
+        "threshold_sweep": sweep,
+        "rows": rows,
+    }
@@ -0,0 +1,69 @@
+import re
+
+from app.tools.rules.goal_parser import (
+    DEBT_KEYWORDS,
+    HIGH_RISK_KEYWORDS,
+    LOW_RISK_KEYWORDS,
+)
+
+# Intents the rule parser maps directly onto constraint fields.
+INTENT_CUES = {
+    "debt": DEBT_KEYWORDS,
+    "low_risk": LOW_RISK_KEYWORDS,
+    "high_risk": HIGH_RISK_KEYWORDS,
+    "emergency": ["emergency", "buffer"],
+    "invest": ["invest"],
+}
+
+# Phrases the rule parser cannot represent (explicit months, horizons,
+# exclusions), so an LLM reading would likely differ.
+UNHANDLED_PATTERNS = [
+    r"\b(?!3\s*-?\s*months?\b)\d+\s*-?\s*(month|mo|year|yr)s?\b",
+    r"\b(avoid|never|without|no new|stop)\b",
+    r"\b(before|after|until|then)\b",
+    r"\b(drawdowns?|education|college|wedding|house|home)\b",
+    r"\b(maximi[sz]e|minimi[sz]e|stable|stabilize)\b",
+]
+HEDGE_WORDS = r"\b(maybe|not sure|either|unsure|might|possibly|somehow|or)\b"
+NEGATED_DEBT = (
+    r"\b(avoid|no|without|never)\s+(new\s+|more\s+|any\s+)?(debt|loans?|credit)"
+)
+
+
+def score_confidence(text: str) -> tuple[float, dict]:
+    t = (text or "").lower()
+    words = re.findall(r"[a-z']+", t)
+    matched = sorted(
+        intent for intent, cues in INTENT_CUES.items() if any(c in t for c in cues)
+    )
+    unhandled = [p for p in UNHANDLED_PATTERNS if re.search(p, t)]
+    hedges = re.findall(HEDGE_WORDS, t)
+    conflicts = []
+    if "low_risk" in matched and "high_risk" in matched:
+        conflicts.append("risk")
+    if any(k in t for k in HIGH_RISK_KEYWORDS) and re.search(
+        r"\bno (volatility|risk)\b", t
+    ):
+        conflicts.append("return_without_risk")
+    if re.search(NEGATED_DEBT, t):
+        conflicts.append("negated_debt")
+
+    score = 1.0
+    if not matched:
+        score -= 0.5
+    score -= 0.2 * len(unhandled)
+    score -= 0.1 * min(len(hedges), 3)
+    score -= 0.3 * len(conflicts)
+    if len(words) < 3:
+        score -= 0.3
+    elif len(words) > 25:
+        score -= 0.2
+
+    signals = {
+        "matched_intents": matched,
+        "unhandled_cues": len(unhandled),
+        "hedges": len(hedges),
+        "conflicts": conflicts,
+        "word_count": len(words),
+    }
+    return round(max(0.0, min(1.0, score)), 3), signals
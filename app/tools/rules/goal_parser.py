@@ -1,14 +1,18 @@
 from app.tools.interfaces import Constraints
 
+DEBT_KEYWORDS = ["debt", "loan", "mortgage", "credit card"]
+LOW_RISK_KEYWORDS = ["low volatility", "conservative", "low risk"]
+HIGH_RISK_KEYWORDS = ["high return", "aggressive", "high risk"]
+
 
 class RuleGoalParser:
     def parse(self, text: str, user: dict) -> Constraints:
         t = (text or "").lower()
-        focus_debt = any(k in t for k in ["debt", "loan", "mortgage", "credit card"])
+        focus_debt = any(k in t for k in DEBT_KEYWORDS)
         risk = user.get("risk_tolerance", "medium")
-        if any(k in t for k in ["low volatility", "conservative", "low risk"]):
+        if any(k in t for k in LOW_RISK_KEYWORDS):
             risk = "low"
-        if any(k in t for k in ["high return", "aggressive", "high risk"]):
+        if any(k in t for k in HIGH_RISK_KEYWORDS):
             risk = "high"
 
         return Constraints(
@@ -3,6 +3,9 @@ const state = {
   accounts: [],
   goals: [],
   presets: [],
+  manifest: null,
+  // userId -> promise for that persona's shard, shared by concurrent renders.
+  shardLoads: new Map(),
 };
 
 const elements = {};
@@ -17,18 +20,61 @@ const fetchJson = async (path) => {
   return response.json();
 };
 
+const fetchShard = async (path) => {
+  const response = await fetch(path);
+  if (!response.ok) {
+    throw new Error(`Failed to load ${path}`);
+  }
+  const bytes = new Uint8Array(await response.arrayBuffer());
+  // Servers that set Content-Encoding hand us plain JSON already.
+  if (bytes[0] !== 0x1f || bytes[1] !== 0x8b) {
+    return JSON.parse(new TextDecoder().decode(bytes));
+  }
+  const stream = new Blob([bytes]).stream().pipeThrough(new DecompressionStream("gzip"));
+  return new Response(stream).json();
+};
+
+const fetchManifest = async () => {
+  try {
+    return await fetchJson("data/presets/manifest.json");
+  } catch (error) {
+    return null;
+  }
+};
+
 const loadData = async () => {
-  const [users, accounts, goals, presets] = await Promise.all([
+  const [users, accounts, goals, manifest] = await Promise.all([
     fetchJson("data/mock/users.json"),
     fetchJson("data/mock/accounts.json"),
     fetchJson("data/mock/goals.json"),
-    fetchJson("data/presets/preset_outputs.json"),
+    fetchManifest(),
   ]);
 
   state.users = users;
   state.accounts = accounts;
   state.goals = goals;
-  state.presets = presets;
+  state.manifest = manifest;
+  // Without a generated manifest, fall back to the single curated blob.
+  state.presets = manifest ? [] : await fetchJson("data/presets/preset_outputs.json");
+};
+
+const ensurePresetsFor = (userId) => {
+  const shard = state.manifest && state.manifest.shards[userId];
+  if (!shard) {
+    return Promise.resolve();
+  }
+  if (!state.shardLoads.has(userId)) {
+    const load = fetchShard(`data/presets/${shard.path}`)
+      .then((presets) => {
+        state.presets = state.presets.concat(presets);
+      })
+      .catch(() => {
+        // Forget the failure so the next render retries the fetch.
+        state.shardLoads.delete(userId);
+      });
+    state.shardLoads.set(userId, load);
+  }
+  return state.shardLoads.get(userId);
 };
 
 const getAccountForUser = (userId) =>
@@ -298,9 +344,13 @@ const renderPersonas = () => {
   });
 };
 
-const renderPresets = () => {
+const renderPresets = async () => {
   const mode = elements.modeSelect.value;
   const persona = elements.personaSelect.value;
+  await ensurePresetsFor(persona);
+  if (elements.modeSelect.value !== mode || elements.personaSelect.value !== persona) {
+    return; // a newer render owns the select now
+  }
   const presets = state.presets.filter((preset) => preset.mode === mode && preset.user_id === persona);
 
   elements.presetSelect.innerHTML = "";
@@ -417,20 +467,20 @@ const boot = async () => {
   }
 
   renderPersonas();
-  renderPresets();
+  await renderPresets();
   updateGoalInput();
   updateModeHint();
 
-  elements.modeSelect.addEventListener("change", () => {
-    renderPresets();
+  elements.modeSelect.addEventListener("change", async () => {
+    await renderPresets();
     updateModeHint();
     if (elements.modeSelect.value === "agent" && elements.presetSelect.value) {
       runPreset();
     }
   });
 
-  elements.personaSelect.addEventListener("change", () => {
-    renderPresets();
+  elements.personaSelect.addEventListener("change", async () => {
+    await renderPresets();
     updateGoalInput();
     if (elements.modeSelect.value === "agent" && elements.presetSelect.value) {
       runPreset();
@@ -26,11 +26,27 @@
     };
   };
 
+  // Dollars to integer cents, half away from zero, as app/money.py rounds.
+  const toCents = (value) => {
+    const scaled = Number((value * 100).toFixed(6));
+    return Math.sign(scaled) * Math.floor(Math.abs(scaled) + 0.5);
+  };
+
+  // Mirrors monthly_budget in plan_generator.py: disposable income and the
+  // emergency-fund gap in cents. The gap is capped in whole dollars, rounded
+  // up so a partial dollar is still saved.
+  const monthlyBudget = (user, accounts, constraints) => {
+    const expenses = toCents(user.expenses_monthly);
+    const disposable = Math.max(0, toCents(user.income_monthly) - expenses);
+    const target = expenses * constraints.min_emergency_fund_months;
+    const gap = Math.max(0, target - toCents(accounts.cash || 0));
+    return { disposable, gap, gapDollars: Math.ceil(gap / 100) };
+  };
+
   const generatePlans = (user, accounts, constraints) => {
-    const disposable = Math.max(0, user.income_monthly - user.expenses_monthly);
-    const baseCash = accounts.cash || 0;
-    const emergencyTarget = user.expenses_monthly * constraints.min_emergency_fund_months;
-    const emergencyGap = Math.max(0, emergencyTarget - baseCash);
+    const budget = monthlyBudget(user, accounts, constraints);
+    const disposable = budget.disposable / 100;
+    const emergencyGap = budget.gapDollars;
 
     const plan = (name, allocations) => ({
       name,
@@ -38,14 +54,16 @@
         .filter((item) => item.amount > 0)
         .map((item) => ({
           type: item.type,
-          amount: Math.round(item.amount),
+          amount: item.amount,
           requires_human_approval: item.requires_human_approval || false,
         })),
     });
 
-    const debtAmount = disposable * 0.5;
-    const investAmount = disposable * 0.3;
-    const cashAmount = disposable * 0.2;
+    // Whole dollars truncated before capping, as the Python strategy kernel does.
+    const share = (ratio) => Math.trunc(disposable * ratio);
+    const debtAmount = share(0.5);
+    const investAmount = share(0.3);
+    const cashAmount = share(0.2);
 
     return [
       plan("Debt focus", [
@@ -54,14 +72,14 @@
         { type: "Invest", amount: investAmount, requires_human_approval: true },
       ]),
       plan("Balanced", [
-        { type: "Emergency fund", amount: Math.min(emergencyGap, disposable * 0.3) },
-        { type: "Debt payment", amount: disposable * 0.35, requires_human_approval: true },
-        { type: "Invest", amount: disposable * 0.35, requires_human_approval: true },
+        { type: "Emergency fund", amount: Math.min(emergencyGap, share(0.3)) },
+        { type: "Debt payment", amount: share(0.35), requires_human_approval: true },
+        { type: "Invest", amount: share(0.35), requires_human_approval: true },
       ]),
       plan("Growth focus", [
-        { type: "Emergency fund", amount: Math.min(emergencyGap, disposable * 0.15) },
-        { type: "Invest", amount: disposable * 0.6, requires_human_approval: true },
-        { type: "Debt payment", amount: disposable * 0.25, requires_human_approval: true },
+        { type: "Emergency fund", amount: Math.min(emergencyGap, share(0.15)) },
+        { type: "Invest", amount: share(0.6), requires_human_approval: true },
+        { type: "Debt payment", amount: share(0.25), requires_human_approval: true },
       ]),
     ];
   };
@@ -88,24 +106,68 @@
     });
   };
 
+  // Mirrors app/money.py: floor each pro-rata share, then hand the leftover
+  // units to the largest remainders (ties to the earlier action) so the
+  // shares sum exactly to the budget.
+  const allocateLargestRemainder = (units, weights) => {
+    const weightSum = weights.reduce((sum, weight) => sum + weight, 0);
+    if (weightSum <= 0) {
+      return weights.map(() => 0);
+    }
+    const quotas = weights.map((weight) => units * (weight / weightSum));
+    const shares = quotas.map((quota) => Math.floor(quota));
+    const leftover = units - shares.reduce((sum, value) => sum + value, 0);
+    const order = quotas
+      .map((quota, index) => ({ index, remainder: quota - shares[index] }))
+      .sort((a, b) => b.remainder - a.remainder || a.index - b.index);
+    order.forEach((item, rank) => {
+      if (rank < leftover) {
+        shares[item.index] += 1;
+      }
+      if (rank >= order.length + Math.min(leftover, 0)) {
+        shares[item.index] -= 1;
+      }
+    });
+    return shares;
+  };
+
+  // Python's round(): halves go to the even neighbour.
+  const roundHalfEven = (value) => {
+    const floor = Math.floor(value);
+    const diff = value - floor;
+    if (diff === 0.5) {
+      return floor % 2 === 0 ? floor : floor + 1;
+    }
+    return Math.round(value);
+  };
+
   const applyGuardrails = (plans, user, accounts, constraints) => {
-    const disposable = Math.max(0, user.income_monthly - user.expenses_monthly);
-    const emergencyTarget = user.expenses_monthly * constraints.min_emergency_fund_months;
-    const emergencyGap = Math.max(0, emergencyTarget - (accounts.cash || 0));
+    const budget = monthlyBudget(user, accounts, constraints);
+    const disposableDollars = Math.floor(budget.disposable / 100);
 
     return plans.map((plan) => {
       const total = plan.actions.reduce((sum, action) => sum + action.amount, 0);
-      const scale = total > disposable && total > 0 ? disposable / total : 1;
-
-      let actions = plan.actions.map((action) => ({
+      const amounts =
+        toCents(total) > budget.disposable
+          ? allocateLargestRemainder(
+              disposableDollars,
+              plan.actions.map((action) => action.amount)
+            )
+          : plan.actions.map((action) => roundHalfEven(action.amount));
+
+      let actions = plan.actions.map((action, index) => ({
         ...action,
-        amount: Math.round(action.amount * scale),
+        amount: amounts[index],
       }));
 
       const hasEmergency = actions.some((action) => action.type === "Emergency fund");
-      if (emergencyGap > 0 && !hasEmergency) {
+      if (budget.gap > 0 && !hasEmergency) {
         actions = [
-          { type: "Emergency fund", amount: Math.min(emergencyGap, disposable), requires_human_approval: false },
+          {
+            type: "Emergency fund",
+            amount: Math.min(budget.gapDollars, disposableDollars),
+            requires_human_approval: false,
+          },
           ...actions,
         ];
       }
@@ -0,0 +1,34 @@
+from app.analytics.book import AccountBook
+
+
+def test_unsorted_and_duplicate_ids_keep_columns_aligned():
+    users = [
+        {"id": "zed", "income_monthly": 9000, "expenses_monthly": 1000},
+        {"id": "amy", "income_monthly": 3000, "expenses_monthly": 2500},
+        {"id": "zed", "income_monthly": 1, "expenses_monthly": 1},
+    ]
+    accounts = [
+        {"user_id": "amy", "cash": 100, "debts": [], "investments": []},
+        {"user_id": "zed", "cash": 700, "debts": [], "investments": []},
+    ]
+    book = AccountBook.from_records(users, accounts)
+
+    assert book.client_ids == ["zed", "amy"]
+    kpis = book.client_kpis()
+    assert kpis["monthly_disposable"].tolist() == [8000, 500]
+    assert kpis["cash"].tolist() == [700, 100]
+    assert len(kpis["net_worth"]) == len(book)
+
+
+def test_later_batches_append_in_input_order():
+    book = AccountBook()
+    book.add_users([{"id": "m", "income_monthly": 1, "expenses_monthly": 0}])
+    book.add_users(
+        [
+            {"id": "z", "income_monthly": 3, "expenses_monthly": 0},
+            {"id": "b", "income_monthly": 2, "expenses_monthly": 0},
+        ]
+    )
+
+    assert book.client_ids == ["m", "z", "b"]
+    assert book.client_kpis()["monthly_disposable"].tolist() == [1, 3, 2]
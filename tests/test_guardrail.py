@@ -0,0 +1,26 @@
+from app.tools.common.guardrail import apply_guardrails
+from app.tools.common.plan_generator import generate_plans
+from app.tools.interfaces import Constraints, Plan, PlanAction
+
+USER = {"income_monthly": 5000, "expenses_monthly": 750}
+ACCOUNTS = {"cash": 2201.5, "debts": [], "investments": []}
+CONSTRAINTS = Constraints(3, False, "medium")
+
+
+def test_fractional_emergency_gap_gives_whole_dollar_actions():
+    plans = apply_guardrails(
+        generate_plans(USER, ACCOUNTS, CONSTRAINTS), USER, ACCOUNTS, CONSTRAINTS
+    )
+
+    # $2,250 target less $2,201.50 cash leaves $48.50 to save.
+    assert [p.actions[0].amount for p in plans] == [49, 49, 49]
+    assert all(type(a.amount) is int for p in plans for a in p.actions)
+
+
+def test_inserted_emergency_action_is_whole_dollars():
+    plan = Plan("Custom", 0, [PlanAction("Debt payment", 100, True)])
+
+    (guarded,) = apply_guardrails([plan], USER, ACCOUNTS, CONSTRAINTS)
+
+    assert guarded.actions[0] == PlanAction("Emergency fund", 49, False)
+    assert type(guarded.actions[0].amount) is int
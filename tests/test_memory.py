@@ -0,0 +1,55 @@
+import threading
+
+from app.agent import memory
+from app.agent.memory import MB, MemoryBudget, MemoryProfiler
+
+
+def test_budget_projects_the_chunk_and_recovers_after_a_spike(monkeypatch):
+    usage = [100 * MB]
+    monkeypatch.setattr(memory, "current_memory", lambda: usage[0])
+    budget = MemoryBudget(200 * MB, min_chunk=2)
+
+    budget.start_chunk()
+    usage[0] = 110 * MB
+    # 10 MB per item: 100 items would reach 1.1 GB, well before 200 MB is hit.
+    assert budget.over(1, 100)
+    assert budget.shrink(100) == 10
+    assert not budget.over(1, 5)
+
+    usage[0] = 500 * MB
+    assert budget.over(0, 10)
+    usage[0] = 100 * MB
+    budget.start_chunk()
+    assert not budget.over(0, 10)
+
+
+def test_concurrent_runs_keep_their_own_stages():
+    profiler = MemoryProfiler().start()
+    steps = [threading.Barrier(2) for _ in range(3)]
+
+    # "second" opens after "first" but closes last, so one shared stack
+    # would pop the wrong stage.
+    def first():
+        profiler.begin("first", detail={"run": "first"})
+        steps[0].wait()
+        steps[1].wait()
+        profiler.end()
+        steps[2].wait()
+
+    def second():
+        steps[0].wait()
+        profiler.begin("second", detail={"run": "second"})
+        steps[1].wait()
+        steps[2].wait()
+        profiler.end()
+
+    try:
+        threads = [threading.Thread(target=f) for f in (first, second)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        profiler.stop()
+
+    assert [chunk["run"] for chunk in profiler.chunks] == ["first", "second"]
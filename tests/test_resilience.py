@@ -0,0 +1,34 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from app.agent.resilience import CircuitBreaker, HedgedCaller
+from app.agent.scheduler import ClassPolicy, LLMScheduler
+
+
+def _slow(value):
+    time.sleep(0.05)
+    return value
+
+
+def test_queue_wait_does_not_count_against_the_deadline():
+    scheduler = LLMScheduler(
+        policies={"batch": ClassPolicy(weight=1, max_concurrency=1)},
+        max_concurrency=1,
+    )
+    caller = HedgedCaller(
+        deadline_seconds=0.2,
+        hedge_min_samples=1000,
+        breaker=CircuitBreaker(failure_threshold=1),
+    )
+    submit = partial(scheduler.submit, "batch")
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        calls = [
+            pool.submit(caller.call, _slow, i, submit=submit) for i in range(8)
+        ]
+        outcomes = [call.result() for call in calls]
+
+    assert [value for value, _ in outcomes] == list(range(8))
+    assert max(info["queued_seconds"] for _, info in outcomes) > 0.2
+    assert caller.breaker.state == "closed"
+    assert caller.latency.percentile(100) < 0.2
@@ -0,0 +1,43 @@
+from app.data.results_store import ResultsStore
+from app.tools.interfaces import Constraints, DemoResult, Plan, PlanAction
+
+USER = {
+    "id": "u_001",
+    "age": 34,
+    "risk_tolerance": "medium",
+    "income_monthly": 5000,
+    "expenses_monthly": 4750,
+    "dependents": 0,
+    "region": "west",
+}
+ACCOUNTS = {"cash": 850.5, "debts": [], "investments": []}
+
+
+def _result() -> DemoResult:
+    return DemoResult(
+        constraints=Constraints(3, False, "medium"),
+        plans=[Plan("Balanced", 70, [PlanAction("Emergency fund", 250)])],
+        markdown="plan",
+        meta={"mode": "rules"},
+    )
+
+
+def test_old_results_keep_the_client_as_stored(tmp_path):
+    with ResultsStore(tmp_path / "results.db") as store:
+        first = store.create_run("rules")
+        store.save_results(first, [(USER, ACCOUNTS, "save", _result())])
+        later = {**USER, "income_monthly": 9000}
+        second = store.create_run("rules")
+        store.save_results(second, [(later, ACCOUNTS, "save", _result())])
+        old_id = store.run_result_ids(first)["u_001"]
+        carried = store.create_run("rules")
+        store.carry_forward(carried, [old_id])
+
+        user, accounts, _, _ = store.load_client_result(old_id)
+        assert user["income_monthly"] == 5000
+        assert accounts == ACCOUNTS
+        carried_id = store.run_result_ids(carried)["u_001"]
+        assert store.load_client_result(carried_id)[0]["income_monthly"] == 5000
+        assert store.load_client_result(
+            store.run_result_ids(second)["u_001"]
+        )[0]["income_monthly"] == 9000
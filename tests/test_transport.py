@@ -0,0 +1,46 @@
+import multiprocessing
+
+import pytest
+
+from app.tools.gemini.transport import (
+    Cassette,
+    RecordingTransport,
+    ReplayTransport,
+    TransportResponse,
+)
+
+CONFIG = {"response_mime_type": "application/json"}
+
+
+class EchoTransport:
+    def generate(self, model, prompt, config):
+        return TransportResponse(f'{{"echo": "{prompt}"}}', latency_ms=1.0)
+
+
+_recorder: RecordingTransport | None = None
+
+
+def _record(prompt: str) -> str:
+    return _recorder.generate("model", prompt, CONFIG).text
+
+
+@pytest.mark.skipif(
+    "fork" not in multiprocessing.get_all_start_methods(), reason="needs fork"
+)
+def test_record_fork_replay(tmp_path):
+    global _recorder
+    path = tmp_path / "calls.jsonl.gz"
+    _recorder = RecordingTransport(EchoTransport(), Cassette(path))
+    _recorder.generate("model", "parent", CONFIG)
+    prompts = [f"worker-{i}" for i in range(30)]
+    with multiprocessing.get_context("fork").Pool(3) as pool:
+        pool.map(_record, prompts, chunksize=1)
+    _recorder.generate("model", "parent-after", CONFIG)
+    _recorder.cassette.close()
+
+    cassette = Cassette.load(path)
+    assert len(cassette.entries) == 32
+    replay = ReplayTransport(cassette)
+    for prompt in ["parent", "parent-after", *prompts]:
+        text = replay.generate("model", prompt, CONFIG).text
+        assert text == f'{{"echo": "{prompt}"}}'